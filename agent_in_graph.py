@@ -17,105 +17,27 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-# -----------------------------------------------
-# Let's build few tools
-# -----------------------------------------------
-
-from langchain_openai import ChatOpenAI
-
-def multiply(a: int, b: int) -> int:
-    """
-    Multiplies a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a * b
-
-
-def add(a: int, b: int) -> int:
-    """
-    Adds a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a + b
-
-
-def divide(a: int, b: int) -> int:
-    """
-    Divides a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a / b
-
-
-tools = [multiply, add, divide]
-
-llm = ChatOpenAI(model="gpt-4o-mini")
-
-# OpenAI model specifically defaults to parallel tool calling for efficiency
-# So we will set parallel_tool_calls to False
-llm_with_tools = llm.bind_tools(tools, parallel_tool_calls=False)
-
-
-# -----------------------------------------------
-# Define assistant function 
-# -----------------------------------------------
-
-from langgraph.graph import MessagesState
-from langchain_core.messages import HumanMessage, SystemMessage
-
-sys_msg = SystemMessage(content="You are a helpful assistant tasked with performing arithmetic on a set of inputs.")
-
-# Node function
-
-def assistant(state: MessagesState):
-    return {"messages" : [llm_with_tools.invoke([sys_msg] + state["messages"])]}
-
-
 # -----------------------------------------------
 # Let's define a graph
 # -----------------------------------------------
 
-from langgraph.graph import StateGraph, START
-from langgraph.prebuilt import tools_condition
-from langgraph.prebuilt import ToolNode
-
-# Graph
-builder = StateGraph(MessagesState)
-
-# Add nodes
-builder.add_node("assistant", assistant)
-builder.add_node("tools", ToolNode(tools))
+# The arithmetic tools, the assistant node and the ReAct graph live in
+# langgraph_basics.agent
 
-# Add edges
-builder.add_edge(START, "assistant")
-builder.add_conditional_edges(
-    "assistant",
-    # If the latest message (result) from assistant is a tool call -> tools_condition routes to tools
-    # If the latest message (result) from assistant is a not a tool call -> tools_condition routes to END
-    tools_condition,
-)
-builder.add_edge("tools", "assistant")
+from langchain_core.messages import HumanMessage
+from langgraph_basics.agent import build_agent_graph
 
 # Compile graph
-react_graph = builder.compile()
+react_graph = build_agent_graph()
 
 
 # -----------------------------------------------
 # Display the graph
 # -----------------------------------------------
 
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph
 
-display(Image(react_graph.get_graph().draw_mermaid_png()))
+display_graph(react_graph)
 
 
 # -----------------------------------------------
@@ -21,7 +21,7 @@ load_dotenv()
 # Let's build few tools
 # -----------------------------------------------
 
-from langchain_openai import ChatOpenAI
+from langgraph_basics.providers import get_chat_model
 
 def multiply(a: int, b: int) -> int:
     """
@@ -58,7 +58,7 @@ def divide(a: int, b: int) -> int:
 
 tools = [multiply, add, divide]
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+llm = get_chat_model(model="gpt-4o-mini")
 
 # OpenAI model specifically defaults to parallel tool calling for efficiency
 # So we will set parallel_tool_calls to False
@@ -113,9 +113,9 @@ react_graph = builder.compile()
 # Display the graph
 # -----------------------------------------------
 
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph
 
-display(Image(react_graph.get_graph().draw_mermaid_png()))
+display_graph(react_graph)
 
 
 # ===============================================
@@ -0,0 +1,3 @@
+"""
+End-to-end benchmarks for the LangGraph-Basics graphs (run offline).
+"""
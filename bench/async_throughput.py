@@ -0,0 +1,138 @@
+# ===============================================
+# Async vs threaded throughput benchmark
+# ===============================================
+
+# K runs of one graph at once, each on its own thread_id, against one compiled
+# graph, checkpointer and store:
+#
+#   threads  graph.invoke on a thread pool of --threads workers (the sync nodes)
+#   async    asyncio.gather of K graph.ainvoke on one event loop (the async twins
+#            registered with langgraph_basics.nodes.with_async)
+#
+# The fake model sleeps per token (--tps, ~0.6 s per reply by default), so each
+# run mostly waits on "I/O" - the thread pool caps how many runs wait at once,
+# the event loop does not. With a fast fake model both are CPU-bound (the GIL)
+# and come out even.
+#
+#   python -m bench.async_throughput --graphs map_reduce memory_agent --concurrency 1 10 100
+#
+# Per graph and K: wall time, runs/sec and p50 / p95 run latency for both.
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _config(spec) -> dict:
+    configurable = {**spec.configurable, "thread_id": str(uuid.uuid4())}
+    # K different users - otherwise every run reads (and adds to) the same memories
+    if "user_id" in configurable:
+        configurable["user_id"] = configurable["thread_id"]
+    return {"configurable": configurable, "recursion_limit": 100}
+
+
+def _summary(latencies, wall: float) -> dict:
+    from bench.harness import summarize_latencies
+
+    summary = summarize_latencies(latencies)
+    return {"wall_ms": wall * 1000, "runs_per_sec": len(latencies) / wall,
+            "p50_ms": summary["p50_ms"], "p95_ms": summary["p95_ms"]}
+
+
+def run_threads(spec, module, graph, concurrency: int, threads: int) -> dict:
+    def run_one(_):
+        start = time.perf_counter()
+        graph.invoke(spec.make_input(module), _config(spec))
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(threads, concurrency)) as pool:
+        latencies = list(pool.map(run_one, range(concurrency)))
+    return _summary(latencies, time.perf_counter() - start)
+
+
+async def run_async(spec, module, graph, concurrency: int) -> dict:
+    async def run_one():
+        start = time.perf_counter()
+        await graph.ainvoke(spec.make_input(module), _config(spec))
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(run_one() for _ in range(concurrency)))
+    return _summary(latencies, time.perf_counter() - start)
+
+
+def bench_graph(name: str, levels, threads: int) -> dict:
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.store.memory import InMemoryStore
+
+    from bench.graphs import GRAPHS_BY_NAME
+
+    spec = GRAPHS_BY_NAME[name]
+    module = spec.load_module()
+
+    # MemorySaver / InMemoryStore serve both invoke and ainvoke. A real deployment
+    # needs an async checkpointer for ainvoke (AsyncSqliteSaver, not SqliteSaver).
+    graph = spec.build(module, checkpointer=MemorySaver(), store=InMemoryStore() if spec.store else None)
+
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        # One untimed run of each, so imports and first-use setup are not counted
+        graph.invoke(spec.make_input(module), _config(spec))
+        asyncio.run(graph.ainvoke(spec.make_input(module), _config(spec)))
+
+        for k in levels:
+            results[k] = {
+                "threads": run_threads(spec, module, graph, k, threads),
+                "async": asyncio.run(run_async(spec, module, graph, k)),
+            }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent runs: thread pool + invoke vs one event loop + ainvoke (offline)")
+    parser.add_argument("--graphs", nargs="+", default=["map_reduce", "memory_agent", "chat_summarization"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--threads", type=int, default=16, help="Thread pool size for the sync runs")
+    parser.add_argument("--tps", type=float, default=40, help="Fake model tokens/sec")
+    parser.add_argument("--tokens", type=int, default=24, help="Tokens per fake model response")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+    # The fan-out limiter is per graph, so it would be shared by all K runs - measure without it
+    os.environ.setdefault("LANGGRAPH_BASICS_MAX_IN_FLIGHT", "off")
+
+    from langgraph_basics.fakes import FakeChatModel
+    from langgraph_basics.providers import set_chat_model_factory
+
+    set_chat_model_factory(lambda model, **kwargs: FakeChatModel(
+        model_name=model, seed=args.seed, tokens_per_second=args.tps, response_tokens=args.tokens))
+
+    results = {name: bench_graph(name, args.concurrency, args.threads) for name in args.graphs}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.tps:g} tokens/s, {args.tokens} tokens/response, {args.threads} threads for invoke")
+    print(f"  {'graph':<22}{'K':>5}   {'threads runs/s':>15}{'p95 ms':>9}   {'async runs/s':>13}{'p95 ms':>9}{'speedup':>9}")
+    for name, levels in results.items():
+        for k, r in levels.items():
+            threads, async_ = r["threads"], r["async"]
+            print(f"  {name:<22}{k:>5}   {threads['runs_per_sec']:>15.1f}{threads['p95_ms']:>9.0f}   "
+                  f"{async_['runs_per_sec']:>13.1f}{async_['p95_ms']:>9.0f}"
+                  f"{async_['runs_per_sec'] / threads['runs_per_sec']:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+# ===============================================
+# Cold-start benchmark
+# ===============================================
+
+# Measures what a worker pays on container start: a fresh interpreter imports a
+# graph module, builds the graph and runs it once (offline fake model).
+#
+#   python -m bench.cold_start                          # all graphs, 3 fresh processes each
+#   python -m bench.cold_start --only research_assistant --budget-ms 1500
+#
+# Reported per graph (median over --repeat processes):
+#
+#   import_ms        import of the langgraph_basics module
+#   build_ms         factory call (StateGraph construction + compile)
+#   first_invoke_ms  first graph.invoke, including anything imported lazily
+#   total_ms         import + build + first invoke - the number gated by --budget-ms
+#   process_ms       wall time of the whole subprocess, interpreter startup included
+#
+# `heavy_imports` lists the optional heavyweight packages already loaded after the
+# build; it should stay empty - they are only imported when a node first needs them.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 1500.0
+DEFAULT_REPEAT = 3
+
+HEAVY_MODULES = ("IPython", "langchain_community", "langchain_openai", "openai", "tavily", "trustcall")
+
+TIMINGS = ("import_ms", "build_ms", "first_invoke_ms", "total_ms", "process_ms")
+
+
+# -----------------------------------------------
+# Child: one cold start
+# -----------------------------------------------
+
+def _cold_start(name: str) -> dict:
+    from bench.graphs import GRAPHS_BY_NAME
+
+    spec = GRAPHS_BY_NAME[name]
+
+    start = time.perf_counter()
+    module = spec.load_module()
+    imported = time.perf_counter()
+
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.store.memory import InMemoryStore
+
+    graph = spec.build(module, checkpointer=MemorySaver(), store=InMemoryStore() if spec.store else None)
+    built = time.perf_counter()
+    heavy_imports = sorted(m for m in HEAVY_MODULES if m in sys.modules)
+
+    config = {"configurable": {"thread_id": "cold-start", **spec.configurable}, "recursion_limit": 100}
+    graph.invoke(spec.make_input(module), config)
+    invoked = time.perf_counter()
+
+    return {
+        "import_ms": (imported - start) * 1000,
+        "build_ms": (built - imported) * 1000,
+        "first_invoke_ms": (invoked - built) * 1000,
+        "total_ms": (invoked - start) * 1000,
+        "heavy_imports": heavy_imports,
+    }
+
+
+# -----------------------------------------------
+# Parent: fresh processes per graph
+# -----------------------------------------------
+
+def measure(name: str, repeat: int = DEFAULT_REPEAT, seed: int = 0) -> dict:
+    """
+    Cold-start `name` in `repeat` fresh interpreters and return the median timings
+    """
+    env = dict(os.environ, LANGGRAPH_BASICS_OFFLINE="1", LANGGRAPH_BASICS_FAKE_SEED=str(seed))
+    env.pop("LANGGRAPH_BASICS_FAKE_TPS", None)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-m", "bench.cold_start", "--child", name],
+                              cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1:]}
+
+        sample = json.loads(proc.stdout.strip().splitlines()[-1])
+        sample["process_ms"] = elapsed * 1000
+        samples.append(sample)
+
+    result = {key: statistics.median(s[key] for s in samples) for key in TIMINGS}
+    result["heavy_imports"] = sorted({m for s in samples for m in s["heavy_imports"]})
+    return result
+
+
+def format_result(name: str, result: dict, budget_ms: float) -> str:
+    if "error" in result:
+        return f"{name:<28} FAILED {result['error']}"
+    flag = "  OVER BUDGET" if result["total_ms"] > budget_ms else ""
+    heavy = f"  heavy: {', '.join(result['heavy_imports'])}" if result["heavy_imports"] else ""
+    return (f"{name:<28} import {result['import_ms']:8.1f} ms  build {result['build_ms']:7.1f} ms  "
+            f"first invoke {result['first_invoke_ms']:8.1f} ms  total {result['total_ms']:8.1f} ms  "
+            f"process {result['process_ms']:8.1f} ms{flag}{heavy}")
+
+
+def main(argv=None) -> int:
+    from bench.graphs import GRAPHS
+
+    parser = argparse.ArgumentParser(description="Import-to-first-invoke cold-start benchmark (offline)")
+    parser.add_argument("--only", nargs="*", help="Graph names to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Fresh processes per graph")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Fail if any graph's import-to-first-invoke time exceeds this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_cold_start(args.child)))
+        return 0
+
+    over_budget = []
+    for name in args.only or [spec.name for spec in GRAPHS]:
+        result = measure(name, args.repeat, args.seed)
+        print(format_result(name, result, args.budget_ms))
+        if "error" in result or result["total_ms"] > args.budget_ms:
+            over_budget.append(name)
+
+    if over_budget:
+        print(f"\nOver the {args.budget_ms:.0f} ms cold-start budget (or failed): {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
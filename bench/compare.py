@@ -0,0 +1,80 @@
+# ===============================================
+# Compare two benchmark result files
+# ===============================================
+
+# Usage:
+#
+#   python -m bench.compare bench/results/<old>.json bench/results/<new>.json [--threshold 10]
+#
+# Exits with 1 if any graph's p50 or p95 latency, or its cold-start total, regressed by
+# more than the threshold (%).
+
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "supersteps_per_sec", "checkpoint_bytes_per_run", "peak_rss_mb")
+GATED = ("p50_ms", "p95_ms")
+
+COLD_START_METRICS = ("import_ms", "build_ms", "first_invoke_ms", "total_ms")
+COLD_START_GATED = ("total_ms",)
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def _compare_section(old_results: dict, new_results: dict, metrics, gated, threshold: float,
+                     prefix: str = "") -> list:
+    regressions = []
+
+    for name, new_result in new_results.items():
+        old_result = old_results.get(name)
+        if not old_result or "error" in old_result or "error" in new_result:
+            print(f"{name}: skipped (missing or failed in one report)")
+            continue
+
+        print(name)
+        for metric in metrics:
+            if metric not in old_result or metric not in new_result:
+                continue
+            change = _change(old_result[metric], new_result[metric])
+            flag = ""
+            if metric in gated and change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{prefix}{name}.{metric}")
+            print(f"  {metric:<26} {old_result[metric]:12.2f} -> {new_result[metric]:12.2f}  ({change:+6.1f}%){flag}")
+
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Diff two bench.run JSON reports")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}\n")
+
+    regressions = _compare_section(old["graphs"], new["graphs"], METRICS, GATED, args.threshold)
+
+    if new.get("cold_start"):
+        print("\nCold start")
+        regressions += _compare_section(old.get("cold_start", {}), new["cold_start"],
+                                        COLD_START_METRICS, COLD_START_GATED, args.threshold,
+                                        prefix="cold_start.")
+
+    if regressions:
+        print(f"\nRegressed beyond {args.threshold}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+# ===============================================
+# Memory extraction input benchmark
+# ===============================================
+
+# One chatty user - mostly small talk, now and then something about
+# themselves - through the memory collection chatbot, once per extraction
+# policy (langgraph_basics.extraction):
+#
+#   every turn, whole thread   the original graph (no policy)
+#   every turn, new only       ExtractionPolicy() - the watermark alone
+#   every N turns              ExtractionPolicy(every_n_turns=N)
+#   every N turns + classifier ... plus mentions_personal_info on each user message
+#
+# The debounced runs end with extract_pending_memories, as a session end
+# would, so every message is extracted once.
+#
+#   python -m bench.extraction_tokens --turns 30 --every 3 5
+#
+# Per policy: extractions, and the words (~tokens) of every prompt the
+# write_memory node sent to the model - Trustcall instruction, messages and the
+# existing memories.
+#
+#   python -m bench.extraction_tokens --agent --lengths 10 20 40 80
+#
+# --agent instead runs task_mAIstro (memory_agent), where every user turn ends
+# in an update_todos / update_profile extraction, and reports the prompt words
+# of the extraction at each thread length: from the per-namespace watermark
+# (memory_watermarks) against the whole thread, as before.
+
+import argparse
+import json
+import os
+import random
+import sys
+import uuid
+from unittest import mock
+
+
+_SMALL_TALK = [
+    "What's a good way to learn to juggle?",
+    "Can you tell me a fun fact about octopuses?",
+    "How long should I boil an egg?",
+    "What's the difference between a latte and a flat white?",
+    "Any tips for a rainy Sunday?",
+    "Why is the sky blue?",
+    "Recommend a short science fiction novel.",
+    "How do I keep basil alive on a windowsill?",
+]
+
+_PERSONAL = [
+    "I live in Lyon with my partner.",
+    "My daughter just started piano lessons.",
+    "I work as a nurse on night shifts.",
+    "I love trail running at the weekend.",
+    "My favourite food is ramen.",
+    "I'm learning Portuguese for a trip next year.",
+]
+
+
+def conversation(turns: int, personal_share: float, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(_PERSONAL) if rng.random() < personal_share else rng.choice(_SMALL_TALK)
+            for _ in range(turns)]
+
+
+def _extraction_prompts(*nodes: str):
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class ExtractionPrompts(BaseCallbackHandler):
+        """
+        Words of every prompt sent from inside `nodes`, and how many times they ran
+        """
+
+        def __init__(self):
+            self.words = 0
+            self.tasks = set()
+
+        def on_chat_model_start(self, serialized, messages, *, metadata=None, **kwargs):
+            metadata = metadata or {}
+            # "write_memory:<task id>|<Trustcall's own namespace>" - one task per node run
+            task = metadata.get("checkpoint_ns", "").split("|")[0]
+            if metadata.get("langgraph_node") not in nodes and task.split(":")[0] not in nodes:
+                return
+            self.tasks.add(task)
+            self.words += sum(len(str(m.content).split()) for prompt in messages for m in prompt)
+
+    return ExtractionPrompts()
+
+
+def run_policy(policy, user_turns: list) -> dict:
+    from langchain_core.messages import HumanMessage
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.store.memory import InMemoryStore
+
+    from langgraph_basics.memory_collection import build_collection_chatbot, extract_pending_memories
+
+    store = InMemoryStore()
+    graph = build_collection_chatbot(checkpointer=MemorySaver(), store=store, extraction_policy=policy)
+    prompts = _extraction_prompts("write_memory")
+    config = {"configurable": {"thread_id": str(uuid.uuid4()), "user_id": "bench-user"}, "callbacks": [prompts]}
+
+    for text in user_turns:
+        graph.invoke({"messages": [HumanMessage(content=text)]}, config)
+    if policy is not None:
+        extract_pending_memories(graph, config)
+
+    return {"extractions": len(prompts.tasks), "extraction_words": prompts.words,
+            "memories": len(store.search(("bench-user", "memories"), limit=10_000))}
+
+
+def bench_policies(turns: int, every, personal_share: float, seed: int = 0) -> dict:
+    from langgraph_basics.extraction import ExtractionPolicy, mentions_personal_info
+
+    user_turns = conversation(turns, personal_share, seed)
+    policies = {"every turn, whole thread": None, "every turn, new only": ExtractionPolicy()}
+    for n in every:
+        policies[f"every {n} turns"] = ExtractionPolicy(every_n_turns=n)
+        policies[f"every {n} turns + classifier"] = ExtractionPolicy(every_n_turns=n, classifier=mentions_personal_info)
+    return {name: run_policy(policy, user_turns) for name, policy in policies.items()}
+
+
+def bench_agent_thread(lengths, seed: int = 0) -> dict:
+    from langchain_core.messages import HumanMessage
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.store.memory import InMemoryStore
+
+    from langgraph_basics import memory_agent
+    from langgraph_basics.fakes import FakeChatModel
+    from langgraph_basics.providers import clear_provider_cache, set_chat_model_factory
+
+    # task_mAIstro asks for a ToDo update, then a profile update, turn after turn
+    set_chat_model_factory(lambda model, **kwargs: FakeChatModel(
+        model_name=model, seed=seed,
+        structured_responses={"UpdateMemory": [{"update_type": "todo"}, {"update_type": "user"}]}))
+
+    def run() -> dict:
+        clear_provider_cache()
+        graph = memory_agent.build_task_maistro(checkpointer=MemorySaver(), store=InMemoryStore())
+        config = {"configurable": {"thread_id": str(uuid.uuid4()), "user_id": "bench-user"}}
+        words = {}
+        for turn in range(1, max(lengths) + 1):
+            prompts = _extraction_prompts("update_todos", "update_profile")
+            text = f"I need to get the bike fixed before trip number {turn}, it takes about an hour."
+            graph.invoke({"messages": [HumanMessage(content=text)]}, {**config, "callbacks": [prompts]})
+            if turn in lengths:
+                words[turn] = prompts.words
+        return words
+
+    watermark = run()
+    # The previous behaviour - every extraction gets the thread up to task_mAIstro's tool call
+    with mock.patch.object(memory_agent, "_unextracted", lambda state, kind: state["messages"][:-1]):
+        whole = run()
+    return {turn: {"watermark_words": watermark[turn], "whole_thread_words": whole[turn]} for turn in lengths}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Memory extraction prompt size per extraction policy (offline)")
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--every", type=int, nargs="+", default=[3, 5], help="Debounce factors to try")
+    parser.add_argument("--personal-share", type=float, default=0.2,
+                        help="Share of user messages that are about the user")
+    parser.add_argument("--agent", action="store_true",
+                        help="Extraction prompt size vs thread length for task_mAIstro instead")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 20, 40, 80],
+                        help="Thread lengths (user turns) to report with --agent")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+
+    if args.agent:
+        results = bench_agent_thread(args.lengths, args.seed)
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return 0
+        print("task_mAIstro, prompt words of the extraction at user turn N")
+        print(f"  {'N':>6}{'whole thread':>15}{'watermark':>12}")
+        for turn, r in results.items():
+            print(f"  {turn:>6}{r['whole_thread_words']:>15}{r['watermark_words']:>12}")
+        return 0
+
+    results = bench_policies(args.turns, args.every, args.personal_share, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    baseline = results["every turn, whole thread"]["extraction_words"]
+    print(f"{args.turns} user turns, {args.personal_share:.0%} about the user")
+    print(f"  {'policy':<32}{'extractions':>12}{'prompt words':>14}{'vs whole':>10}")
+    for name, r in results.items():
+        print(f"  {name:<32}{r['extractions']:>12}{r['extraction_words']:>14}"
+              f"{r['extraction_words'] / baseline:>10.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# ===============================================
+# Trustcall extractor construction benchmark
+# ===============================================
+
+# update_todos used to build its Trustcall extractor (create_extractor +
+# with_listeners(on_end=spy)) on every call. It now gets a prebuilt one from
+# get_extractor and reports to a context-local Spy (memory_agent.spying).
+#
+#   python -m bench.extractor_cache --calls 200
+#
+# Three numbers, per call, against the offline fake model (no latency):
+#
+#   build    create_extractor(...).with_listeners(...) - the construction cost removed
+#   lookup   get_extractor(...) cache hit
+#   invoke   one ToDo extraction, rebuilt every call vs cached + spying(Spy())
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def _per_call_us(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def bench_extractors(calls: int) -> dict:
+    from langchain_core.messages import HumanMessage
+    from trustcall import create_extractor
+
+    from langgraph_basics.memory_agent import Spy, ToDo, _model, _todo_extractor, spying
+
+    extraction_input = {"messages": [HumanMessage(content="I need to book badminton lessons for my daughters.")],
+                        "existing": None}
+
+    def build():
+        return create_extractor(_model(), tools=[ToDo], tool_choice="ToDo",
+                                enable_inserts=True).with_listeners(on_end=Spy())
+
+    def lookup():
+        return _todo_extractor()
+
+    def invoke_rebuilt():
+        build().invoke(extraction_input)
+
+    def invoke_cached():
+        with spying(Spy()):
+            _todo_extractor().invoke(extraction_input)
+
+    # Warm up both paths (imports, first build)
+    invoke_rebuilt()
+    invoke_cached()
+
+    results = {
+        "build_us": _per_call_us(build, calls),
+        "lookup_us": _per_call_us(lookup, calls),
+        "invoke_rebuilt_us": _per_call_us(invoke_rebuilt, calls),
+        "invoke_cached_us": _per_call_us(invoke_cached, calls),
+    }
+    results["saved_per_call_us"] = results["invoke_rebuilt_us"] - results["invoke_cached_us"]
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Trustcall extractor rebuild vs cached (offline)")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+
+    results = bench_extractors(args.calls)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"ToDo extractor, {args.calls} calls, fake model without latency (us per call)")
+    print(f"  build (create_extractor + with_listeners) {results['build_us']:10.1f}")
+    print(f"  lookup (get_extractor cache hit)          {results['lookup_us']:10.1f}")
+    print(f"  invoke, rebuilt every call                {results['invoke_rebuilt_us']:10.1f}")
+    print(f"  invoke, cached + spying(Spy())            {results['invoke_cached_us']:10.1f}")
+    print(f"  saved per call                            {results['saved_per_call_us']:10.1f} "
+          f"({results['saved_per_call_us'] / results['invoke_rebuilt_us']:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
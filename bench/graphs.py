@@ -0,0 +1,122 @@
+# ===============================================
+# Benchmarked graphs
+# ===============================================
+
+# Each spec names the package module and factory that build the graph, and the
+# input for one run. Every graph is built with a MemorySaver (and an
+# InMemoryStore when its nodes take a store) so checkpoint writes are part of
+# what we time.
+#
+# Nothing here imports langgraph / langchain at module level: the cold-start
+# benchmark imports this file before it starts timing.
+
+import importlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+
+@dataclass
+class GraphSpec:
+    name: str
+    module: str     # langgraph_basics module that defines the factory
+    factory: str    # called as factory(checkpointer=..., [store=...])
+    make_input: Callable[[Any], Dict[str, Any]]  # graph module -> graph input
+    store: bool = False
+    configurable: Dict[str, Any] = field(default_factory=dict)
+
+    def load_module(self):
+        return importlib.import_module(self.module)
+
+    def build(self, module, checkpointer=None, store=None):
+        kwargs = {"checkpointer": checkpointer}
+        if self.store:
+            kwargs["store"] = store
+        return getattr(module, self.factory)(**kwargs)
+
+
+def _chat_input(text: str) -> Callable[[Any], Dict[str, Any]]:
+    def make_input(module):
+        from langchain_core.messages import HumanMessage
+        return {"messages": [HumanMessage(content=text)]}
+    return make_input
+
+
+GRAPHS: List[GraphSpec] = [
+    GraphSpec(
+        name="simple_graph",
+        module="langgraph_basics.simple_graph",
+        factory="build_simple_graph",
+        make_input=lambda module: {"graph_state": "Hi, This is Sushant."},
+    ),
+    GraphSpec(
+        name="parallelization",
+        module="langgraph_basics.parallelization",
+        factory="build_search_graph",
+        make_input=lambda module: {"question": "What is Grok LLM Model?", "context": []},
+    ),
+    GraphSpec(
+        name="map_reduce",
+        module="langgraph_basics.map_reduce",
+        factory="build_map_reduce_graph",
+        make_input=lambda module: {"topic": "Humans"},
+    ),
+    GraphSpec(
+        name="sub_graph",
+        module="langgraph_basics.sub_graph",
+        factory="build_log_analysis_graph",
+        make_input=lambda module: {"raw_logs": module.sample_logs()},
+    ),
+    GraphSpec(
+        name="research_assistant",
+        module="langgraph_basics.research_assistant",
+        factory="build_research_graph",
+        make_input=lambda module: {"topic": "The benefits of adopting LangGraph as an agent framework",
+                                   "max_analysts": 3},
+    ),
+    GraphSpec(
+        name="memory_agent",
+        module="langgraph_basics.memory_agent",
+        factory="build_task_maistro",
+        store=True,
+        configurable={"user_id": "bench"},
+        make_input=_chat_input("My wife asked me to book badminton lessons for my daughters."),
+    ),
+    GraphSpec(
+        name="agent_in_graph",
+        module="langgraph_basics.agent",
+        factory="build_agent_graph",
+        make_input=_chat_input("Add 6 and 4. Multipliy the result by 3. Divide the output by 2"),
+    ),
+    GraphSpec(
+        name="chat_summarization",
+        module="langgraph_basics.chat_summarization",
+        factory="build_summarization_chatbot",
+        make_input=_chat_input("Hi! I am Sushant"),
+    ),
+    GraphSpec(
+        name="memory_store",
+        module="langgraph_basics.memory_store",
+        factory="build_memory_chatbot",
+        store=True,
+        configurable={"user_id": "bench"},
+        make_input=_chat_input("I like to drive around Pune"),
+    ),
+    GraphSpec(
+        name="memory_collection_schema",
+        module="langgraph_basics.memory_collection",
+        factory="build_collection_chatbot",
+        store=True,
+        configurable={"user_id": "bench"},
+        make_input=_chat_input("I like to drive around Pune"),
+    ),
+    GraphSpec(
+        name="memory_profile_schema",
+        module="langgraph_basics.memory_profile",
+        factory="build_profile_chatbot",
+        store=True,
+        configurable={"user_id": "bench"},
+        make_input=_chat_input("Hi, my name is Sushant and I like to drive around Pune."),
+    ),
+]
+
+GRAPHS_BY_NAME = {spec.name: spec for spec in GRAPHS}
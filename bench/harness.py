@@ -0,0 +1,116 @@
+# ===============================================
+# Benchmark harness
+# ===============================================
+
+# Times graph runs against the offline fake model and reports latency
+# percentiles, supersteps/sec, peak RSS and checkpoint bytes written per run.
+
+import contextlib
+import io
+import os
+import resource
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from langgraph.checkpoint.memory import MemorySaver
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# -----------------------------------------------
+# Statistics
+# -----------------------------------------------
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of `values`
+    """
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+    }
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# -----------------------------------------------
+# Checkpoint accounting
+# -----------------------------------------------
+
+def checkpoint_stats(saver: MemorySaver, thread_id: str) -> Dict[str, int]:
+    """
+    Bytes written and parent-graph supersteps for one thread of a MemorySaver.
+    Reads the saver's storage after the run, so it adds nothing to the timings.
+    """
+    n_bytes = 0
+    for namespace in saver.storage.get(thread_id, {}).values():
+        for checkpoint, metadata, _ in namespace.values():
+            n_bytes += len(checkpoint[1]) + len(metadata[1])
+
+    for key, (_, blob) in saver.blobs.items():
+        if key[0] == thread_id:
+            n_bytes += len(blob)
+
+    for key, writes in saver.writes.items():
+        if key[0] == thread_id:
+            n_bytes += sum(len(value[1]) for _, _, value, _ in writes.values())
+
+    # One checkpoint for the input, then one per superstep
+    n_checkpoints = len(saver.storage.get(thread_id, {}).get("", {}))
+    return {"checkpoint_bytes": n_bytes, "supersteps": max(n_checkpoints - 1, 0)}
+
+
+# -----------------------------------------------
+# Running a graph
+# -----------------------------------------------
+
+def run_graph_benchmark(graph, saver: MemorySaver, make_input, runs: int = 20,
+                        warmup: int = 2, configurable: Optional[dict] = None) -> Dict[str, Any]:
+    """
+    Invoke `graph` `warmup + runs` times on fresh threads and summarize the timed runs
+    """
+    latencies, supersteps, checkpoint_bytes = [], [], []
+
+    for i in range(warmup + runs):
+        thread_id = str(uuid.uuid4())
+        config = {"configurable": {"thread_id": thread_id, **(configurable or {})},
+                  "recursion_limit": 100}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            graph.invoke(make_input(), config)
+            elapsed = time.perf_counter() - start
+
+        if i < warmup:
+            continue
+
+        stats = checkpoint_stats(saver, thread_id)
+        latencies.append(elapsed)
+        supersteps.append(stats["supersteps"])
+        checkpoint_bytes.append(stats["checkpoint_bytes"])
+
+    return {
+        "runs": runs,
+        **summarize_latencies(latencies),
+        "supersteps_per_run": sum(supersteps) / runs,
+        "supersteps_per_sec": sum(supersteps) / sum(latencies),
+        "checkpoint_bytes_per_run": sum(checkpoint_bytes) / runs,
+        "peak_rss_mb": peak_rss_mb(),
+    }
@@ -0,0 +1,169 @@
+# ===============================================
+# Interview failure-injection benchmark
+# ===============================================
+
+# Runs the research graph with N analysts and makes some interviews fail at a
+# given turn, then recovers. Three recovery strategies:
+#
+#   rerun           no checkpointer - the caller reruns the whole graph
+#   branch_restart  checkpointer, interview_checkpoints=False - finished interviews
+#                   are kept (pending writes), failed ones restart from turn 1
+#   partial_resume  checkpointer + per-interview checkpoints (the default) -
+#                   failed interviews resume from their last completed node
+#
+# For each, model calls and wall time of (failed run + recovery), next to a
+# clean run; "saved" is relative to rerun.
+#
+#   python -m bench.interview_failures --analysts 8 --failures 2 --fail-turn 2 --tps 400
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any
+
+
+class InjectedFailure(RuntimeError):
+    pass
+
+
+def _flaky_model_class():
+    from langchain_core.messages import SystemMessage
+
+    from langgraph_basics.fakes import FakeChatModel
+    from langgraph_basics.research_assistant import question_instructions
+
+    marker = question_instructions.split("{goals}")[0].strip()[:40]
+
+    class FlakyChatModel(FakeChatModel):
+        """
+        FakeChatModel that counts every call and fails the question at `fail_turn`
+        for the first `failures` analysts to get there - once each
+        """
+
+        injector: Any = None
+
+        def _check(self, messages):
+            self.injector.count()
+            first = messages[0] if messages else None
+            if isinstance(first, SystemMessage) and marker in first.content:
+                self.injector.question(first.content)
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            self._check(messages)
+            return super()._generate(messages, stop, run_manager, **kwargs)
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            self._check(messages)
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+    return FlakyChatModel
+
+
+class FailureInjector:
+    def __init__(self, failures: int, fail_turn: int):
+        self.failures = failures
+        self.fail_turn = fail_turn
+        self.calls = 0
+        self.armed = False
+        self._questions = {}   # analyst persona -> questions asked
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def count(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def question(self, persona: str) -> None:
+        with self._lock:
+            asked = self._questions[persona] = self._questions.get(persona, 0) + 1
+            if (self.armed and asked == self.fail_turn and persona not in self._failed
+                    and len(self._failed) < self.failures):
+                self._failed.add(persona)
+                raise InjectedFailure(f"injected failure at turn {asked}")
+
+    def reset(self, armed: bool) -> None:
+        with self._lock:
+            self.calls = 0
+            self.armed = armed
+            self._questions.clear()
+            self._failed.clear()
+
+
+def run_scenario(strategy: str, injector: FailureInjector, topic: dict) -> dict:
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from langgraph_basics.research_assistant import build_research_graph, interview_progress
+
+    checkpointer = None if strategy == "rerun" else MemorySaver()
+    graph = build_research_graph(checkpointer=checkpointer, max_in_flight=0,
+                                 interview_checkpoints=strategy != "branch_restart")
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+    injector.reset(armed=strategy != "clean")
+    start = time.perf_counter()
+    failed_branches = None
+    try:
+        final = graph.invoke(topic, config)
+    except InjectedFailure:
+        if checkpointer is not None:
+            failed_branches = sum(p["status"] == "failed" for p in interview_progress(graph, config))
+        # Recover - injected failures fire once per analyst, so the retry succeeds
+        final = graph.invoke(topic if checkpointer is None else None, config)
+
+    return {
+        "model_calls": injector.calls,
+        "wall_ms": (time.perf_counter() - start) * 1000,
+        "failed_branches": failed_branches,
+        "sections": len(final["sections"]),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Interview failure injection and recovery cost (offline)")
+    parser.add_argument("--analysts", type=int, default=6)
+    parser.add_argument("--failures", type=int, default=1, help="Interviews that fail")
+    parser.add_argument("--fail-turn", type=int, default=2, help="Question turn at which they fail")
+    parser.add_argument("--tps", type=float, default=400, help="Fake model tokens/sec (0 = no latency)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+
+    from langgraph_basics.providers import set_chat_model_factory
+
+    injector = FailureInjector(args.failures, args.fail_turn)
+    FlakyChatModel = _flaky_model_class()
+    set_chat_model_factory(lambda model, **kwargs: FlakyChatModel(
+        injector=injector, model_name=model, seed=args.seed, list_length=args.analysts,
+        tokens_per_second=args.tps or None))
+
+    topic = {"topic": "The benefits of adopting LangGraph as an agent framework", "max_analysts": args.analysts}
+    results = {name: run_scenario(name, injector, topic)
+               for name in ("clean", "rerun", "branch_restart", "partial_resume")}
+
+    baseline = results["rerun"]
+    for name in ("branch_restart", "partial_resume"):
+        r = results[name]
+        r["calls_saved"] = baseline["model_calls"] - r["model_calls"]
+        r["wall_ms_saved"] = baseline["wall_ms"] - r["wall_ms"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.analysts} interviews, {args.failures} failing at turn {args.fail_turn}, "
+          f"{args.tps:g} tokens/s")
+    print(f"  {'':<16}{'calls':>7}{'wall ms':>10}{'calls saved':>13}{'ms saved':>10}")
+    for name, r in results.items():
+        saved = (f"{r['calls_saved']:>13}{r['wall_ms_saved']:>10.0f}" if "calls_saved" in r else "")
+        print(f"  {name:<16}{r['model_calls']:>7}{r['wall_ms']:>10.0f}{saved}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# ===============================================
+# Interview routing stress benchmark
+# ===============================================
+
+# route_messages runs after every answer. It used to rescan the whole message
+# list for the expert's AIMessages (O(n) per turn, O(n^2) per interview); it now
+# reads the turn_counts channel that answer_question keeps up to date.
+#
+#   python -m bench.interview_stress                 # 1,000-turn interview
+#   python -m bench.interview_stress --turns 2000 --skip-graph
+#
+# Two measurements:
+#
+#   routing  route_messages at every turn of a synthetic N-turn interview, for the
+#            old message scan and the turn counter - total and per-call at the end
+#   graph    the interview graph itself for N turns (offline fake model, no
+#            checkpointer), ms per turn over the first and last 10% of turns
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def _scan_route_messages(state, name: str = "expert"):
+    """
+    route_messages before the turn counter - kept here as the baseline
+    """
+    from langchain_core.messages import AIMessage
+
+    messages = state["messages"]
+    max_num_turns = state.get('max_num_turns', 2)
+
+    num_responses = len(
+        [m for m in messages if isinstance(m, AIMessage) and m.name == name]
+    )
+    if num_responses >= max_num_turns:
+        return 'save_interview'
+
+    if "Thank you so much for your help" in messages[-2].content:
+        return 'save_interview'
+
+    return "ask_question"
+
+
+def _time_router(router, states) -> dict:
+    per_call = []
+    for state in states:
+        start = time.perf_counter()
+        router(state)
+        per_call.append(time.perf_counter() - start)
+
+    tail = per_call[-max(len(per_call) // 10, 1):]
+    return {
+        "total_ms": sum(per_call) * 1000,
+        "last_10pct_us_per_call": sum(tail) / len(tail) * 1e6,
+    }
+
+
+def bench_routing(turns: int) -> dict:
+    """
+    Time both routers on the state as it looks after each of `turns` answers
+    """
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from langgraph_basics.research_assistant import route_messages
+
+    messages = [HumanMessage(content="So you said you were writing an article on LangGraph?")]
+    states = []
+    for turn in range(1, turns + 1):
+        messages = messages + [AIMessage(content=f"Question {turn}?"),
+                               AIMessage(content=f"Answer {turn}.", name="expert")]
+        states.append({"messages": messages, "max_num_turns": turns + 1,
+                       "turn_counts": {"expert": turn}})
+
+    return {
+        "turns": turns,
+        "scan": _time_router(_scan_route_messages, states),
+        "turn_counter": _time_router(route_messages, states),
+    }
+
+
+def bench_graph(turns: int, seed: int = 0) -> dict:
+    """
+    Run one `turns`-turn interview through the interview graph and time each turn
+    """
+    os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+
+    from langchain_core.messages import HumanMessage
+
+    from langgraph_basics.fakes import FakeChatModel
+    from langgraph_basics.providers import set_chat_model_factory
+    from langgraph_basics.research_assistant import Analyst, build_interview_graph
+
+    set_chat_model_factory(lambda model, **kwargs: FakeChatModel(model_name=model, seed=seed, response_tokens=8))
+
+    graph = build_interview_graph()
+    analyst = Analyst(affiliation="Bench", name="Stress", role="Interviewer",
+                      description="Asks the same kind of question for a very long time.")
+    state = {"analyst": analyst, "max_num_turns": turns,
+             "messages": [HumanMessage(content="So you said you were writing an article on LangGraph?")]}
+
+    turn_ends = []
+    start = time.perf_counter()
+    for update in graph.stream(state, {"recursion_limit": 4 * turns + 10}, stream_mode="updates"):
+        if "answer_question" in update:
+            turn_ends.append(time.perf_counter())
+
+    per_turn = [b - a for a, b in zip([start] + turn_ends, turn_ends)]
+    window = max(len(per_turn) // 10, 1)
+    return {
+        "turns": len(per_turn),
+        "total_s": (time.perf_counter() - start),
+        "first_10pct_ms_per_turn": sum(per_turn[:window]) / window * 1000,
+        "last_10pct_ms_per_turn": sum(per_turn[-window:]) / window * 1000,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Interview routing stress benchmark (offline)")
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-graph", action="store_true", help="Only time the routers")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {"routing": bench_routing(args.turns)}
+    if not args.skip_graph:
+        results["graph"] = bench_graph(args.turns, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    routing = results["routing"]
+    print(f"route_messages over a {routing['turns']}-turn interview")
+    for name in ("scan", "turn_counter"):
+        r = routing[name]
+        print(f"  {name:<14} total {r['total_ms']:9.2f} ms   {r['last_10pct_us_per_call']:9.2f} us/call (last 10% of turns)")
+
+    if "graph" in results:
+        g = results["graph"]
+        print(f"\ninterview graph, {g['turns']} turns: {g['total_s']:.1f} s   "
+              f"{g['first_10pct_ms_per_turn']:.2f} ms/turn (first 10%)   "
+              f"{g['last_10pct_ms_per_turn']:.2f} ms/turn (last 10%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
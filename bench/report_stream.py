@@ -0,0 +1,64 @@
+# ===============================================
+# Final-report time-to-first-byte benchmark
+# ===============================================
+
+# Compares when the caller gets the first byte of the research report:
+#
+#   invoke   the report exists once finalize_report has run - after the slowest
+#            of write_report / write_introduction / write_conclusion
+#   stream   stream_final_report forwards the introduction tokens as they arrive
+#
+#   python -m bench.report_stream --tps 200 --runs 5
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Research report time-to-first-byte (offline)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tps", type=float, default=200, help="Fake model tokens/sec")
+    parser.add_argument("--tokens", type=int, default=150, help="Tokens per fake model response")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from langgraph_basics.fakes import FakeChatModel
+    from langgraph_basics.providers import set_chat_model_factory
+    from langgraph_basics.research_assistant import build_research_graph, stream_final_report
+
+    set_chat_model_factory(lambda model, **kwargs: FakeChatModel(
+        model_name=model, seed=args.seed, tokens_per_second=args.tps, response_tokens=args.tokens))
+
+    graph = build_research_graph(checkpointer=MemorySaver())
+    topic = {"topic": "The benefits of adopting LangGraph as an agent framework", "max_analysts": 3}
+
+    invoke_ms, ttfb_ms, stream_total_ms = [], [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        graph.invoke(topic, {"configurable": {"thread_id": str(uuid.uuid4())}})
+        invoke_ms.append((time.perf_counter() - start) * 1000)
+
+        start, first = time.perf_counter(), None
+        for _ in stream_final_report(graph, topic, {"configurable": {"thread_id": str(uuid.uuid4())}}):
+            if first is None:
+                first = time.perf_counter()
+        ttfb_ms.append((first - start) * 1000)
+        stream_total_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"median over {args.runs} runs at {args.tps:g} tokens/s")
+    print(f"  invoke   first byte = done  {statistics.median(invoke_ms):9.1f} ms")
+    print(f"  stream   first byte         {statistics.median(ttfb_ms):9.1f} ms   "
+          f"done {statistics.median(stream_total_ms):9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# ===============================================
+# Report tree-reduce benchmark
+# ===============================================
+
+# write_report over N analyst sections, written from one prompt holding every
+# section ("single") vs. merged first in parallel batches by format_sections
+# ("tree", see reduce_sections). The fake model charges for the prompt too
+# (--prompt-tps, simulated prefill), so a large single prompt is slow the way
+# it is with a real provider.
+#
+#   python -m bench.report_tree --analysts 4 8 16 32 64 --fan-in 8
+#
+# Per N: wall time of the format_sections and write_report nodes, model calls,
+# and the largest prompt (in words) any one call saw.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def _section(rng, index: int, words: int) -> str:
+    vocabulary = ["graph", "state", "agent", "memory", "tool", "retrieval", "checkpoint", "stream",
+                  "node", "edge", "reducer", "thread", "store", "schema", "prompt", "latency"]
+    body = " ".join(rng.choice(vocabulary) for _ in range(words))
+    return f"## Section {index}\n\n### Summary\n{body} [1]\n\n### Sources\n[1] https://example.com/{index}\n"
+
+
+def bench_write_report(analysts: int, fan_in: int, max_depth: int, words: int, seed: int = 0) -> dict:
+    import random
+
+    from langchain_core.callbacks import BaseCallbackHandler
+    from langchain_core.runnables import RunnableLambda
+
+    from langgraph_basics.research_assistant import format_sections, write_report
+
+    rng = random.Random(seed)
+    state = {"topic": "The benefits of adopting LangGraph as an agent framework",
+             "sections": [_section(rng, i, words) for i in range(analysts)]}
+
+    def report(state, config):
+        return write_report({**state, **format_sections(state, config)})
+
+    class PromptSizes(BaseCallbackHandler):
+        def __init__(self):
+            self.sizes = []
+
+        def on_chat_model_start(self, serialized, messages, **kwargs):
+            self.sizes.extend(sum(len(str(m.content).split()) for m in prompt) for prompt in messages)
+
+    results = {}
+    for mode, mode_fan_in in (("single", None), ("tree", fan_in)):
+        sizes = PromptSizes()
+        config = {"callbacks": [sizes],
+                  "configurable": {"report_fan_in": mode_fan_in, "report_max_depth": max_depth}}
+        start = time.perf_counter()
+        # As a runnable, so the callbacks reach the model calls as they do in the graph
+        RunnableLambda(report).invoke(state, config)
+        results[mode] = {
+            "ms": (time.perf_counter() - start) * 1000,
+            "model_calls": len(sizes.sizes),
+            "max_prompt_words": max(sizes.sizes),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="write_report single prompt vs tree reduce (offline)")
+    parser.add_argument("--analysts", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    parser.add_argument("--fan-in", type=int, default=8)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--section-words", type=int, default=400, help="Words per analyst section")
+    parser.add_argument("--tps", type=float, default=100, help="Fake model output tokens/sec")
+    parser.add_argument("--prompt-tps", type=float, default=5000, help="Fake model prompt tokens/sec")
+    parser.add_argument("--tokens", type=int, default=300, help="Tokens per fake model response")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+
+    from langgraph_basics.fakes import FakeChatModel
+    from langgraph_basics.providers import set_chat_model_factory
+
+    set_chat_model_factory(lambda model, **kwargs: FakeChatModel(
+        model_name=model, seed=args.seed, tokens_per_second=args.tps,
+        prompt_tokens_per_second=args.prompt_tps, response_tokens=args.tokens))
+
+    results = {n: bench_write_report(n, args.fan_in, args.max_depth, args.section_words, args.seed)
+               for n in args.analysts}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"write_report, fan-in {args.fan_in}, {args.section_words} words/section, "
+          f"{args.tps:g} tokens/s out, {args.prompt_tps:g} tokens/s prompt")
+    print(f"  {'analysts':>8}   {'single ms':>10}{'max prompt':>12}   {'tree ms':>10}{'calls':>7}{'max prompt':>12}")
+    for n, r in results.items():
+        single, tree = r["single"], r["tree"]
+        print(f"  {n:>8}   {single['ms']:>10.0f}{single['max_prompt_words']:>12}   "
+              f"{tree['ms']:>10.0f}{tree['model_calls']:>7}{tree['max_prompt_words']:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
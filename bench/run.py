@@ -0,0 +1,129 @@
+# ===============================================
+# Run the end-to-end graph benchmarks
+# ===============================================
+
+# Usage:
+#
+#   python -m bench.run                       # all graphs, JSON to bench/results/<commit>.json
+#   python -m bench.run --only map_reduce --runs 50 --tps 200
+#   python -m bench.compare bench/results/<old>.json bench/results/<new>.json
+#
+# Each graph runs in its own subprocess so peak RSS is reported per graph.
+# The report also carries the cold-start numbers from bench.cold_start.
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+from bench import cold_start
+from bench.harness import REPO_ROOT
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_one(name: str, runs: int, warmup: int, tps: float, seed: int) -> dict:
+    """
+    Benchmark a single graph in this process
+    """
+    os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.store.memory import InMemoryStore
+
+    from bench.graphs import GRAPHS_BY_NAME
+    from bench.harness import run_graph_benchmark
+    from langgraph_basics.fakes import FakeChatModel
+    from langgraph_basics.providers import set_chat_model_factory
+
+    set_chat_model_factory(lambda model, **kwargs: FakeChatModel(
+        model_name=model, seed=seed, tokens_per_second=tps or None))
+
+    spec = GRAPHS_BY_NAME[name]
+    module = spec.load_module()
+
+    saver = MemorySaver()
+    graph = spec.build(module, checkpointer=saver, store=InMemoryStore() if spec.store else None)
+
+    return run_graph_benchmark(graph, saver, lambda: spec.make_input(module),
+                               runs=runs, warmup=warmup, configurable=spec.configurable)
+
+
+def main(argv=None) -> int:
+    from bench.graphs import GRAPHS
+
+    parser = argparse.ArgumentParser(description="End-to-end LangGraph benchmarks (offline)")
+    parser.add_argument("--only", nargs="*", help="Graph names to run (default: all)")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--tps", type=float, default=0, help="Fake model tokens/sec (0 = no latency)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cold-start-repeat", type=int, default=cold_start.DEFAULT_REPEAT,
+                        help="Fresh processes per graph for the cold-start numbers (0 = skip)")
+    parser.add_argument("--output", help="JSON output path (default: bench/results/<commit>.json)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        result = run_one(args.child, args.runs, args.warmup, args.tps, args.seed)
+        print(json.dumps(result))
+        return 0
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "runs": args.runs,
+            "warmup": args.warmup,
+            "tps": args.tps,
+            "seed": args.seed,
+        },
+        "graphs": {},
+        "cold_start": {},
+    }
+
+    names = args.only or [spec.name for spec in GRAPHS]
+    for name in names:
+        cmd = [sys.executable, "-m", "bench.run", "--child", name, "--runs", str(args.runs),
+               "--warmup", str(args.warmup), "--tps", str(args.tps), "--seed", str(args.seed)]
+        proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{name:<28} FAILED\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+            report["graphs"][name] = {"error": proc.stderr.strip().splitlines()[-1:]}
+            continue
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        report["graphs"][name] = result
+        print(f"{name:<28} p50 {result['p50_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms  "
+              f"p99 {result['p99_ms']:9.2f} ms  {result['supersteps_per_sec']:9.1f} steps/s  "
+              f"{result['checkpoint_bytes_per_run'] / 1024:8.1f} KiB ckpt  "
+              f"{result['peak_rss_mb']:7.1f} MiB rss")
+
+    if args.cold_start_repeat > 0:
+        print("\nCold start (import -> first invoke)")
+        for name in names:
+            result = cold_start.measure(name, args.cold_start_repeat, args.seed)
+            report["cold_start"][name] = result
+            print(cold_start.format_result(name, result, cold_start.DEFAULT_BUDGET_MS))
+
+    output = args.output or os.path.join(REPO_ROOT, "bench", "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
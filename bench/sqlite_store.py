@@ -0,0 +1,253 @@
+# ===============================================
+# SQLite store benchmark
+# ===============================================
+
+# The memory chatbots' store calls against InMemoryStore and the file-backed
+# SqliteStore (langgraph_basics.sqlite_store), with --users users holding
+# --items items each:
+#
+#   put          one store.put per item (one transaction each)
+#   put batch    store.batch of --batch PutOps (one transaction per batch)
+#   get          store.get of a random user's item
+#   get batch    store.batch of 3 GetOps - task_mAIstro's profile / todo / instructions reads
+#   search       store.search(namespace, limit=10) - call_model's memory list
+#   search filt  store.search(namespace, filter={"status": "done"}, limit=10)
+#   readers xN   get from --readers threads at once, while one thread puts
+#
+#   python -m bench.sqlite_store --users 100 --items 100 --ops 5000
+#
+# Per store and operation: ops/sec (items/sec for the put rows). The SQLite
+# file is created in a temporary directory and removed afterwards.
+#
+#   python -m bench.sqlite_store --agent --turns 20
+#
+# --agent instead runs task_mAIstro (memory_agent) on a SqliteStore, offline,
+# and counts the store round trips (BaseStore.batch calls) per turn: batched
+# (search_many / put_many, langgraph_basics.store_batch) against one call per
+# namespace read and per memory written, as before - and batched behind a
+# CachedStore (langgraph_basics.store_cache), per run and cross-run, with its
+# hit rate. Each configuration first runs one untimed warmup turn for another
+# user (imports, extractor construction, SQLite page cache), so the first
+# configuration measured pays no first-use costs the others skip.
+#
+# A turn that writes one memory costs 4 round trips batched: task_mAIstro's
+# read, the update node's read of the namespace it updates, that node's write,
+# and task_mAIstro's read again when the update hands back. The update node's
+# read cannot share a batch with its write - the write is what Trustcall makes
+# of the read.
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from unittest import mock
+
+
+def _value(rng: random.Random, i: int) -> dict:
+    return {"content": f"User note {i}: enjoys {rng.choice(['biking', 'chess', 'baking', 'surfing'])}",
+            "status": rng.choice(["not started", "in progress", "done"]),
+            "time_to_complete": rng.choice([10, 30, 60])}
+
+
+def _rate(n: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def bench_store(store, users: int, items: int, ops: int, batch: int, readers: int, seed: int = 0) -> dict:
+    from langgraph.store.base import GetOp, PutOp
+
+    rng = random.Random(seed)
+    namespaces = [("memories", f"user-{u}") for u in range(users)]
+    results = {}
+
+    def put_each():
+        for i in range(ops):
+            store.put(("single", f"user-{i % users}"), str(i), _value(rng, i))
+
+    def put_batches():
+        puts = [PutOp(namespace, str(i), _value(rng, i)) for namespace in namespaces for i in range(items)]
+        for start in range(0, len(puts), batch):
+            store.batch(puts[start:start + batch])
+
+    results["put"] = _rate(ops, put_each)
+    results["put batch"] = _rate(users * items, put_batches)
+
+    lookups = [(rng.choice(namespaces), str(rng.randrange(items))) for _ in range(ops)]
+    results["get"] = _rate(ops, lambda: [store.get(namespace, key) for namespace, key in lookups])
+    results["get batch"] = _rate(ops, lambda: [
+        store.batch([GetOp(namespace, key), GetOp(namespace, "0"), GetOp(("single", namespace[1]), key)])
+        for namespace, key in lookups])
+    results["search"] = _rate(ops, lambda: [store.search(namespace, limit=10) for namespace, _ in lookups])
+    results["search filt"] = _rate(ops, lambda: [store.search(namespace, filter={"status": "done"}, limit=10)
+                                                  for namespace, _ in lookups])
+
+    # Concurrent readers, with a writer running alongside
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            store.put(namespaces[i % users], str(i % items), _value(rng, i))
+            i += 1
+
+    def reader(chunk):
+        for namespace, key in chunk:
+            store.get(namespace, key)
+
+    def read_concurrently():
+        threads = [threading.Thread(target=reader, args=(lookups[r::readers],)) for r in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    write_thread = threading.Thread(target=writer)
+    write_thread.start()
+    try:
+        results[f"readers x{readers}"] = _rate(ops, read_concurrently)
+    finally:
+        stop.set()
+        write_thread.join()
+    return results
+
+
+def bench_stores(users: int, items: int, ops: int, batch: int, readers: int, seed: int = 0) -> dict:
+    from langgraph.store.memory import InMemoryStore
+
+    from langgraph_basics.sqlite_store import SqliteStore
+
+    results = {"InMemoryStore": bench_store(InMemoryStore(), users, items, ops, batch, readers, seed)}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "store.sqlite")
+        store = SqliteStore(path)
+        try:
+            results["SqliteStore"] = bench_store(store, users, items, ops, batch, readers, seed)
+        finally:
+            store.close()
+        # Reopen: the items are still there
+        store = SqliteStore(path)
+        try:
+            results["SqliteStore"]["persisted"] = len(store.search(("memories", "user-0"), limit=items))
+        finally:
+            store.close()
+    return results
+
+
+def bench_agent_turns(turns: int, seed: int = 0) -> dict:
+    from langchain_core.messages import HumanMessage
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from langgraph_basics import memory_agent
+    from langgraph_basics.fakes import FakeChatModel
+    from langgraph_basics.providers import clear_provider_cache, set_chat_model_factory
+    from langgraph_basics.sqlite_store import SqliteStore
+    from langgraph_basics.store_cache import CachedStore
+
+    class CountingStore(SqliteStore):
+        """
+        SqliteStore that counts its round trips
+        """
+
+        round_trips = 0
+
+        def batch(self, ops):
+            self.round_trips += 1
+            return super().batch(ops)
+
+    # task_mAIstro asks for a ToDo update, then a profile update, turn after turn
+    set_chat_model_factory(lambda model, **kwargs: FakeChatModel(
+        model_name=model, seed=seed,
+        structured_responses={"UpdateMemory": [{"update_type": "todo"}, {"update_type": "user"}]}))
+
+    def run(directory: str, cache=None) -> dict:
+        clear_provider_cache()
+        store = CountingStore(os.path.join(directory, f"{uuid.uuid4()}.sqlite"))
+        graph = memory_agent.build_task_maistro(checkpointer=MemorySaver(),
+                                                store=cache(store) if cache else store)
+
+        def turn(user_id: str, thread_id: str, i: int) -> None:
+            text = f"I need to get the bike fixed before trip number {i}, it takes about an hour."
+            graph.invoke({"messages": [HumanMessage(content=text)]},
+                         {"configurable": {"thread_id": thread_id, "user_id": user_id}})
+
+        # Untimed and uncounted
+        turn("warmup-user", str(uuid.uuid4()), 0)
+        store.round_trips = 0
+        before = graph.store.stats() if cache else None
+
+        thread_id = str(uuid.uuid4())
+        start = time.perf_counter()
+        for i in range(turns):
+            turn("bench-user", thread_id, i)
+        elapsed = time.perf_counter() - start
+        store.close()
+        result = {"round_trips_per_turn": store.round_trips / turns, "ms_per_turn": elapsed / turns * 1000}
+        if cache:
+            after = graph.store.stats()
+            hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+            result["hit_rate"] = hits / (hits + misses) if hits + misses else 0.0
+        return result
+
+    with tempfile.TemporaryDirectory() as directory:
+        batched = run(directory)
+        # The previous behaviour - a store call per namespace read and per memory written
+        with mock.patch.object(memory_agent, "search_many",
+                               lambda store, namespaces, limit=10: [store.search(ns, limit=limit) for ns in namespaces]), \
+             mock.patch.object(memory_agent, "put_many",
+                               lambda store, namespace, writes: [store.put(namespace, k, v) for k, v in writes]):
+            unbatched = run(directory)
+        per_run = run(directory, CachedStore)
+        cross_run = run(directory, lambda store: CachedStore(store, cross_run=True))
+    return {"per call": unbatched, "batched": batched, "+ cache/run": per_run, "+ cache/all": cross_run}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Store throughput: InMemoryStore vs SqliteStore")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--items", type=int, default=100, help="Items per user")
+    parser.add_argument("--ops", type=int, default=5000, help="Operations per measurement")
+    parser.add_argument("--batch", type=int, default=100, help="PutOps per batch")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    parser.add_argument("--agent", action="store_true",
+                        help="Store round trips per task_mAIstro turn instead (offline)")
+    parser.add_argument("--turns", type=int, default=20, help="User turns with --agent")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.agent:
+        os.environ["LANGGRAPH_BASICS_OFFLINE"] = "1"
+        results = bench_agent_turns(args.turns, args.seed)
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return 0
+        print(f"task_mAIstro on a SqliteStore, {args.turns} user turns")
+        print(f"  {'store calls':<14}{'round trips/turn':>18}{'ms/turn':>10}{'hit rate':>10}")
+        for name, r in results.items():
+            hit_rate = f"{r['hit_rate']:.0%}" if "hit_rate" in r else "-"
+            print(f"  {name:<14}{r['round_trips_per_turn']:>18.1f}{r['ms_per_turn']:>10.1f}{hit_rate:>10}")
+        return 0
+
+    results = bench_stores(args.users, args.items, args.ops, args.batch, args.readers, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.users} users x {args.items} items, {args.ops} ops per row "
+          f"(SqliteStore reopened: {results['SqliteStore']['persisted']} items for user-0)")
+    print(f"  {'ops/sec':<16}{'InMemoryStore':>15}{'SqliteStore':>13}")
+    for name, rate in results["InMemoryStore"].items():
+        print(f"  {name:<16}{rate:>15,.0f}{results['SqliteStore'][name]:>13,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
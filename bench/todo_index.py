@@ -0,0 +1,157 @@
+# ===============================================
+# ToDo secondary index benchmark
+# ===============================================
+
+# One user with --todos ToDo items (10k by default) and the questions
+# task_mAIstro turns into todo queries (langgraph_basics.todo_index):
+#
+#   scan     page through store.search(("todo", user_id)), filter and sort in Python
+#   filter   InMemoryStore.search(filter={...}) - the store's own filter, still a scan
+#   index    TodoIndexedStore.query_todos - bisects over the per-user indexes
+#
+#   python -m bench.todo_index --todos 10000 --repeat 20
+#
+# Per question: ms per query for each, the todos that match, and the prompt
+# words of the todos task_mAIstro puts in its prompt (at most PROMPT_LIMIT,
+# soonest deadline first) against every not-archived todo.
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+QUESTIONS = [
+    "What's on my list?",
+    "I have 30 minutes, what tasks can I get done?",
+    "What's due this week?",
+    "I have an hour today, anything I can finish?",
+]
+
+_TASKS = ["Book badminton lessons", "Fix the bike", "Call the plumber", "Renew passport", "Buy a birthday gift",
+          "File expense report", "Clean the garage", "Plan the weekend trip", "Water the garden", "Back up photos"]
+
+
+def make_todos(n: int, now: datetime, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    todos = []
+    for i in range(n):
+        deadline = None if rng.random() < 0.3 else now + timedelta(hours=rng.randint(-24 * 30, 24 * 90))
+        todos.append({
+            "task": f"{rng.choice(_TASKS)} #{i}",
+            "time_to_complete": rng.choice([5, 10, 15, 30, 45, 60, 90, 120, 240]),
+            "deadline": deadline.isoformat() if deadline else None,
+            "solutions": [f"Option {rng.randint(1, 9)}"],
+            "status": rng.choices(["not started", "in progress", "done", "archived"], weights=[3, 1, 2, 4])[0],
+        })
+    return todos
+
+
+def _matches(value: dict, query) -> bool:
+    if value["status"] in query.exclude_status:
+        return False
+    if query.max_minutes is not None and (value["time_to_complete"] or 0) > query.max_minutes:
+        return False
+    if query.deadline_before is not None:
+        if value["deadline"] is None or datetime.fromisoformat(value["deadline"]) >= query.deadline_before:
+            return False
+    return True
+
+
+def _deadline_order(item):
+    deadline = item.value["deadline"]
+    return (deadline is None, deadline or "", item.key)
+
+
+def scan(store, user_id: str, query) -> list:
+    items = []
+    while True:
+        page = store.search(("todo", user_id), limit=500, offset=len(items))
+        items.extend(page)
+        if len(page) < 500:
+            break
+    return sorted((item for item in items if _matches(item.value, query)), key=_deadline_order)[:query.limit]
+
+
+def store_filter(store, user_id: str, query) -> list:
+    # Equality and single-operator filters only - the deadline range is applied afterwards
+    conditions = {"status": {"$ne": "archived"}}
+    if query.max_minutes is not None:
+        conditions["time_to_complete"] = {"$lte": query.max_minutes}
+    items = store.search(("todo", user_id), filter=conditions, limit=1_000_000)
+    return sorted((item for item in items if _matches(item.value, query)), key=_deadline_order)[:query.limit]
+
+
+def _per_query_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _words(items) -> int:
+    return sum(len(str(item.value).split()) for item in items)
+
+
+def bench_todo_index(todos: int, repeat: int, seed: int = 0) -> dict:
+    from dataclasses import replace
+
+    from langgraph.store.memory import InMemoryStore
+
+    from langgraph_basics.todo_index import TodoIndexedStore, todo_query_for
+
+    now = datetime.now()
+    user_id = str(uuid.uuid4())
+    store = TodoIndexedStore(InMemoryStore())
+    for value in make_todos(todos, now, seed):
+        store.put(("todo", user_id), str(uuid.uuid4()), value)
+
+    start = time.perf_counter()
+    store.count_todos(user_id)
+    results = {"load_ms": (time.perf_counter() - start) * 1000, "questions": {}}
+
+    not_archived = [item for item in scan(store, user_id, replace(todo_query_for("", now), limit=None))]
+    for question in QUESTIONS:
+        query = todo_query_for(question, now)
+        indexed = store.query_todos(user_id, query)
+        expected = scan(store, user_id, query)
+        assert [item.key for item in indexed] == [item.key for item in expected], question
+        results["questions"][question] = {
+            "scan_ms": _per_query_ms(lambda: scan(store, user_id, query), repeat),
+            "filter_ms": _per_query_ms(lambda: store_filter(store, user_id, query), repeat),
+            "index_ms": _per_query_ms(lambda: store.query_todos(user_id, query), repeat),
+            "matching": len(store.query_todos(user_id, replace(query, limit=None))),
+            "prompt_todos": len(indexed),
+            "prompt_words": _words(indexed),
+            "all_open_words": _words(not_archived),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ToDo queries: scan vs store filter vs secondary indexes")
+    parser.add_argument("--todos", type=int, default=10_000, help="ToDo items for the one user")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = bench_todo_index(args.todos, args.repeat, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.todos} todos for one user, index load {results['load_ms']:.0f} ms (first query only)")
+    print(f"  {'question':<46}{'scan ms':>9}{'filter ms':>11}{'index ms':>10}{'match':>7}{'prompt words':>14}{'all open':>10}")
+    for question, r in results["questions"].items():
+        print(f"  {question:<46}{r['scan_ms']:>9.1f}{r['filter_ms']:>11.1f}{r['index_ms']:>10.2f}"
+              f"{r['matching']:>7}{r['prompt_words']:>14}{r['all_open_words']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
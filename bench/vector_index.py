@@ -0,0 +1,169 @@
+# ===============================================
+# Memory vector index benchmark
+# ===============================================
+
+# One user with --memories Memory items (100k by default), embedded with the
+# offline HashingEmbeddings, and the top-k search call_model makes for each
+# message (langgraph_basics.vector_index):
+#
+#   flat     every row scored - exact, the ground truth for recall
+#   ivf      k-means lists, the rows of the --nprobe nearest lists scored
+#   hnsw     hnswlib graph, if hnswlib is installed
+#   builtin  InMemoryStore(index={"embed": ..., "dims": ...}) - at --builtin-memories
+#            only, it keeps every vector as a Python list
+#
+#   python -m bench.vector_index --memories 100000 --queries 200 -k 10
+#
+# Per index: load/build time (first query on the namespace), p50 / p95 query
+# latency and recall@k against flat (ties with the k-th exact score count as
+# hits). Also the prompt words of the top-k memories against all of them.
+
+import argparse
+import json
+import random
+import sys
+import time
+
+
+_ACTIVITIES = ["biking", "baking sourdough", "trail running", "playing chess", "learning Portuguese",
+               "gardening", "painting", "rock climbing", "cooking ramen", "playing guitar", "bird watching",
+               "swimming", "reading science fiction", "knitting", "photography", "surfing"]
+_PLACES = ["Pune", "Lyon", "San Francisco", "Kyoto", "Lisbon", "Toronto", "Nairobi", "Oslo", "Austin", "Seoul"]
+_PEOPLE = ["daughter", "son", "partner", "sister", "brother", "best friend", "colleague", "mother", "father"]
+_TEMPLATES = [
+    "User enjoys {activity} in {place}.",
+    "User's {person} is into {activity}.",
+    "User wants to try {activity} with their {person} next month.",
+    "User lives in {place} and goes {activity} at weekends.",
+    "User mentioned their {person} moved to {place}.",
+    "User is saving up for a trip to {place} to go {activity}.",
+]
+
+
+def make_memories(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(_TEMPLATES).format(activity=rng.choice(_ACTIVITIES), place=rng.choice(_PLACES),
+                                          person=rng.choice(_PEOPLE)) + f" (note {i})"
+            for i in range(n)]
+
+
+def make_queries(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed + 1)
+    return [f"Any ideas for {rng.choice(_ACTIVITIES)} near {rng.choice(_PLACES)} with my {rng.choice(_PEOPLE)}?"
+            for _ in range(n)]
+
+
+def _fill(store, namespace: tuple, memories: list) -> None:
+    from langgraph.store.base import PutOp
+
+    for start in range(0, len(memories), 10_000):
+        store.batch([PutOp(namespace, str(i), {"content": text})
+                     for i, text in enumerate(memories[start:start + 10_000], start)])
+
+
+def _timed_queries(store, namespace: tuple, queries: list, k: int):
+    from bench.harness import summarize_latencies
+
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = store.search(namespace, query=query, limit=k)
+        latencies.append(time.perf_counter() - start)
+        results.append([hit.score for hit in hits])
+    summary = summarize_latencies(latencies)
+    return {"p50_ms": summary["p50_ms"], "p95_ms": summary["p95_ms"]}, results
+
+
+def _recall(results: list, truth: list, k: int) -> float:
+    # Many memories share a template, so scores tie - a hit counts if it scores at
+    # least as high as the exact k-th result
+    return sum(sum(score >= t[-1] - 1e-6 for score in r) for r, t in zip(results, truth)) / (k * len(truth))
+
+
+def bench_index(name: str, memories: list, queries: list, k: int, embeddings, **options) -> tuple:
+    from langgraph.store.memory import InMemoryStore
+
+    from langgraph_basics.vector_index import VectorIndexedStore
+
+    namespace = ("bench-user", "memories")
+    inner = InMemoryStore()
+    _fill(inner, namespace, memories)
+    store = VectorIndexedStore(inner, embeddings, fields=("content",), index=name, **options)
+
+    start = time.perf_counter()
+    store.search(namespace, query=queries[0], limit=k)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    latency, results = _timed_queries(store, namespace, queries, k)
+    return {"load_ms": load_ms, **latency}, results
+
+
+def bench_builtin(memories: list, queries: list, k: int, embeddings) -> dict:
+    from langgraph.store.memory import InMemoryStore
+
+    namespace = ("bench-user", "memories")
+    store = InMemoryStore(index={"embed": embeddings, "dims": embeddings.dims, "fields": ["content"]})
+    start = time.perf_counter()
+    _fill(store, namespace, memories)
+    load_ms = (time.perf_counter() - start) * 1000
+    latency, _ = _timed_queries(store, namespace, queries, k)
+    return {"load_ms": load_ms, **latency}
+
+
+def bench_vector_index(n: int, n_queries: int, k: int, nprobes, builtin: int, seed: int = 0) -> dict:
+    from langgraph_basics.fakes import HashingEmbeddings
+
+    embeddings = HashingEmbeddings()
+    memories = make_memories(n, seed)
+    queries = make_queries(n_queries, seed)
+
+    results = {}
+    results["flat"], truth = bench_index("flat", memories, queries, k, embeddings)
+    results["flat"]["recall"] = 1.0
+    for nprobe in nprobes:
+        results[f"ivf nprobe={nprobe}"], found = bench_index("ivf", memories, queries, k, embeddings, nprobe=nprobe)
+        results[f"ivf nprobe={nprobe}"]["recall"] = _recall(found, truth, k)
+    try:
+        import hnswlib  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        results["hnsw"], found = bench_index("hnsw", memories, queries, k, embeddings)
+        results["hnsw"]["recall"] = _recall(found, truth, k)
+    if builtin:
+        results[f"builtin ({builtin})"] = bench_builtin(memories[:builtin], queries, k, embeddings)
+        results[f"flat ({builtin})"], _ = bench_index("flat", memories[:builtin], queries, k, embeddings)
+
+    words = [len(text.split()) for text in memories]
+    return {"indexes": results, "prompt_words_all": sum(words), "prompt_words_top_k": round(sum(words) / n * k)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Top-k memory search: flat vs IVF vs HNSW vs InMemoryStore index")
+    parser.add_argument("--memories", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--builtin-memories", type=int, default=10_000,
+                        help="Size for the InMemoryStore(index=...) comparison, 0 to skip")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = bench_vector_index(args.memories, args.queries, args.k, args.nprobe, args.builtin_memories, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.memories} memories, {args.queries} queries, top {args.k} "
+          f"(prompt: ~{results['prompt_words_top_k']} words instead of {results['prompt_words_all']})")
+    print(f"  {'index':<22}{'load ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'recall@k':>10}")
+    for name, r in results["indexes"].items():
+        recall = f"{r['recall']:.3f}" if "recall" in r else "-"
+        print(f"  {name:<22}{r['load_ms']:>10.0f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{recall:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
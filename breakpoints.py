@@ -16,7 +16,7 @@ load_dotenv()
 # Tools - functions
 # -----------------------------------------------
 
-from langchain_openai import ChatOpenAI
+from langgraph_basics.providers import get_chat_model
 
 def multiply(a: int, b: int) -> int:
     """
@@ -55,7 +55,7 @@ def divide(a: int, b: int) -> float:
 
 
 tools = [add, multiply, divide]
-llm = ChatOpenAI(model="gpt-4o-mini")
+llm = get_chat_model(model="gpt-4o-mini")
 llm_with_tools = llm.bind_tools(tools)
 
 
@@ -70,7 +70,7 @@ from langgraph.checkpoint.memory import MemorySaver
 
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph
 
 # System Message
 sys_message = SystemMessage(content="You are a helpful assistant tasked with performing arithmetic on a set of inputs.")
@@ -92,7 +92,7 @@ memory = MemorySaver()
 graph = builder.compile(checkpointer=memory, interrupt_before=["tools"])
 
 # Show graph
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
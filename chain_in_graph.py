@@ -34,8 +34,8 @@ for msg in messages:
 # Let's load a chat model and invoke above list of messages
 # -----------------------------------------------
 
-from langchain_openai import ChatOpenAI
-model = ChatOpenAI(model="gpt-4o-mini")
+from langgraph_basics.providers import get_chat_model
+model = get_chat_model(model="gpt-4o-mini")
 
 result = model.invoke(messages)
 
@@ -120,8 +120,8 @@ builder.add_edge("tool_calling_llm", END)
 graph = builder.compile()
 
 # View
-from IPython.display import Image, display
-display(Image(graph.get_graph().draw_mermaid_png()))
+from langgraph_basics.providers import display_graph
+display_graph(graph)
 
 
 # -----------------------------------------------
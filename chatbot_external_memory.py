@@ -37,9 +37,9 @@ memory = SqliteSaver(conn=conn)
 # LLM Model
 # -----------------------------------------------
 
-from langchain_openai import ChatOpenAI
+from langgraph_basics.providers import get_chat_model
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+llm = get_chat_model(model="gpt-4o-mini", temperature=0)
 
 
 # -----------------------------------------------
@@ -132,7 +132,7 @@ def should_continue(state : State):
 # -----------------------------------------------
 
 from langgraph.graph import StateGraph, START
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph
 
 # Graph
 
@@ -155,7 +155,7 @@ graph = workflow.compile(checkpointer=memory)
 
 # Display graph
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
@@ -21,7 +21,7 @@ from langgraph.errors import NodeInterrupt
 from langgraph.checkpoint.memory import MemorySaver
 
 from typing_extensions import TypedDict
-from IPython.display import display, Image
+from langgraph_basics.providers import display_graph
 
 class State(TypedDict):
     input: str
@@ -62,7 +62,7 @@ memory = MemorySaver()
 graph = builder.compile(checkpointer=memory)
 
 # Show Graph
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
@@ -0,0 +1,71 @@
+"""
+Shared helpers and graph factories for the LangGraph-Basics scripts.
+
+The graph factories are resolved lazily (PEP 562), so `import langgraph_basics`
+only loads the provider helpers - a graph module (and its langgraph / pydantic
+imports) is loaded the first time its factory is looked up.
+"""
+
+import importlib
+
+from langgraph_basics.providers import (
+    clear_provider_cache,
+    display_graph,
+    get_chat_model,
+    get_embeddings,
+    get_extractor,
+    get_rate_limiter,
+    get_retrieval_cache,
+    get_store,
+    get_structured_model,
+    get_web_search,
+    is_offline,
+    load_wikipedia,
+    set_chat_model_factory,
+)
+
+# factory name -> module that defines it
+_FACTORIES = {
+    "build_agent_graph": "langgraph_basics.agent",
+    "build_collection_chatbot": "langgraph_basics.memory_collection",
+    "build_log_analysis_graph": "langgraph_basics.sub_graph",
+    "build_map_reduce_graph": "langgraph_basics.map_reduce",
+    "build_memory_chatbot": "langgraph_basics.memory_store",
+    "build_profile_chatbot": "langgraph_basics.memory_profile",
+    "build_research_graph": "langgraph_basics.research_assistant",
+    "build_search_graph": "langgraph_basics.parallelization",
+    "build_simple_graph": "langgraph_basics.simple_graph",
+    "build_summarization_chatbot": "langgraph_basics.chat_summarization",
+    "build_task_maistro": "langgraph_basics.memory_agent",
+}
+
+
+def __getattr__(name):
+    module = _FACTORIES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    factory = getattr(importlib.import_module(module), name)
+    globals()[name] = factory
+    return factory
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_FACTORIES))
+
+
+__all__ = [
+    "clear_provider_cache",
+    "display_graph",
+    "get_chat_model",
+    "get_embeddings",
+    "get_extractor",
+    "get_rate_limiter",
+    "get_retrieval_cache",
+    "get_store",
+    "get_structured_model",
+    "get_web_search",
+    "is_offline",
+    "load_wikipedia",
+    "set_chat_model_factory",
+    *_FACTORIES,
+]
@@ -0,0 +1,107 @@
+# ===============================================
+# Agent in Graph
+# ===============================================
+
+# Let's build a ReAct agent, a general agent architecture.
+
+# act     - let the model call specific tools
+# observe - pass the tool output back to the model
+# reason  - let the model reason about the tool output
+#           to decide what to do next
+#           (e.g., call another tool or just respond directly)
+
+from langchain_core.messages import SystemMessage
+from langgraph.graph import START, MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode, tools_condition
+
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model
+
+
+# -----------------------------------------------
+# Let's build few tools
+# -----------------------------------------------
+
+MODEL = "gpt-4o-mini"
+
+def multiply(a: int, b: int) -> int:
+    """
+    Multiplies a and b.
+
+    Args:
+        a: first int
+        b: second int
+    """
+    return a * b
+
+
+def add(a: int, b: int) -> int:
+    """
+    Adds a and b.
+
+    Args:
+        a: first int
+        b: second int
+    """
+    return a + b
+
+
+def divide(a: int, b: int) -> int:
+    """
+    Divides a and b.
+
+    Args:
+        a: first int
+        b: second int
+    """
+    return a / b
+
+
+tools = [multiply, add, divide]
+
+
+# -----------------------------------------------
+# Define assistant function
+# -----------------------------------------------
+
+sys_msg = SystemMessage(content="You are a helpful assistant tasked with performing arithmetic on a set of inputs.")
+
+# Node function
+
+def _llm_with_tools():
+    # OpenAI model specifically defaults to parallel tool calling for efficiency
+    # So we will set parallel_tool_calls to False
+    return get_chat_model(model=MODEL).bind_tools(tools, parallel_tool_calls=False)
+
+def assistant(state: MessagesState):
+    return {"messages" : [_llm_with_tools().invoke([sys_msg] + state["messages"])]}
+
+async def aassistant(state: MessagesState):
+    return {"messages" : [await _llm_with_tools().ainvoke([sys_msg] + state["messages"])]}
+
+
+# -----------------------------------------------
+# Let's define a graph
+# -----------------------------------------------
+
+def build_agent_graph(checkpointer=None, interrupt_before=None):
+    """
+    ReAct agent: assistant <-> tools until the assistant stops calling tools
+    """
+    builder = StateGraph(MessagesState)
+
+    # Add nodes
+    builder.add_node("assistant", with_async(assistant, aassistant))
+    builder.add_node("tools", ToolNode(tools))
+
+    # Add edges
+    builder.add_edge(START, "assistant")
+    builder.add_conditional_edges(
+        "assistant",
+        # If the latest message (result) from assistant is a tool call -> tools_condition routes to tools
+        # If the latest message (result) from assistant is a not a tool call -> tools_condition routes to END
+        tools_condition,
+    )
+    builder.add_edge("tools", "assistant")
+
+    return builder.compile(checkpointer=checkpointer, interrupt_before=interrupt_before)
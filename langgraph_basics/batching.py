@@ -0,0 +1,163 @@
+# ===============================================
+# Micro-batching for concurrent model calls
+# ===============================================
+
+# Parallel Send() branches each make the same kind of structured-output call at
+# about the same time. MicroBatcher holds calls that arrive within `window`
+# seconds of each other and sends them as one `batch` / `abatch` request, then
+# hands each caller its own result (or exception).
+#
+#   joke_llm = MicroBatcher(llm.with_structured_output(Joke), window=0.01)
+#   joke_llm.invoke(prompt)     # from many branches at once -> one joke_llm.batch([...])
+#   joke_llm.stats()            # {"calls": ..., "batches": ..., "mean_batch_size": ..., ...}
+#
+# The caller's config (callbacks, tags, the node's run context) is captured at
+# `invoke` time and passed through per input, so tracing and streaming still
+# see each call under the node that made it.
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.config import ensure_config
+
+
+DEFAULT_WINDOW = 0.01        # seconds
+DEFAULT_MAX_BATCH_SIZE = 16
+
+
+class _AsyncQueue:
+    def __init__(self):
+        self.pending = []
+        self.timer = None
+        self.tasks = set()   # running _arun tasks - the loop only keeps weak references
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent invoke / ainvoke calls to `runnable` into batch / abatch calls
+    """
+
+    def __init__(self, runnable: Runnable, window: float = DEFAULT_WINDOW,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
+        self.runnable = runnable
+        self.window = window
+        self.max_batch_size = max(max_batch_size, 1)
+        self.calls = 0
+        self.batches = 0
+        self.max_batch = 0
+
+        self._lock = threading.Lock()
+        self._pending = []   # (input, config, future)
+        self._timer = None
+        # asyncio futures and timers belong to one event loop - one queue per loop
+        self._async_queues = weakref.WeakKeyDictionary()
+
+    def _record(self, size: int) -> None:
+        with self._lock:
+            self.calls += size
+            self.batches += 1
+            self.max_batch = max(self.max_batch, size)
+
+    # -----------------------------------------------
+    # Sync - a timer thread flushes the window
+    # -----------------------------------------------
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        future = Future()
+        batch = None
+        with self._lock:
+            self._pending.append((input, ensure_config(config), future))
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        # A full batch goes out right away, from the caller that filled it
+        if batch:
+            self._run(batch)
+        return future.result()
+
+    def _take(self) -> List[tuple]:
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._run(batch)
+
+    def _run(self, batch: List[tuple]) -> None:
+        self._record(len(batch))
+        try:
+            outputs = self.runnable.batch([item[0] for item in batch], [item[1] for item in batch],
+                                          return_exceptions=True)
+        except Exception as e:
+            outputs = [e] * len(batch)
+
+        for (_, _, future), output in zip(batch, outputs):
+            if isinstance(output, Exception):
+                future.set_exception(output)
+            else:
+                future.set_result(output)
+
+    # -----------------------------------------------
+    # Async - loop.call_later flushes the window
+    # -----------------------------------------------
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        queue = self._async_queues.get(loop)
+        if queue is None:
+            queue = self._async_queues[loop] = _AsyncQueue()
+
+        future = loop.create_future()
+        queue.pending.append((input, ensure_config(config), future))
+        if len(queue.pending) >= self.max_batch_size:
+            self._aflush(queue)
+        elif queue.timer is None:
+            queue.timer = loop.call_later(self.window, self._aflush, queue)
+        return await future
+
+    def _aflush(self, queue: _AsyncQueue) -> None:
+        batch, queue.pending = queue.pending, []
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+        if batch:
+            task = asyncio.ensure_future(self._arun(batch))
+            queue.tasks.add(task)
+            task.add_done_callback(queue.tasks.discard)
+
+    async def _arun(self, batch: List[tuple]) -> None:
+        self._record(len(batch))
+        try:
+            outputs = await self.runnable.abatch([item[0] for item in batch], [item[1] for item in batch],
+                                                 return_exceptions=True)
+        except Exception as e:
+            outputs = [e] * len(batch)
+
+        for (_, _, future), output in zip(batch, outputs):
+            if future.done():   # caller cancelled
+                continue
+            if isinstance(output, Exception):
+                future.set_exception(output)
+            else:
+                future.set_result(output)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "batches": self.batches,
+            "mean_batch_size": self.calls / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+        }
@@ -0,0 +1,141 @@
+# ===============================================
+# Chatbot with message summarization
+# ===============================================
+
+from langchain_core.messages import HumanMessage, RemoveMessage, SystemMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model
+
+
+# -----------------------------------------------
+# LLM Model
+# -----------------------------------------------
+
+MODEL = "gpt-4o-mini"
+
+def _llm():
+    return get_chat_model(model=MODEL, temperature=0)
+
+
+# -----------------------------------------------
+# MessageState
+# -----------------------------------------------
+
+class State(MessagesState):
+    summary : str
+
+
+# -----------------------------------------------
+# Call Model to get Summary
+# -----------------------------------------------
+
+def _conversation_messages(state: State):
+
+    # Get summary if exist
+    summary = state.get("summary", "")
+
+    if summary:
+        system_message = f"Summary of earlier conversation: {summary} "
+        return [SystemMessage(content=system_message) + state["messages"]]
+
+    return state["messages"]
+
+def call_model(state: State):
+
+    response = _llm().invoke(_conversation_messages(state))
+
+    return {"messages" : response}
+
+async def acall_model(state: State):
+
+    response = await _llm().ainvoke(_conversation_messages(state))
+
+    return {"messages" : response}
+
+
+# -----------------------------------------------
+# Summarize the conversation
+# -----------------------------------------------
+
+def _summary_messages(state: State):
+
+    summary = state.get("summary", "")
+
+    if summary:
+
+        summary_message = {
+            f"This is summary for previous conversation : {summary}\n\n"
+            "Extend the summary by taking into account the new message above"
+            }
+
+    else:
+        summary_message = "Create Summary for the above conversation"
+
+    # Add history to our prompt
+
+    return state["messages"] + [HumanMessage(content=summary_message)]
+
+def _summary_update(state: State, response):
+
+    # Keep only last 2 messages
+
+    delete_messages = [RemoveMessage(id=m.id) for m in state["messages"][:-2]]
+
+    return {"summary" : response.content, "messages" : delete_messages}
+
+def summarize_conversation(state: State):
+
+    response = _llm().invoke(_summary_messages(state))
+
+    return _summary_update(state, response)
+
+async def asummarize_conversation(state: State):
+
+    response = await _llm().ainvoke(_summary_messages(state))
+
+    return _summary_update(state, response)
+
+
+# -----------------------------------------------
+# Generate Summary based on the conversation length
+# -----------------------------------------------
+
+def should_continue(state : State):
+    """
+    Returns the next node to exceute.
+    """
+
+    messages = state["messages"]
+
+    # If there are more than 6 messages, we will summarize the conversation
+
+    if len(messages) > 6:
+        return summarize_conversation
+
+    return END
+
+
+# -----------------------------------------------
+# Graph
+# -----------------------------------------------
+
+def build_summarization_chatbot(checkpointer=None):
+    """
+    Chatbot that summarizes (and trims) the conversation past 6 messages
+    """
+    workflow = StateGraph(State)
+
+    # Nodes
+
+    workflow.add_node("conversation", with_async(call_model, acall_model))
+    workflow.add_node("summarize_conversation", with_async(summarize_conversation, asummarize_conversation))
+
+    # Edges
+
+    workflow.add_edge(START, "conversation")
+    workflow.add_conditional_edges("conversation", should_continue)
+    workflow.add_edge("summarize_conversation", END)
+
+    return workflow.compile(checkpointer=checkpointer)
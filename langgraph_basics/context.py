@@ -0,0 +1,86 @@
+# ===============================================
+# Token-bounded context assembly
+# ===============================================
+
+# Retrieved documents are kept as small dicts in state and deduplicated by
+# their URL / source as they are merged in. Once per turn they are ranked
+# against the search query and packed into a token budget, producing the one
+# formatted context string every prompt of that turn reuses.
+#
+#   {"kind": "web", "source": "https://...", "content": "..."}
+#   {"kind": "wikipedia", "source": "https://en.wikipedia.org/...", "page": "", "content": "..."}
+#
+#   context: Annotated[list, merge_documents]
+#   formatted = assemble_context(docs, query, token_budget=6000)
+
+import re
+from typing import Callable, Dict, List, Optional
+
+
+DEFAULT_TOKEN_BUDGET = 6000
+
+_WORD = re.compile(r"\w+")
+
+
+def approx_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text)
+    """
+    return len(text) // 4 + 1
+
+
+def document_key(doc: Dict[str, str]) -> str:
+    return doc.get("source") or doc["content"]
+
+
+def merge_documents(left: Optional[List[dict]], right: Optional[List[dict]]) -> List[dict]:
+    """
+    Reducer - append documents whose URL / source isn't in the list yet
+    """
+    merged = list(left or [])
+    seen = {document_key(doc) for doc in merged}
+    for doc in right or []:
+        key = document_key(doc)
+        if key not in seen:
+            seen.add(key)
+            merged.append(doc)
+    return merged
+
+
+def format_document(doc: Dict[str, str]) -> str:
+    if doc.get("kind") == "web":
+        return f'<Document href="{doc["source"]}"/>\n{doc["content"]}\n</Document>'
+    return f'<Document source="{doc["source"]}" page="{doc.get("page", "")}"/>\n{doc["content"]}\n</Document>'
+
+
+def rank_documents(docs: List[dict], query: str) -> List[dict]:
+    """
+    Order by the share of query terms each document contains; newer documents win ties
+    """
+    terms = set(_WORD.findall(query.lower()))
+
+    def score(item):
+        index, doc = item
+        overlap = len(terms & set(_WORD.findall(doc["content"].lower()))) / len(terms) if terms else 0.0
+        return (-overlap, -index)
+
+    return [doc for _, doc in sorted(enumerate(docs), key=score)]
+
+
+def assemble_context(docs: List[dict], query: str, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                     count_tokens: Callable[[str], int] = approx_tokens) -> str:
+    """
+    Dedup, rank and greedily pack `docs` into `token_budget` tokens, as one formatted string
+    """
+    separator = "\n\n---\n\n"
+    packed, used = [], 0
+
+    for doc in rank_documents(merge_documents([], docs), query):
+        formatted = format_document(doc)
+        cost = count_tokens(formatted) + (count_tokens(separator) if packed else 0)
+        if used + cost > token_budget:
+            continue  # a smaller, lower-ranked document may still fit
+        packed.append(formatted)
+        used += cost
+
+    return separator.join(packed)
@@ -0,0 +1,211 @@
+# ===============================================
+# Deferred (background) memory writes
+# ===============================================
+
+# The memory chatbots run write_memory - a second model / Trustcall call - after
+# call_model, so the user waits for the extraction before the run completes.
+# In deferred mode the graph's write_memory node only records the turn and
+# returns; a worker pool runs the real write_memory later:
+#
+#   graph = build_memory_chatbot(checkpointer=MemorySaver(), store=store, deferred_writes=True)
+#   graph.invoke({"messages": [...]}, config)   # returns after call_model
+#   graph.memory_writer.flush()                 # wait for the background extractions
+#   graph.memory_writer.stats()                 # {"turns": ..., "extractions": ..., ...}
+#
+# Durability - each pending turn is saved in the store, under
+# (PENDING_NAMESPACE, name, user_id) keyed by thread_id, before the node
+# returns. It is deleted only once an extraction that included it has saved its
+# memories, so after a crash `recover(store)` picks the pending turns up again.
+#
+# Coalescing - one user is extracted by at most one worker at a time. Turns that
+# arrive meanwhile are merged into the next extraction: a newer turn of the same
+# thread replaces the older one (it holds the whole conversation so far), and
+# the latest turns of different threads are concatenated into one history.
+
+import logging
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from langchain_core.runnables import RunnableConfig
+from langgraph.store.base import BaseStore
+
+
+logger = logging.getLogger(__name__)
+
+PENDING_NAMESPACE = "pending_memory_writes"
+DEFAULT_WORKERS = 2
+_PAGE = 100
+_USER_LOCK_STRIPES = 64
+
+
+class DeferredMemoryWriter:
+    """
+    Queue a graph's write_memory(state, config, store) to a worker pool, coalesced per user
+    """
+
+    def __init__(self, write_memory: Callable[[dict, RunnableConfig, BaseStore], Any],
+                 name: str = "write_memory", max_workers: int = DEFAULT_WORKERS):
+        self.write_memory = write_memory
+        self.name = name
+        self.turns = 0
+        self.extractions = 0
+        self.failures = 0
+
+        self._lock = threading.Lock()   # counters and scheduling state
+        # A pending turn is written (enqueue) and checked-then-deleted (_extract)
+        # under its user's stripe, so store I/O for one user never blocks another's
+        self._user_locks = [threading.Lock() for _ in range(_USER_LOCK_STRIPES)]
+        self._scheduled = set()   # users with a drain job queued or running
+        self._dirty = set()       # users with turns recorded while their job runs
+        self._jobs = []
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"deferred-{name}")
+
+    def _namespace(self, user_id: str) -> tuple:
+        return (PENDING_NAMESPACE, self.name, user_id)
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        return self._user_locks[zlib.crc32(str(user_id).encode()) % len(self._user_locks)]
+
+    # -----------------------------------------------
+    # Graph node
+    # -----------------------------------------------
+
+    def enqueue(self, state: dict, config: RunnableConfig, store: BaseStore):
+        """
+        Node - save this turn for the user's next extraction and return right away
+        """
+        configurable = config["configurable"]
+        user_id = configurable["user_id"]
+        thread_id = configurable.get("thread_id", "")
+
+        with self._user_lock(user_id):
+            store.put(self._namespace(user_id), str(thread_id), {
+                "turn_id": uuid.uuid4().hex,
+                "enqueued_at": time.time(),
+                "messages": messages_to_dict(state["messages"]),
+            })
+        with self._lock:
+            self.turns += 1
+        self._schedule(user_id, store)
+
+    def recover(self, store: BaseStore) -> int:
+        """
+        Schedule every user with pending turns in `store` (e.g. after a restart) - returns the number of users
+        """
+        users = []
+        offset = 0
+        while True:
+            namespaces = store.list_namespaces(prefix=(PENDING_NAMESPACE, self.name), max_depth=3,
+                                               limit=_PAGE, offset=offset)
+            users.extend(namespace[2] for namespace in namespaces if len(namespace) == 3)
+            if len(namespaces) < _PAGE:
+                break
+            offset += _PAGE
+
+        for user_id in users:
+            self._schedule(user_id, store)
+        return len(users)
+
+    # -----------------------------------------------
+    # Workers
+    # -----------------------------------------------
+
+    def _schedule(self, user_id: str, store: BaseStore) -> None:
+        with self._lock:
+            if user_id in self._scheduled:
+                # A job is queued or running for this user - it picks the new turn up
+                self._dirty.add(user_id)
+                return
+            self._scheduled.add(user_id)
+            self._jobs = [job for job in self._jobs if not job.done()]
+            self._jobs.append(self._pool.submit(self._drain, user_id, store))
+
+    def _drain(self, user_id: str, store: BaseStore) -> None:
+        while True:
+            with self._lock:
+                self._dirty.discard(user_id)
+            try:
+                self._extract(user_id, store)
+            except Exception:
+                # The turns stay in the store - the next enqueue or recover() retries them
+                with self._lock:
+                    self.failures += 1
+                    self._scheduled.discard(user_id)
+                logger.exception("Deferred memory write failed for user %r", user_id)
+                return
+            with self._lock:
+                # Checked and cleared under one lock, so a turn recorded now is never missed
+                if user_id not in self._dirty:
+                    self._scheduled.discard(user_id)
+                    return
+
+    def _pending(self, user_id: str, store: BaseStore) -> List[Any]:
+        items = []
+        while True:
+            page = store.search(self._namespace(user_id), limit=_PAGE, offset=len(items))
+            items.extend(page)
+            if len(page) < _PAGE:
+                return sorted(items, key=lambda item: item.value["enqueued_at"])
+
+    def _extract(self, user_id: str, store: BaseStore) -> None:
+        namespace = self._namespace(user_id)
+        items = self._pending(user_id, store)
+        if not items:
+            return
+
+        # The latest turn of each thread, oldest thread first, as one conversation
+        messages = [message for item in items for message in messages_from_dict(item.value["messages"])]
+        self.write_memory({"messages": messages}, {"configurable": {"user_id": user_id}}, store)
+
+        with self._lock:
+            self.extractions += 1
+        with self._user_lock(user_id):
+            # Only delete what was extracted - a thread may have a newer turn by now
+            for item in items:
+                current = store.get(namespace, item.key)
+                if current is not None and current.value["turn_id"] == item.value["turn_id"]:
+                    store.delete(namespace, item.key)
+
+    # -----------------------------------------------
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no extraction is queued or running - False if `timeout` ran out first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                jobs = [job for job in self._jobs if not job.done()]
+                if not jobs and not self._scheduled:
+                    return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            for job in jobs:
+                try:
+                    job.result(timeout=remaining)
+                except Exception:
+                    pass
+            if not jobs:
+                time.sleep(0.001)
+
+    def close(self) -> None:
+        """
+        Finish the queued extractions and stop the workers
+        """
+        self.flush()
+        self._pool.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "extractions": self.extractions,
+            "failures": self.failures,
+            "turns_per_extraction": self.turns / self.extractions if self.extractions else 0.0,
+            "users_in_progress": len(self._scheduled),
+        }
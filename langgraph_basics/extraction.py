@@ -0,0 +1,77 @@
+# ===============================================
+# When, and on which messages, to run memory extraction
+# ===============================================
+
+# The memory chatbots send the whole thread to Trustcall after every turn, so
+# extraction input grows with the conversation and is paid on every turn. Two
+# pieces cut it down:
+#
+#   messages_since(messages, watermark)   only the messages after the id of the last
+#                                         message already extracted (the watermark,
+#                                         kept in the thread state)
+#   ExtractionPolicy                      extract every N user turns, when the user
+#                                         comes back after T seconds idle, or when a
+#                                         cheap classifier sees new personal info
+#
+#   policy = ExtractionPolicy(every_n_turns=3, idle_seconds=600, classifier=mentions_personal_info)
+#   graph = build_collection_chatbot(checkpointer=MemorySaver(), store=store, extraction_policy=policy)
+
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage
+
+
+def messages_since(messages: Sequence[BaseMessage], watermark: Optional[str]) -> List[BaseMessage]:
+    """
+    Messages after the one with id `watermark` - all of them if there is no watermark
+    or it is no longer in the thread (e.g. trimmed away)
+    """
+    if watermark:
+        for i in range(len(messages) - 1, -1, -1):
+            if messages[i].id == watermark:
+                return list(messages[i + 1:])
+    return list(messages)
+
+
+# -----------------------------------------------
+# Debounce policy
+# -----------------------------------------------
+
+_PERSONAL_INFO = re.compile(
+    r"\b(?:i(?:'m| am| was| live| work| like| love| enjoy| prefer| hate| have| had)\b"
+    r"|my (?:name|wife|husband|partner|son|daughter|kids?|children|family|friends?|job|work|home|"
+    r"birthday|favou?rite|hobby|hobbies)\b"
+    r"|call me\b)",
+    re.IGNORECASE,
+)
+
+
+def mentions_personal_info(messages: Sequence[BaseMessage]) -> bool:
+    """
+    Cheap classifier - does any of `messages` look like the user talking about themselves
+    """
+    return any(isinstance(m.content, str) and _PERSONAL_INFO.search(m.content) for m in messages)
+
+
+@dataclass(frozen=True)
+class ExtractionPolicy:
+    """
+    Extract when any rule fires - every_n_turns=1 with no other rule extracts every turn
+    """
+
+    every_n_turns: int = 1
+    idle_seconds: Optional[float] = None        # gap since the previous turn
+    classifier: Optional[Callable[[Sequence[BaseMessage]], bool]] = None   # on the latest user message
+
+    def should_extract(self, new_messages: Sequence[BaseMessage], last_turn_at: Optional[float],
+                       now: float) -> bool:
+        user_turns = [m for m in new_messages if isinstance(m, HumanMessage)]
+        if not user_turns:
+            return False
+        if len(user_turns) >= self.every_n_turns:
+            return True
+        if self.idle_seconds is not None and last_turn_at is not None and now - last_turn_at >= self.idle_seconds:
+            return True
+        return bool(self.classifier is not None and self.classifier(user_turns[-1:]))
@@ -0,0 +1,440 @@
+# ===============================================
+# Offline fakes - Chat model, embeddings and retrievers
+# ===============================================
+
+# Deterministic stand-ins for ChatOpenAI, OpenAIEmbeddings, TavilySearchResults
+# and WikipediaLoader so every graph in the repo can run (and be timed) without
+# network access. Synthesized outputs are seeded from the prompt, so parallel
+# branches get the same answers no matter which order the scheduler runs them
+# in. Scripted replies (FakeChatModel.responses / structured_responses) are
+# handed out in call order instead - see the class docstring.
+
+import ast
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Iterator, AsyncIterator, List, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field, PrivateAttr
+
+
+WORDS = (
+    "agent graph state node edge memory tool stream reducer checkpoint "
+    "thread store schema message summary research analyst expert report "
+    "section source context query retrieval latency token branch task"
+).split()
+
+
+def _seeded_rng(seed: int, *parts: Any) -> random.Random:
+    """
+    Random generator seeded from the model seed and the request content
+    """
+    digest = hashlib.sha256(repr((seed,) + parts).encode()).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _sentence(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+# -----------------------------------------------
+# JSON schema synthesis for tool calls / structured output
+# -----------------------------------------------
+
+def synthesize_from_schema(schema: dict, rng: random.Random, list_length: int = 3,
+                           defs: Optional[dict] = None, name: str = "value") -> Any:
+    """
+    Build a value that validates against a (pydantic generated) JSON schema
+    """
+    defs = defs if defs is not None else schema.get("$defs", schema.get("definitions", {}))
+
+    if "$ref" in schema:
+        ref = schema["$ref"].split("/")[-1]
+        return synthesize_from_schema(defs[ref], rng, list_length, defs, name)
+
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+
+    if "const" in schema:
+        return schema["const"]
+
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return synthesize_from_schema(options[0], rng, list_length, defs, name)
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+
+    if kind == "object" or "properties" in schema:
+        properties = schema.get("properties", {})
+        return {
+            key: synthesize_from_schema(sub, rng, list_length, defs, key)
+            for key, sub in properties.items()
+        }
+
+    if kind == "array":
+        items = schema.get("items", {})
+        n = max(schema.get("minItems", 0), list_length)
+        if "maxItems" in schema:
+            n = min(n, schema["maxItems"])
+        return [synthesize_from_schema(items, rng, list_length, defs, name) for _ in range(n)]
+
+    if kind == "integer":
+        return schema.get("minimum", 0)
+
+    if kind == "number":
+        return float(schema.get("minimum", 0))
+
+    if kind == "boolean":
+        return False
+
+    if kind == "null":
+        return None
+
+    if schema.get("format") == "date-time":
+        return "2025-01-01T00:00:00"
+
+    # Strings (and untyped fields) get a short seeded phrase
+    return f"{name.replace('_', ' ')}: {_sentence(rng, 4)}"
+
+
+# Trustcall lists the documents it wants patched in the system prompt as
+# <instance id=...> (list of existing docs) or <schema id=...><instance> (dict)
+EXISTING_DOC = re.compile(
+    r"<(?:instance id=(?P<doc_id>[^\s>]+)[^>]*|schema id=(?P<schema_id>[^\s>]+)>\s*<instance)>\s*(?P<doc>.*?)\s*</instance>",
+    re.DOTALL,
+)
+
+
+def synthesize_patch_doc(prompt_text: str, rng: random.Random) -> Optional[dict]:
+    """
+    Build trustcall PatchDoc arguments that target a document present in the prompt
+    """
+    match = EXISTING_DOC.search(prompt_text)
+    if match is None:
+        return None
+
+    patches = []
+    try:
+        doc = ast.literal_eval(match.group("doc"))
+    except (ValueError, SyntaxError):
+        doc = None
+    if isinstance(doc, dict):
+        field = next((k for k, v in doc.items() if isinstance(v, str)), None)
+        if field is not None:
+            patches.append({"op": "replace", "path": f"/{field}",
+                            "value": f"{field.replace('_', ' ')}: {_sentence(rng, 4)}"})
+
+    return {
+        "json_doc_id": match.group("doc_id") or match.group("schema_id"),
+        "planned_edits": _sentence(rng, 8),
+        "patches": patches,
+    }
+
+
+# -----------------------------------------------
+# Fake chat model
+# -----------------------------------------------
+
+# Parallel branches share one model instance; module level so models stay deep-copyable
+_COUNTER_LOCK = threading.Lock()
+
+class FakeChatModel(BaseChatModel):
+    """
+    Seeded, offline chat model with configurable token-per-second latency.
+
+    - `responses` are scripted replies (str, dict of AIMessage kwargs, or AIMessage)
+      returned in order (cycling) when no tool call is forced.
+    - `structured_responses` maps a tool / schema name to scripted argument dicts
+      used when that tool is forced (tool calling and `with_structured_output`).
+    - Scripted replies follow call order, not the prompt: across parallel (Send)
+      branches, which branch gets which reply depends on thread scheduling. Script
+      sequential calls only, or leave parallel ones to the synthesized replies.
+    - With tools bound but not forced, `auto_tool_calls` calls the first tool on a
+      fresh user turn and answers in text after tool results, so ReAct loops end.
+    - Anything not scripted is synthesized deterministically from the seed and prompt
+      (trustcall PatchDoc calls target the document listed in the prompt).
+    """
+
+    model_name: str = "fake-chat-model"
+    seed: int = 0
+    tokens_per_second: Optional[float] = None   # None disables simulated latency
+    time_to_first_token: float = 0.0            # Seconds before the first token
+    prompt_tokens_per_second: Optional[float] = None  # Simulated prefill - None: prompt length is free
+    response_tokens: int = 24                   # Length of synthesized replies
+    list_length: int = 3                        # Items per synthesized array field
+    auto_tool_calls: bool = True                # Call unforced tools on user turns
+    responses: List[Any] = Field(default_factory=list)
+    structured_responses: Dict[str, List[dict]] = Field(default_factory=dict)
+
+    _calls: int = PrivateAttr(default=0)
+    _structured_calls: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "seed": self.seed}
+
+    @property
+    def call_count(self) -> int:
+        return self._calls
+
+    # -------------------------------------
+    # Tool binding
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[Any] = None, **kwargs: Any):
+        formatted_tools = [convert_to_openai_tool(tool) for tool in tools]
+        return super().bind(tools=formatted_tools, tool_choice=tool_choice, **kwargs)
+
+    def get_token_ids(self, text: str) -> List[int]:
+        # Whitespace tokenizer keeps token counting offline (no tiktoken download); crc32,
+        # unlike hash(), is not salted per process, so counts match between runs
+        return [zlib.crc32(word.encode()) % 50257 for word in text.split()]
+
+    # -------------------------------------
+    # Response construction
+
+    def _selected_tool(self, messages: List[BaseMessage], tools: Optional[list],
+                       tool_choice: Any) -> Optional[dict]:
+        if not tools or tool_choice in ("none", False):
+            return None
+        if tool_choice in (None, "auto"):
+            if self.auto_tool_calls and messages and isinstance(messages[-1], HumanMessage):
+                return tools[0]
+            return None
+        if isinstance(tool_choice, dict):
+            tool_choice = tool_choice.get("function", {}).get("name")
+        if tool_choice in ("any", "required", True):
+            return tools[0]
+        return next((t for t in tools if t["function"]["name"] == tool_choice), tools[0])
+
+    def _tool_call_args(self, tool: dict, prompt_text: str, rng: random.Random) -> dict:
+        name = tool["function"]["name"]
+        scripted = self.structured_responses.get(name)
+        if scripted:
+            with _COUNTER_LOCK:
+                index = self._structured_calls.get(name, 0)
+                self._structured_calls[name] = index + 1
+            return scripted[index % len(scripted)]
+
+        parameters = tool["function"].get("parameters", {})
+        if {"json_doc_id", "patches"} <= set(parameters.get("properties", {})):
+            patch = synthesize_patch_doc(prompt_text, rng)
+            if patch is not None:
+                return patch
+
+        return synthesize_from_schema(parameters, rng, list_length=self.list_length, name=name)
+
+    def _make_message(self, messages: List[BaseMessage], **kwargs: Any) -> AIMessage:
+        prompt = [(m.type, m.content if isinstance(m.content, str) else json.dumps(m.content))
+                  for m in messages]
+        rng = _seeded_rng(self.seed, prompt)
+        tool = self._selected_tool(messages, kwargs.get("tools"), kwargs.get("tool_choice"))
+        with _COUNTER_LOCK:
+            call_index = self._calls
+            self._calls += 1
+
+        if tool is not None:
+            name = tool["function"]["name"]
+            args = self._tool_call_args(tool, "\n".join(text for _, text in prompt), rng)
+            call_id = f"call_{rng.getrandbits(96):024x}"
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": name, "args": args, "id": call_id}],
+                additional_kwargs={"tool_calls": [{
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(args)},
+                }]},
+            )
+
+        if self.responses:
+            scripted = self.responses[call_index % len(self.responses)]
+            if isinstance(scripted, BaseMessage):
+                return AIMessage(**scripted.model_dump(exclude={"type"}))
+            if isinstance(scripted, dict):
+                return AIMessage(**scripted)
+            return AIMessage(content=str(scripted))
+
+        return AIMessage(content=_sentence(rng, self.response_tokens))
+
+    def _num_tokens(self, message: AIMessage) -> int:
+        n = len(str(message.content).split())
+        for call in message.tool_calls:
+            n += len(json.dumps(call["args"]).split())
+        return max(n, 1)
+
+    def _latency(self, message: AIMessage) -> float:
+        if not self.tokens_per_second:
+            return self.time_to_first_token
+        return self.time_to_first_token + self._num_tokens(message) / self.tokens_per_second
+
+    def _prefill(self, messages: List[BaseMessage]) -> float:
+        if not self.prompt_tokens_per_second:
+            return 0.0
+        n = sum(len(str(m.content).split()) for m in messages)
+        return n / self.prompt_tokens_per_second
+
+    # -------------------------------------
+    # BaseChatModel hooks
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message = self._make_message(messages, **kwargs)
+        time.sleep(self._prefill(messages) + self._latency(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        message = self._make_message(messages, **kwargs)
+        await asyncio.sleep(self._prefill(messages) + self._latency(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, message: AIMessage) -> List[AIMessageChunk]:
+        if message.tool_calls:
+            return [AIMessageChunk(
+                content="",
+                tool_call_chunks=[{"name": c["name"], "args": json.dumps(c["args"]),
+                                   "id": c["id"], "index": i}
+                                  for i, c in enumerate(message.tool_calls)],
+            )]
+        words = str(message.content).split(" ")
+        return [AIMessageChunk(content=word if i == 0 else " " + word)
+                for i, word in enumerate(words)]
+
+    def _token_delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        message = self._make_message(messages, **kwargs)
+        time.sleep(self._prefill(messages) + self.time_to_first_token)
+        for chunk in self._chunks(message):
+            time.sleep(self._token_delay())
+            if run_manager and isinstance(chunk.content, str):
+                run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._make_message(messages, **kwargs)
+        await asyncio.sleep(self._prefill(messages) + self.time_to_first_token)
+        for chunk in self._chunks(message):
+            await asyncio.sleep(self._token_delay())
+            if run_manager and isinstance(chunk.content, str):
+                await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+# -----------------------------------------------
+# Fake embeddings
+# -----------------------------------------------
+
+_TOKEN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_slot(feature: str, dims: int):
+    # Stable across processes (unlike hash()) - bucket and sign from one digest
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+    return digest % dims, 1.0 if digest >> 63 else -1.0
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Offline stand-in for OpenAIEmbeddings - feature hashing of words and word pairs,
+    L2-normalized, so texts that share words get a high cosine similarity
+    """
+
+    def __init__(self, dims: int = 256):
+        self.dims = dims
+
+    def _embed(self, text: str) -> List[float]:
+        import numpy as np
+
+        words = _TOKEN.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        vector = np.zeros(self.dims, dtype=np.float32)
+        if features:
+            slots, signs = zip(*(_feature_slot(feature, self.dims) for feature in features))
+            np.add.at(vector, list(slots), signs)
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+# -----------------------------------------------
+# Fake retrievers
+# -----------------------------------------------
+
+class FakeWebSearch:
+    """
+    Offline stand-in for TavilySearchResults - returns seeded results per query
+    """
+
+    def __init__(self, max_results: int = 3, seed: int = 0, latency: float = 0.0):
+        self.max_results = max_results
+        self.seed = seed
+        self.latency = latency
+
+    def _results(self, query: str) -> List[dict]:
+        rng = _seeded_rng(self.seed, "web", query)
+        return [
+            {"url": f"https://example.com/{rng.getrandbits(32):08x}",
+             "content": f"{query} - {_sentence(rng, 40)}"}
+            for _ in range(self.max_results)
+        ]
+
+    def invoke(self, query: str, config: Optional[dict] = None) -> List[dict]:
+        time.sleep(self.latency)
+        return self._results(query)
+
+    async def ainvoke(self, query: str, config: Optional[dict] = None) -> List[dict]:
+        await asyncio.sleep(self.latency)
+        return self._results(query)
+
+
+def fake_wikipedia_docs(query: str, load_max_docs: int = 2, seed: int = 0) -> List[Document]:
+    """
+    Offline stand-in for WikipediaLoader(query, load_max_docs).load()
+    """
+    rng = _seeded_rng(seed, "wikipedia", query)
+    return [
+        Document(
+            page_content=f"{query} - {_sentence(rng, 80)}",
+            metadata={"source": f"https://en.wikipedia.org/wiki/{rng.choice(WORDS).title()}_{i}",
+                      "title": rng.choice(WORDS).title()},
+        )
+        for i in range(load_max_docs)
+    ]
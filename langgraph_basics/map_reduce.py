@@ -0,0 +1,262 @@
+# ===============================================
+# Map-Reduce in Graph
+
+# Map - Break a task into smaller sub-tasks, processing each sub-task in parallel.
+# Reduce - Aggregate the results across all of the completed, parallelized sub-tasks.
+# ===============================================
+
+import operator
+from typing import Annotated, Optional
+
+from pydantic import BaseModel
+from typing_extensions import NotRequired, TypedDict
+
+from langgraph.constants import Send
+from langgraph.graph import END, START, StateGraph
+
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model, get_structured_model
+from langgraph_basics.scheduling import fan_out_limiter
+
+
+# -----------------------------------------------
+# Prompts and LLM
+# -----------------------------------------------
+
+MODEL = "gpt-4o-mini"
+
+def _llm():
+    return get_chat_model(model=MODEL, temperature=0)
+
+def _structured_llm(schema):
+    # Micro-batched across the parallel generate_joke branches when enabled
+    return get_structured_model(schema, model=MODEL, temperature=0)
+
+
+# -----------------------------------------------
+# State and Output Schema
+# -----------------------------------------------
+
+# Streaming reduce keeps only the FINALISTS best-scored jokes (see below)
+
+FINALISTS = 4
+
+def keep_finalists(left: Optional[list], right: Optional[list]) -> list:
+    """
+    Reducer - merge scored jokes and keep the FINALISTS highest scores
+    """
+    merged = (left or []) + (right or [])
+    return sorted(merged, key=lambda scored: (-scored["score"], scored["joke"]))[:FINALISTS]
+
+class OverallState(TypedDict):
+    topic: str
+    subjects: list[str]
+    jokes: Annotated[list, operator.add]
+    finalists: Annotated[list, keep_finalists]
+    best_joke : str
+
+
+# -----------------------------------------------
+# Generate subjects for jokes
+# -----------------------------------------------
+
+subjects_prompt = """ 
+Generate a list of 3 sub-topics that are all related to this overall topic: {topic}. 
+"""
+
+class Subjects(BaseModel):
+    subjects: list[str]
+
+def generate_subjects(state: OverallState):
+
+    prompt = subjects_prompt.format(topic=state["topic"])
+    response = _llm().with_structured_output(Subjects).invoke(prompt)
+
+    return {"subjects": response.subjects}
+
+async def agenerate_subjects(state: OverallState):
+
+    prompt = subjects_prompt.format(topic=state["topic"])
+    response = await _llm().with_structured_output(Subjects).ainvoke(prompt)
+
+    return {"subjects": response.subjects}
+
+
+# -----------------------------------------------
+# Generate jokes
+# -----------------------------------------------
+
+joke_prompt = """ 
+Generate a joke about {subject} 
+"""
+
+class JokeState(TypedDict):
+    subject: str
+    topic: NotRequired[str]
+
+class Joke(BaseModel):
+    joke: str
+
+def generate_joke(state: JokeState):
+
+    prompt = joke_prompt.format(subject=state["subject"])
+    response = _structured_llm(Joke).invoke(prompt)
+
+    return {"jokes": [response.joke]}
+
+async def agenerate_joke(state: JokeState):
+
+    prompt = joke_prompt.format(subject=state["subject"])
+    response = await _structured_llm(Joke).ainvoke(prompt)
+
+    return {"jokes": [response.joke]}
+
+
+# -----------------------------------------------
+# Joke generation - Map
+# -----------------------------------------------
+
+def continue_joke_generation(state: OverallState):
+    return [Send("generate_joke", {"subject": s}) for s in state["subjects"]]
+
+def continue_scored_joke_generation(state: OverallState):
+    return [Send("generate_joke", {"subject": s, "topic": state["topic"]}) for s in state["subjects"]]
+
+
+# -----------------------------------------------
+# Best joke selection - Reduce
+# -----------------------------------------------
+
+best_joke_prompt = """ 
+Below are a bunch of jokes about {topic}. 
+Select the best one! 
+Return the ID of the best one, starting 0 as the ID for the first joke. 
+Jokes: \n\n  {jokes} 
+"""
+
+class BestJoke(BaseModel):
+    id: int
+
+def get_best_joke(state: OverallState):
+
+    jokes = "\n\n".join(state["jokes"])
+
+    prompt = best_joke_prompt.format(topic=state["topic"], jokes=jokes)
+    response = _llm().with_structured_output(BestJoke).invoke(prompt)
+
+    return {"best_joke": state["jokes"][response.id]}
+
+async def aget_best_joke(state: OverallState):
+
+    prompt = best_joke_prompt.format(topic=state["topic"], jokes="\n\n".join(state["jokes"]))
+    response = await _llm().with_structured_output(BestJoke).ainvoke(prompt)
+
+    return {"best_joke": state["jokes"][response.id]}
+
+
+# -----------------------------------------------
+# Streaming reduce - score in the map, final among the finalists
+# -----------------------------------------------
+
+# get_best_joke waits for every joke and puts all N of them in one prompt. In
+# the streaming mode each generate_joke branch also scores its own joke, so the
+# scoring runs in parallel with the rest of the map phase. The keep_finalists
+# reducer folds each score in as the branch finishes and keeps only the top
+# FINALISTS, so the final pick sees at most FINALISTS jokes, whatever N is.
+
+score_joke_prompt = """ 
+Rate this joke about {topic} from 0 (not funny) to 10 (very funny). 
+Joke: \n\n  {joke} 
+"""
+
+class JokeScore(BaseModel):
+    score: int
+
+def _scored(joke: str, response: JokeScore):
+    score = min(max(response.score, 0), 10)
+    return {"jokes": [joke], "finalists": [{"joke": joke, "score": score}]}
+
+def generate_scored_joke(state: JokeState):
+
+    joke = generate_joke(state)["jokes"][0]
+
+    prompt = score_joke_prompt.format(topic=state["topic"], joke=joke)
+    response = _structured_llm(JokeScore).invoke(prompt)
+
+    return _scored(joke, response)
+
+async def agenerate_scored_joke(state: JokeState):
+
+    joke = (await agenerate_joke(state))["jokes"][0]
+
+    prompt = score_joke_prompt.format(topic=state["topic"], joke=joke)
+    response = await _structured_llm(JokeScore).ainvoke(prompt)
+
+    return _scored(joke, response)
+
+def _best_finalist(finalists: list, response: BestJoke):
+    # Out-of-range ids fall back to the top score
+    best = finalists[response.id] if 0 <= response.id < len(finalists) else finalists[0]
+    return {"best_joke": best}
+
+def get_best_finalist(state: OverallState):
+
+    finalists = [scored["joke"] for scored in state["finalists"]]
+    if len(finalists) == 1:
+        return {"best_joke": finalists[0]}
+
+    prompt = best_joke_prompt.format(topic=state["topic"], jokes="\n\n".join(finalists))
+    response = _llm().with_structured_output(BestJoke).invoke(prompt)
+
+    return _best_finalist(finalists, response)
+
+async def aget_best_finalist(state: OverallState):
+
+    finalists = [scored["joke"] for scored in state["finalists"]]
+    if len(finalists) == 1:
+        return {"best_joke": finalists[0]}
+
+    prompt = best_joke_prompt.format(topic=state["topic"], jokes="\n\n".join(finalists))
+    response = await _llm().with_structured_output(BestJoke).ainvoke(prompt)
+
+    return _best_finalist(finalists, response)
+
+
+# -----------------------------------------------
+# Graph definition
+# -----------------------------------------------
+
+def build_map_reduce_graph(checkpointer=None, max_in_flight: Optional[int] = None, streaming_reduce: bool = False):
+    """
+    Subjects -> one joke per subject (Send fan-out) -> best joke
+
+    At most `max_in_flight` jokes are generated at once (default: LANGGRAPH_BASICS_MAX_IN_FLIGHT,
+    0 for no limit); the limiter's metrics are on graph.fan_out_limiters["generate_joke"]
+
+    streaming_reduce=True scores each joke in its own branch and picks the best
+    among the top FINALISTS instead of prompting with every joke
+    """
+    builder = StateGraph(OverallState)
+    jokes = fan_out_limiter("generate_joke", max_in_flight)
+
+    if streaming_reduce:
+        map_node = with_async(generate_scored_joke, agenerate_scored_joke)
+        fan_out = continue_scored_joke_generation
+        reduce_node = with_async(get_best_finalist, aget_best_finalist)
+    else:
+        map_node = with_async(generate_joke, agenerate_joke)
+        fan_out = continue_joke_generation
+        reduce_node = with_async(get_best_joke, aget_best_joke)
+
+    builder.add_node("generate_subjects", with_async(generate_subjects, agenerate_subjects))
+    builder.add_node("generate_joke", jokes.wrap(map_node))
+    builder.add_node("get_best_joke", reduce_node)
+
+    builder.add_edge(START, "generate_subjects")
+    builder.add_conditional_edges("generate_subjects", fan_out, ["generate_joke"])
+    builder.add_edge("generate_joke", "get_best_joke")
+    builder.add_edge("get_best_joke", END)
+
+    graph = builder.compile(checkpointer=checkpointer)
+    graph.fan_out_limiters = {"generate_joke": jokes}
+    return graph
@@ -0,0 +1,577 @@
+# ===============================================
+# Agent with Long Term Memory in LangGraph (task_mAIstro)
+# ===============================================
+
+# task_mAIstro keeps a user profile, a ToDo list and ToDo-update instructions
+# in the store, and decides with an UpdateMemory tool call which one to update.
+#
+#   graph = build_task_maistro(checkpointer=MemorySaver(), store=InMemoryStore())
+#
+# Wrap the store in a TodoIndexedStore (langgraph_basics.todo_index) to put only
+# the todos that match the latest message in the prompt.
+#
+# Store round trips (store_batch): task_mAIstro reads the three namespaces in
+# one, and an update node reads its namespace in one and writes what Trustcall
+# returns in one - the write depends on the read, so they cannot share a batch.
+# A turn that updates one memory therefore costs 4 round trips: task_mAIstro,
+# the update node's read and write, and task_mAIstro again (3 behind a per-run
+# CachedStore, which answers the update node's read from task_mAIstro's).
+
+import asyncio
+import contextlib
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Annotated, Dict, List, Literal, Optional, TypedDict, Union
+
+from pydantic import BaseModel, Field
+
+from langchain_core.messages import HumanMessage, SystemMessage, merge_message_runs
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.store.base import BaseStore
+
+from langgraph_basics.extraction import messages_since
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model, get_extractor
+from langgraph_basics.store_batch import aput_many, asearch_many, put_many, search_many
+from langgraph_basics.todo_index import todo_query_for
+
+
+# -----------------------------------------------
+# Model and Trustcall helpers
+# -----------------------------------------------
+
+MODEL = "gpt-4o"
+
+def _model():
+    return get_chat_model(model=MODEL, temperature=0)
+
+
+# Inspect the tool calls made by Trustcall
+class Spy:
+    def __init__(self):
+        self.called_tools = []
+
+    def __call__(self, run):
+        # Collect information about the tool calls made by the extractor.
+        q = [run]
+        while q:
+            r = q.pop()
+            if r.child_runs:
+                q.extend(r.child_runs)
+            if r.run_type == "chat_model":
+                self.called_tools.append(
+                    r.outputs["generations"][0][0]["message"]["kwargs"]["tool_calls"]
+                )
+
+
+# The extractors are built once and shared, so a Spy can't be attached to one
+# call with with_listeners. The cached extractor reports to whichever Spy is
+# active in the calling context instead (contextvars follow the call into
+# worker threads and asyncio tasks, so concurrent calls keep their own Spy):
+#
+#   with spying(Spy()) as spy:
+#       result = _todo_extractor().invoke(...)
+#   spy.called_tools
+
+_active_spy: ContextVar[Optional[Spy]] = ContextVar("active_spy", default=None)
+
+def _report_to_active_spy(run):
+    spy = _active_spy.get()
+    if spy is not None:
+        spy(run)
+
+@contextlib.contextmanager
+def spying(spy: Spy):
+    token = _active_spy.set(spy)
+    try:
+        yield spy
+    finally:
+        _active_spy.reset(token)
+
+
+def extract_tool_info(tool_calls, schema_name="Memory"):
+    """Extract information from tool calls for both patches and new memories.
+
+    Args:
+        tool_calls: List of tool calls from the model
+        schema_name: Name of the schema tool (e.g., "Memory", "ToDo", "Profile")
+    """
+
+    # Initialize list of changes
+    changes = []
+
+    for call_group in tool_calls:
+        for call in call_group:
+            if call['name'] == 'PatchDoc':
+                changes.append({
+                    'type': 'update',
+                    'doc_id': call['args']['json_doc_id'],
+                    'planned_edits': call['args']['planned_edits'],
+                    'value': call['args']['patches'][0]['value']
+                })
+            elif call['name'] == schema_name:
+                changes.append({
+                    'type': 'new',
+                    'value': call['args']
+                })
+
+    # Format results as a single string
+    result_parts = []
+    for change in changes:
+        if change['type'] == 'update':
+            result_parts.append(
+                f"Document {change['doc_id']} updated:\n"
+                f"Plan: {change['planned_edits']}\n"
+                f"Added content: {change['value']}"
+            )
+        else:
+            result_parts.append(
+                f"New {schema_name} created:\n"
+                f"Content: {change['value']}"
+            )
+
+    return "\n\n".join(result_parts)
+
+
+# -----------------------------------------------
+# Creating an Agent
+# -----------------------------------------------
+
+# Update memory tool
+class UpdateMemory(TypedDict):
+    """ Decision on what memory type to update """
+    update_type: Literal['user', 'todo', 'instructions']
+
+
+# -------------------------------------
+# User profile schema
+
+class Profile(BaseModel):
+    """
+    This is the profile of the user you are chatting with
+    """
+
+    name: Optional[str] = Field(description="The user's name", default=None)
+    location: Optional[str] = Field(description="The user's location", default=None)
+    job: Optional[str] = Field(description="The user's job", default=None)
+    connections: list[str] = Field(
+        description="Personal connection of the user, such as family members, friends, or coworkers",
+        default_factory=list
+    )
+    interests: list[str] = Field(
+        description="Interests that the user has",
+        default_factory=list
+    )
+
+# -------------------------------------
+# ToDo schema
+
+class ToDo(BaseModel):
+    task: str = Field(description="The task to be completed.")
+    time_to_complete: Optional[int] = Field(description="Estimated time to complete the task (minutes).")
+    deadline: Optional[datetime] = Field(
+        description="When the task needs to be completed by (if applicable)",
+        default=None
+    )
+    solutions: list[str] = Field(
+        description="List of specific, actionable solutions (e.g., specific ideas, service providers, or concrete options relevant to completing the task)",
+        min_items=1,
+        default_factory=list
+    )
+    status: Literal["not started", "in progress", "done", "archived"] = Field(
+        description="Current status of the task",
+        default="not started"
+    )
+
+# -------------------------------------
+# Trustcall extractors for the user profile and the ToDo list
+# (built on first use so importing this module doesn't import trustcall, then
+# cached by get_extractor - rebuilding one re-derives the schemas and tool bindings)
+
+def _profile_extractor():
+    return get_extractor([Profile], model=MODEL, tool_choice="Profile", temperature=0)
+
+def _todo_extractor():
+    return get_extractor([ToDo], model=MODEL, tool_choice="ToDo", enable_inserts=True,
+                         on_end=_report_to_active_spy, temperature=0)
+
+# -------------------------------------
+# Chatbot instruction for choosing what to update and what tools to call
+
+MODEL_SYSTEM_MESSAGE = """
+
+You are a helpful chatbot. 
+
+You are designed to be a companion to a user, helping them keep track of their ToDo list.
+
+You have a long term memory which keeps track of three things:
+
+1. The user's profile (general information about them) 
+2. The user's ToDo list
+3. General instructions for updating the ToDo list
+
+Here is the current User Profile (may be empty if no information has been collected yet):
+<user_profile>
+{user_profile}
+</user_profile>
+
+Here is the current ToDo List (may be empty if no tasks have been added yet):
+<todo>
+{todo}
+</todo>
+
+Here are the current user-specified preferences for updating the ToDo list (may be empty if no preferences have been specified yet):
+<instructions>
+{instructions}
+</instructions>
+
+Here are your instructions for reasoning about the user's messages:
+
+1. Reason carefully about the user's messages as presented below. 
+
+2. Decide whether any of the your long-term memory should be updated:
+- If personal information was provided about the user, update the user's profile by calling UpdateMemory tool with type `user`
+- If tasks are mentioned, update the ToDo list by calling UpdateMemory tool with type `todo`
+- If the user has specified preferences for how to update the ToDo list, update the instructions by calling UpdateMemory tool with type `instructions`
+- If more than one of these applies, call UpdateMemory once for each type in the same response
+
+3. Tell the user that you have updated your memory, if appropriate:
+- Do not tell the user you have updated the user's profile
+- Tell the user them when you update the todo list
+- Do not tell the user that you have updated instructions
+
+4. Err on the side of updating the todo list. No need to ask for explicit permission.
+
+5. Respond naturally to user user after a tool call was made to save memories, or if no tool call was made.
+"""
+
+# -------------------------------------
+# Trustcall instruction
+
+TRUSTCALL_INSTRUCTION = """
+
+Reflect on following interaction. 
+
+Use the provided tools to retain any necessary memories about the user. 
+
+Use parallel tool calling to handle updates and insertions simultaneously.
+
+System Time: {time}
+"""
+
+# -------------------------------------
+# Instructions for updating the ToDo list
+
+CREATE_INSTRUCTIONS = """
+
+Reflect on the following interaction.
+
+Based on this interaction, update your instructions for how to update ToDo list items. 
+
+Use any feedback from the user to update how they like to have items added, etc.
+
+Your current instructions are:
+
+<current_instructions>
+{current_instructions}
+</current_instructions>
+"""
+
+# -------------------------------------
+# Graph state
+
+# update_profile / update_todos send Trustcall only the messages after the last
+# one they already extracted, plus the existing docs - not the whole thread on
+# every update. memory_watermarks holds that message id per memory namespace
+# ("profile", "todo"); both nodes can run in one superstep, so their updates are
+# merged.
+
+def merge_watermarks(left: Optional[Dict[str, str]], right: Optional[Dict[str, str]]) -> Dict[str, str]:
+    return {**(left or {}), **(right or {})}
+
+class TaskMaistroState(MessagesState):
+    memory_watermarks: Annotated[Dict[str, str], merge_watermarks]
+
+# -------------------------------------
+# Node definitions
+
+# Each node has an async twin (a<name>) that LangGraph runs under ainvoke /
+# astream; the prompt building and result handling around the model / store
+# calls are shared.
+
+def _user_id(config: RunnableConfig) -> str:
+    # Get the user ID from the config
+    return config["configurable"]["user_id"]
+
+
+def _task_maistro_messages(state: MessagesState, profiles, todos, instructions):
+
+    if profiles:
+        user_profile = profiles[0].value
+    else:
+        user_profile = None
+
+    todo = "\n".join(f"{mem.value}" for mem in todos)
+
+    if instructions:
+        instructions = instructions[0].value
+    else:
+        instructions = ""
+
+    system_msg = MODEL_SYSTEM_MESSAGE.format(user_profile=user_profile, todo=todo, instructions=instructions)
+
+    return [SystemMessage(content=system_msg)]+state["messages"]
+
+
+def _todo_query(state: MessagesState):
+    # Only the todos the latest user message asks about ("30 minutes", "this week"), never archived ones
+    text = next((m.content for m in reversed(state["messages"])
+                 if isinstance(m, HumanMessage) and isinstance(m.content, str)), "")
+    return todo_query_for(text, datetime.now())
+
+
+def _task_model():
+    # Parallel tool calls - one UpdateMemory call per memory type, all handled in one round trip (see route_message)
+    return _model().bind_tools([UpdateMemory], parallel_tool_calls=True)
+
+
+def task_mAIstro(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    """Load memories from the store and use them to personalize the chatbot's response."""
+
+    user_id = _user_id(config)
+
+    # Retrieve profile memory, task memory and custom instructions from the store
+    # in one round trip (with a TodoIndexedStore, only the todos relevant to the
+    # latest message, from its index - also behind a CachedStore)
+    if hasattr(store, "query_todos"):
+        profiles, instructions = search_many(store, [("profile", user_id), ("instructions", user_id)])
+        todos = store.query_todos(user_id, _todo_query(state))
+    else:
+        profiles, todos, instructions = search_many(
+            store, [("profile", user_id), ("todo", user_id), ("instructions", user_id)])
+
+    # Respond using memory as well as the chat history
+    response = _task_model().invoke(_task_maistro_messages(state, profiles, todos, instructions))
+
+    return {"messages": [response]}
+
+async def atask_mAIstro(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    user_id = _user_id(config)
+
+    if hasattr(store, "query_todos"):
+        (profiles, instructions), todos = await asyncio.gather(
+            asearch_many(store, [("profile", user_id), ("instructions", user_id)]),
+            store.aquery_todos(user_id, _todo_query(state)),
+        )
+    else:
+        profiles, todos, instructions = await asearch_many(
+            store, [("profile", user_id), ("todo", user_id), ("instructions", user_id)])
+
+    response = await _task_model().ainvoke(_task_maistro_messages(state, profiles, todos, instructions))
+
+    return {"messages": [response]}
+
+# -------------------------------------
+
+def _unextracted(state: TaskMaistroState, kind: str):
+    # The history before task_mAIstro's tool call, from the `kind` watermark on
+    return messages_since(state["messages"][:-1], state.get("memory_watermarks", {}).get(kind))
+
+
+def _advance_watermark(state: TaskMaistroState, kind: str, update: dict):
+    # Everything up to task_mAIstro's tool call has now been extracted into `kind`
+    return {**update, "memory_watermarks": {kind: state["messages"][-2].id}}
+
+
+def _extractor_input(messages, existing_items, tool_name: str):
+
+    # Format the existing memories for the Trustcall extractor
+    existing_memories = ([(existing_item.key, tool_name, existing_item.value)
+                          for existing_item in existing_items]
+                          if existing_items
+                          else None
+                        )
+
+    # Merge the chat history and the instruction
+    TRUSTCALL_INSTRUCTION_FORMATTED=TRUSTCALL_INSTRUCTION.format(time=datetime.now().isoformat())
+    updated_messages=list(merge_message_runs(messages=[SystemMessage(content=TRUSTCALL_INSTRUCTION_FORMATTED)] + messages))
+
+    return {"messages": updated_messages, "existing": existing_memories}
+
+
+def _memory_writes(result):
+    # (key, value) of each memory from Trustcall
+    return [(rmeta.get("json_doc_id", str(uuid.uuid4())), r.model_dump(mode="json"))
+            for r, rmeta in zip(result["responses"], result["response_metadata"])]
+
+
+def _tool_reply(state: MessagesState, update_type: str, content: str):
+    # Respond to the tool call(s) made in task_mAIstro for this memory type, confirming the update
+    tool_calls = [tool_call for tool_call in state['messages'][-1].tool_calls
+                  if tool_call['args']['update_type'] == update_type]
+    return {"messages": [{"role": "tool", "content": content, "tool_call_id": tool_call['id']}
+                         for tool_call in tool_calls]}
+
+# -------------------------------------
+
+def update_profile(state: TaskMaistroState, config: RunnableConfig, store: BaseStore):
+
+    """Reflect on the chat history and update the memory collection."""
+
+    # Define the namespace for the memories
+    namespace = ("profile", _user_id(config))
+
+    # Retrieve the most recent memories for context
+    existing_items = store.search(namespace)
+
+    # Invoke the extractor
+    # Invoke the extractor on the messages since its last run
+    result = _profile_extractor().invoke(_extractor_input(_unextracted(state, "profile"), existing_items, "Profile"))
+
+    # Save the memories from Trustcall to the store, in one batch
+    put_many(store, namespace, _memory_writes(result))
+
+    return _advance_watermark(state, "profile", _tool_reply(state, "user", "updated profile"))
+
+async def aupdate_profile(state: TaskMaistroState, config: RunnableConfig, store: BaseStore):
+
+    namespace = ("profile", _user_id(config))
+    existing_items = await store.asearch(namespace)
+
+    result = await _profile_extractor().ainvoke(
+        _extractor_input(_unextracted(state, "profile"), existing_items, "Profile"))
+
+    await aput_many(store, namespace, _memory_writes(result))
+
+    return _advance_watermark(state, "profile", _tool_reply(state, "user", "updated profile"))
+
+# -------------------------------------
+
+def update_todos(state: TaskMaistroState, config: RunnableConfig, store: BaseStore):
+
+    """Reflect on the chat history and update the memory collection."""
+
+    # Define the namespace for the memories
+    namespace = ("todo", _user_id(config))
+
+    # Retrieve the most recent memories for context
+    existing_items = store.search(namespace)
+
+    # Invoke the extractor on the messages since its last run, with a spy for
+    # visibility into the tool calls made by Trustcall
+    with spying(Spy()) as spy:
+        result = _todo_extractor().invoke(_extractor_input(_unextracted(state, "todo"), existing_items, "ToDo"))
+
+    # Save the memories from Trustcall to the store, in one batch
+    put_many(store, namespace, _memory_writes(result))
+
+    # Extract the changes made by Trustcall and add the the ToolMessage returned to task_mAIstro
+    return _advance_watermark(state, "todo", _tool_reply(state, "todo", extract_tool_info(spy.called_tools, "ToDo")))
+
+async def aupdate_todos(state: TaskMaistroState, config: RunnableConfig, store: BaseStore):
+
+    namespace = ("todo", _user_id(config))
+    existing_items = await store.asearch(namespace)
+
+    with spying(Spy()) as spy:
+        result = await _todo_extractor().ainvoke(_extractor_input(_unextracted(state, "todo"), existing_items, "ToDo"))
+
+    await aput_many(store, namespace, _memory_writes(result))
+
+    return _advance_watermark(state, "todo", _tool_reply(state, "todo", extract_tool_info(spy.called_tools, "ToDo")))
+
+# -------------------------------------
+
+def _instructions_messages(state: MessagesState, existing_memory):
+
+    # Format the memory in the system prompt
+    system_msg = CREATE_INSTRUCTIONS.format(current_instructions=existing_memory.value if existing_memory else None)
+    return [SystemMessage(content=system_msg)]+state['messages'][:-1] + [HumanMessage(content="Please update the instructions based on the conversation")]
+
+
+def update_instructions(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    """Reflect on the chat history and update the memory collection."""
+
+    namespace = ("instructions", _user_id(config))
+
+    existing_memory = store.get(namespace, "user_instructions")
+
+    new_memory = _model().invoke(_instructions_messages(state, existing_memory))
+
+    # Overwrite the existing memory in the store
+    key = "user_instructions"
+    store.put(namespace, key, {"memory": new_memory.content})
+    return _tool_reply(state, "instructions", "updated instructions")
+
+async def aupdate_instructions(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    namespace = ("instructions", _user_id(config))
+    existing_memory = await store.aget(namespace, "user_instructions")
+
+    new_memory = await _model().ainvoke(_instructions_messages(state, existing_memory))
+
+    await store.aput(namespace, "user_instructions", {"memory": new_memory.content})
+    return _tool_reply(state, "instructions", "updated instructions")
+
+# -------------------------------------
+# Conditional edge
+
+# One update node per memory type. When task_mAIstro asks for several types in
+# one message, route_message returns all of their nodes: they run in the same
+# superstep (they write to different namespaces) and join back at task_mAIstro,
+# instead of one task_mAIstro round trip per type.
+
+UPDATE_NODES = {
+    "user": "update_profile",
+    "todo": "update_todos",
+    "instructions": "update_instructions",
+}
+
+def route_message(state: MessagesState, config: RunnableConfig, store: BaseStore) -> Union[Literal[END], List[str]]:
+
+    """Reflect on the memories and chat history to decide whether to update the memory collection."""
+
+    message = state['messages'][-1]
+
+    if len(message.tool_calls) ==0:
+        return END
+
+    nodes = []
+    for tool_call in message.tool_calls:
+        node = UPDATE_NODES.get(tool_call['args']['update_type'])
+        if node is None:
+            raise ValueError(f"Unknown update_type: {tool_call['args']['update_type']!r}")
+        # Repeated calls for one type are answered by a single run of its node
+        if node not in nodes:
+            nodes.append(node)
+    return nodes
+
+# -------------------------------------
+# Create the graph + all nodes
+
+def build_task_maistro(checkpointer=None, store=None):
+    """
+    task_mAIstro graph - pass a checkpointer for short-term (within-thread) memory
+    and a store for long-term (across-thread) memory
+    """
+    builder = StateGraph(TaskMaistroState)
+
+    # Define the flow of the memory extraction process
+    builder.add_node("task_mAIstro", with_async(task_mAIstro, atask_mAIstro))
+    builder.add_node("update_todos", with_async(update_todos, aupdate_todos))
+    builder.add_node("update_profile", with_async(update_profile, aupdate_profile))
+    builder.add_node("update_instructions", with_async(update_instructions, aupdate_instructions))
+
+    builder.add_edge(START, "task_mAIstro")
+    builder.add_conditional_edges("task_mAIstro", route_message, [*UPDATE_NODES.values(), END])
+    # The update nodes of one message run together and join here
+    builder.add_edge("update_todos", "task_mAIstro")
+    builder.add_edge("update_profile", "task_mAIstro")
+    builder.add_edge("update_instructions", "task_mAIstro")
+
+    return builder.compile(checkpointer=checkpointer, store=store)
@@ -0,0 +1,272 @@
+# ===============================================
+# Chatbot with Memory Collection Schema
+# ===============================================
+
+import time
+import uuid
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from langchain_core.messages import HumanMessage, SystemMessage, merge_message_runs
+from langchain_core.runnables.config import RunnableConfig
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.store.base import BaseStore
+
+from langgraph_basics.deferred_writes import DEFAULT_WORKERS, DeferredMemoryWriter
+from langgraph_basics.extraction import ExtractionPolicy, messages_since
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model, get_extractor
+from langgraph_basics.store_batch import aput_many, put_many
+
+
+# Initialize the model
+
+MODEL = "gpt-4o"
+
+def _model():
+    return get_chat_model(model=MODEL, temperature=0)
+
+
+# Memory schema
+class Memory(BaseModel):
+    content: str = Field(description="The main content of the memory. For example: User expressed interest in learning about French.")
+
+class MemoryCollection(BaseModel):
+    memories: list[Memory] = Field(description="A collection of memories.")
+
+
+# Create the Trustcall extractor (built on first use, then cached by get_extractor)
+
+def _trustcall_extractor():
+    return get_extractor([Memory], model=MODEL, tool_choice="Memory", enable_inserts=True, temperature=0)
+
+# Chatbot instruction
+MODEL_SYSTEM_MESSAGE = """
+You are a helpful chatbot. You are designed to be a companion to a user. 
+
+You have a long term memory which keeps track of information you learn about the user over time.
+
+Current Memory (may include updated memories from this conversation): {memory}
+"""
+
+# Trustcall instruction
+TRUSTCALL_INSTRUCTION = """
+Reflect on following interaction. 
+
+Use the provided tools to retain any necessary memories about the user. 
+
+Use parallel tool calling to handle updates and insertions simultaneously:
+"""
+
+# -----------------------------------------------
+
+def _memories_namespace(config: RunnableConfig):
+    # Get the user ID from the config
+    user_id = config["configurable"]["user_id"]
+    return (user_id, "memories")
+
+# Memories put in the chat prompt. With a vector-indexed store (VectorIndexedStore
+# from langgraph_basics.vector_index, or an InMemoryStore with an `index` config)
+# they are the ones closest to the latest user message; other stores ignore the
+# query and return the first MEMORY_TOP_K, as store.search(namespace) did
+MEMORY_TOP_K = 10
+
+def _memory_query(state: MessagesState):
+    return next((m.content for m in reversed(state["messages"])
+                 if isinstance(m, HumanMessage) and isinstance(m.content, str)), None)
+
+def _chat_messages(state: MessagesState, memories):
+
+    # Format the memories for the system prompt
+    info = "\n".join(f"- {mem.value['content']}" for mem in memories)
+    system_msg = MODEL_SYSTEM_MESSAGE.format(memory=info)
+
+    return [SystemMessage(content=system_msg)]+state["messages"]
+
+def call_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    """Load memories from the store and use them to personalize the chatbot's response."""
+
+    # Retrieve the memories relevant to the latest message from the store
+    memories = store.search(_memories_namespace(config), query=_memory_query(state), limit=MEMORY_TOP_K)
+
+    # Respond using memory as well as the chat history
+    response = _model().invoke(_chat_messages(state, memories))
+
+    return {"messages": response}
+
+async def acall_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    memories = await store.asearch(_memories_namespace(config), query=_memory_query(state), limit=MEMORY_TOP_K)
+
+    response = await _model().ainvoke(_chat_messages(state, memories))
+
+    return {"messages": response}
+
+# -----------------------------------------------
+
+def _extractor_input(state: MessagesState, existing_items):
+
+    # Format the existing memories for the Trustcall extractor
+    tool_name = "Memory"
+    existing_memories = ([(existing_item.key, tool_name, existing_item.value)
+                          for existing_item in existing_items]
+                          if existing_items
+                          else None
+                        )
+
+    # Merge the chat history and the instruction
+    updated_messages=list(merge_message_runs(messages=[SystemMessage(content=TRUSTCALL_INSTRUCTION)] + state["messages"]))
+
+    return {"messages": updated_messages, "existing": existing_memories}
+
+def _memory_writes(result):
+    # (key, value) of each memory from Trustcall
+    return [(rmeta.get("json_doc_id", str(uuid.uuid4())), r.model_dump(mode="json"))
+            for r, rmeta in zip(result["responses"], result["response_metadata"])]
+
+def write_memory(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    """Reflect on the chat history and update the memory collection."""
+
+    # Define the namespace for the memories
+    namespace = _memories_namespace(config)
+
+    # Retrieve the most recent memories for context
+    existing_items = store.search(namespace)
+
+    # Invoke the extractor
+    result = _trustcall_extractor().invoke(_extractor_input(state, existing_items))
+
+    # Save the memories from Trustcall to the store, in one batch
+    put_many(store, namespace, _memory_writes(result))
+
+async def awrite_memory(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    namespace = _memories_namespace(config)
+    existing_items = await store.asearch(namespace)
+
+    result = await _trustcall_extractor().ainvoke(_extractor_input(state, existing_items))
+
+    await aput_many(store, namespace, _memory_writes(result))
+
+# -----------------------------------------------
+# Debounced extraction (langgraph_basics.extraction)
+# -----------------------------------------------
+
+# With an ExtractionPolicy, debounce_memory decides after each reply whether to
+# extract now, and write_memory sends Trustcall only the messages after
+# memory_watermark - the id of the last message it already saw - plus the
+# existing memories, instead of the whole thread.
+
+class DebouncedState(MessagesState):
+    memory_watermark: str      # id of the last message already extracted
+    last_turn_at: float        # time.time() of the previous turn
+    extract_memory: bool       # set by debounce_memory (or extract_pending_memories)
+
+def _debounce_memory(policy: ExtractionPolicy):
+
+    def debounce_memory(state: DebouncedState):
+
+        """Decide whether the messages since the last extraction are worth extracting now."""
+
+        now = time.time()
+        new_messages = messages_since(state["messages"], state.get("memory_watermark"))
+        extract = policy.should_extract(new_messages, state.get("last_turn_at"), now)
+        return {"last_turn_at": now, "extract_memory": extract}
+
+    return debounce_memory
+
+def route_extraction(state: DebouncedState):
+    return "write_memory" if state.get("extract_memory") else END
+
+def _since_watermark(state: DebouncedState):
+    return {"messages": messages_since(state["messages"], state.get("memory_watermark"))}
+
+def _advance_watermark(state: DebouncedState):
+    return {"memory_watermark": state["messages"][-1].id, "extract_memory": False}
+
+def write_new_memories(state: DebouncedState, config: RunnableConfig, store: BaseStore):
+
+    """Extract memories from the messages since the watermark, then move the watermark."""
+
+    new_state = _since_watermark(state)
+    if new_state["messages"]:
+        write_memory(new_state, config, store)
+    return _advance_watermark(state)
+
+async def awrite_new_memories(state: DebouncedState, config: RunnableConfig, store: BaseStore):
+
+    new_state = _since_watermark(state)
+    if new_state["messages"]:
+        await awrite_memory(new_state, config, store)
+    return _advance_watermark(state)
+
+def extract_pending_memories(graph, config: RunnableConfig):
+    """
+    Extract whatever the policy has held back on a thread - e.g. from an idle timer
+    or at the end of a session
+    """
+    graph.update_state(config, {"extract_memory": True}, as_node="debounce_memory")
+    return graph.invoke(None, config)
+
+# -----------------------------------------------
+# Define a graph
+
+def build_collection_chatbot(checkpointer=None, store=None, deferred_writes: bool = False,
+                             memory_workers: int = DEFAULT_WORKERS,
+                             extraction_policy: Optional[ExtractionPolicy] = None):
+    """
+    Chatbot that keeps a collection of Memory documents per user, updated with Trustcall
+
+    deferred_writes=True returns after call_model and runs write_memory on a pool of
+    `memory_workers` threads, coalesced per user - see graph.memory_writer
+    (langgraph_basics.deferred_writes)
+
+    extraction_policy debounces write_memory and feeds it only the messages since the
+    last extraction - see extract_pending_memories to flush what it holds back
+    """
+    if extraction_policy is not None:
+        if deferred_writes:
+            # The deferred writer keeps the latest whole thread per turn, not deltas
+            raise ValueError("extraction_policy can't be combined with deferred_writes")
+        return _build_debounced_chatbot(extraction_policy, checkpointer, store)
+
+    builder = StateGraph(MessagesState)
+
+    # Nodes
+    builder.add_node("call_model", with_async(call_model, acall_model))
+    if deferred_writes:
+        memory_writer = DeferredMemoryWriter(write_memory, name="memory_collection", max_workers=memory_workers)
+        builder.add_node("write_memory", memory_writer.enqueue)
+    else:
+        memory_writer = None
+        builder.add_node("write_memory", with_async(write_memory, awrite_memory))
+
+    # Edges
+    builder.add_edge(START, "call_model")
+    builder.add_edge("call_model", "write_memory")
+    builder.add_edge("write_memory", END)
+
+    graph = builder.compile(checkpointer=checkpointer, store=store)
+    graph.memory_writer = memory_writer
+    return graph
+
+def _build_debounced_chatbot(policy: ExtractionPolicy, checkpointer=None, store=None):
+    builder = StateGraph(DebouncedState)
+
+    # Nodes
+    builder.add_node("call_model", with_async(call_model, acall_model))
+    builder.add_node("debounce_memory", _debounce_memory(policy))
+    builder.add_node("write_memory", with_async(write_new_memories, awrite_new_memories))
+
+    # Edges
+    builder.add_edge(START, "call_model")
+    builder.add_edge("call_model", "debounce_memory")
+    builder.add_conditional_edges("debounce_memory", route_extraction, ["write_memory", END])
+    builder.add_edge("write_memory", END)
+
+    graph = builder.compile(checkpointer=checkpointer, store=store)
+    graph.memory_writer = None
+    return graph
@@ -0,0 +1,161 @@
+# ===============================================
+# Chatbot with Memory Profile Schema (Trustcall)
+# ===============================================
+
+from pydantic import BaseModel, Field
+
+from langchain_core.messages import SystemMessage
+from langchain_core.runnables.config import RunnableConfig
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.store.base import BaseStore
+
+from langgraph_basics.deferred_writes import DEFAULT_WORKERS, DeferredMemoryWriter
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model, get_extractor
+
+
+# Initialize the model
+
+MODEL = "gpt-4o"
+
+def _model():
+    return get_chat_model(model=MODEL, temperature=0)
+
+
+# Schema
+class UserProfile(BaseModel):
+    """ Profile of a user """
+    user_name: str = Field(description="The user's preferred name")
+    user_location: str = Field(description="The user's location")
+    interests: list = Field(description="A list of the user's interests")
+
+# Create the extractor (built on first use, then cached by get_extractor)
+
+def _trustcall_extractor():
+    # tool_choice enforces use of the UserProfile tool
+    return get_extractor([UserProfile], model=MODEL, tool_choice="UserProfile", temperature=0)
+
+# Chatbot instruction
+MODEL_SYSTEM_MESSAGE = """
+You are a helpful assistant with memory that provides information about the user. 
+If you have memory for this user, use it to personalize your responses.
+Here is the memory (it may be empty): {memory}
+"""
+
+# Extraction instruction
+TRUSTCALL_INSTRUCTION = """
+Create or update the memory (JSON doc) to incorporate information from the following conversation:
+"""
+
+# -------------------------------------
+
+def _profile_namespace(config: RunnableConfig):
+    # Get the user ID from the config
+    user_id = config["configurable"]["user_id"]
+    return ("memory", user_id)
+
+def _chat_messages(state: MessagesState, existing_memory):
+
+    # Format the memories for the system prompt
+    if existing_memory and existing_memory.value:
+        memory_dict = existing_memory.value
+        formatted_memory = (
+            f"Name: {memory_dict.get('user_name', 'Unknown')}\n"
+            f"Location: {memory_dict.get('user_location', 'Unknown')}\n"
+            f"Interests: {', '.join(memory_dict.get('interests', []))}"
+        )
+    else:
+        formatted_memory = None
+
+    # Format the memory in the system prompt
+    system_msg = MODEL_SYSTEM_MESSAGE.format(memory=formatted_memory)
+
+    return [SystemMessage(content=system_msg)]+state["messages"]
+
+def call_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    """Load memory from the store and use it to personalize the chatbot's response."""
+
+    # Retrieve memory from the store
+    existing_memory = store.get(_profile_namespace(config), "user_memory")
+
+    # Respond using memory as well as the chat history
+    response = _model().invoke(_chat_messages(state, existing_memory))
+
+    return {"messages": response}
+
+async def acall_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    existing_memory = await store.aget(_profile_namespace(config), "user_memory")
+
+    response = await _model().ainvoke(_chat_messages(state, existing_memory))
+
+    return {"messages": response}
+
+# -------------------------------------
+
+def _extractor_input(state: MessagesState, existing_memory):
+
+    # Get the profile as the value from the list, and convert it to a JSON doc
+    existing_profile = {"UserProfile": existing_memory.value} if existing_memory else None
+
+    return {"messages": [SystemMessage(content=TRUSTCALL_INSTRUCTION)]+state["messages"], "existing": existing_profile}
+
+def write_memory(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    """Reflect on the chat history and save a memory to the store."""
+
+    # Retrieve existing memory from the store
+    namespace = _profile_namespace(config)
+    existing_memory = store.get(namespace, "user_memory")
+
+    # Invoke the extractor
+    result = _trustcall_extractor().invoke(_extractor_input(state, existing_memory))
+
+    # Get the updated profile as a JSON object
+    updated_profile = result["responses"][0].model_dump()
+
+    # Save the updated profile
+    key = "user_memory"
+    store.put(namespace, key, updated_profile)
+
+async def awrite_memory(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    namespace = _profile_namespace(config)
+    existing_memory = await store.aget(namespace, "user_memory")
+
+    result = await _trustcall_extractor().ainvoke(_extractor_input(state, existing_memory))
+
+    await store.aput(namespace, "user_memory", result["responses"][0].model_dump())
+
+# -----------------------------------------------
+# Define a graph
+
+def build_profile_chatbot(checkpointer=None, store=None, deferred_writes: bool = False,
+                          memory_workers: int = DEFAULT_WORKERS):
+    """
+    Chatbot that keeps a single UserProfile per user, updated with Trustcall
+
+    deferred_writes=True returns after call_model and runs write_memory on a pool of
+    `memory_workers` threads, coalesced per user - see graph.memory_writer
+    (langgraph_basics.deferred_writes)
+    """
+    builder = StateGraph(MessagesState)
+
+    # Nodes
+    builder.add_node("call_model", with_async(call_model, acall_model))
+    if deferred_writes:
+        memory_writer = DeferredMemoryWriter(write_memory, name="memory_profile", max_workers=memory_workers)
+        builder.add_node("write_memory", memory_writer.enqueue)
+    else:
+        memory_writer = None
+        builder.add_node("write_memory", with_async(write_memory, awrite_memory))
+
+    # Edges
+    builder.add_edge(START, "call_model")
+    builder.add_edge("call_model", "write_memory")
+    builder.add_edge("write_memory", END)
+
+    graph = builder.compile(checkpointer=checkpointer, store=store)
+    graph.memory_writer = memory_writer
+    return graph
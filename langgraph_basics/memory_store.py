@@ -0,0 +1,160 @@
+# ===============================================
+# Chatbot with Long-term Memory (Memory Store)
+# ===============================================
+
+from langchain_core.messages import SystemMessage
+from langchain_core.runnables.config import RunnableConfig
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.store.base import BaseStore
+
+from langgraph_basics.deferred_writes import DEFAULT_WORKERS, DeferredMemoryWriter
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model
+
+
+# Chat Model
+
+MODEL = "gpt-4o-mini"
+
+def _llm():
+    return get_chat_model(model=MODEL, temperature=0)
+
+
+# -----------------------------------------------
+
+# Chatbot instruction
+MODEL_SYSTEM_MESSAGE = """
+You are a helpful assistant with memory that provides information about the user. 
+If you have memory for this user, use it to personalize your responses.
+Here is the memory (it may be empty): {memory}
+"""
+
+# Create new memory from the chat history and any existing memory
+CREATE_MEMORY_INSTRUCTION = """"
+You are collecting information about the user to personalize your responses.
+
+CURRENT USER INFORMATION:
+{memory}
+
+INSTRUCTIONS:
+1. Review the chat history below carefully
+2. Identify new information about the user, such as:
+   - Personal details (name, location)
+   - Preferences (likes, dislikes)
+   - Interests and hobbies
+   - Past experiences
+   - Goals or future plans
+3. Merge any new information with existing memory
+4. Format the memory as a clear, bulleted list
+5. If new information conflicts with existing memory, keep the most recent version
+
+Remember: Only include factual information directly stated by the user. Do not make assumptions or inferences.
+
+Based on the chat history below, please update the user information:
+"""
+
+
+# -----------------------------------------------
+
+def _memory_namespace(config: RunnableConfig):
+    # Get the user ID from the config
+    user_id = config["configurable"]["user_id"]
+    return (user_id, "memory"), "user_memory"
+
+
+def _memory_messages(state: MessagesState, existing_memory):
+
+    # Extract the actual memory content if it exist and add a prefix
+    if existing_memory:
+        existing_memory_content = existing_memory.value.get("memory")
+    else:
+        existing_memory_content = "No existing memory found"
+
+    # Format the memory in the system prompt
+    system_msg = MODEL_SYSTEM_MESSAGE.format(memory=existing_memory_content)
+
+    return [SystemMessage(content=system_msg)] + state["messages"]
+
+
+def call_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
+
+    """
+    Load memory from the store and use it to personalize the chatbot's response.
+    """
+
+    # Retrieve memory from the store
+    namespace, key = _memory_namespace(config)
+    existing_memory = store.get(namespace, key)
+
+    # Respond using memory as well as the chat history
+    response = _llm().invoke(_memory_messages(state, existing_memory))
+
+    return {"messages" : [response]}
+
+
+async def acall_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
+    namespace, key = _memory_namespace(config)
+    existing_memory = await store.aget(namespace, key)
+
+    response = await _llm().ainvoke(_memory_messages(state, existing_memory))
+
+    return {"messages" : [response]}
+
+
+# -----------------------------------------------
+
+def write_memory(state: MessagesState, config:RunnableConfig, store: BaseStore):
+    """
+    Reflect on the chat history and save a memory to the store.
+    """
+
+    # Retrieve memory from the store
+    namespace, key = _memory_namespace(config)
+    existing_memory = store.get(namespace, key)
+
+    # Respond using memory as well as the chat history
+    response = _llm().invoke(_memory_messages(state, existing_memory))
+
+    store.put(namespace, key, {"memory" : response.content})
+
+
+async def awrite_memory(state: MessagesState, config:RunnableConfig, store: BaseStore):
+    namespace, key = _memory_namespace(config)
+    existing_memory = await store.aget(namespace, key)
+
+    response = await _llm().ainvoke(_memory_messages(state, existing_memory))
+
+    await store.aput(namespace, key, {"memory" : response.content})
+
+
+# -----------------------------------------------
+# Define a graph
+
+def build_memory_chatbot(checkpointer=None, store=None, deferred_writes: bool = False,
+                         memory_workers: int = DEFAULT_WORKERS):
+    """
+    Chatbot that keeps a free-text memory per user in the store
+
+    deferred_writes=True returns after call_model and runs write_memory on a pool of
+    `memory_workers` threads, coalesced per user - see graph.memory_writer
+    (langgraph_basics.deferred_writes)
+    """
+    builder = StateGraph(MessagesState)
+
+    # Nodes
+    builder.add_node("call_model", with_async(call_model, acall_model))
+    if deferred_writes:
+        memory_writer = DeferredMemoryWriter(write_memory, name="memory_store", max_workers=memory_workers)
+        builder.add_node("write_memory", memory_writer.enqueue)
+    else:
+        memory_writer = None
+        builder.add_node("write_memory", with_async(write_memory, awrite_memory))
+
+    # Edges
+    builder.add_edge(START, "call_model")
+    builder.add_edge("call_model", "write_memory")
+    builder.add_edge("write_memory", END)
+
+    graph = builder.compile(checkpointer=checkpointer, store=store)
+    graph.memory_writer = memory_writer
+    return graph
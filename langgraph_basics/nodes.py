@@ -0,0 +1,21 @@
+# ===============================================
+# Nodes with a sync and an async implementation
+# ===============================================
+
+# A plain function node runs on a worker thread when the graph is driven by
+# ainvoke / astream. Registering an async twin lets LangGraph await it on the
+# event loop instead - the sync one still runs under invoke / stream:
+#
+#   builder.add_node("call_model", with_async(call_model, acall_model))
+#
+# Both get the same injected arguments (config, store) as a plain function node.
+
+
+def with_async(func, afunc, name=None):
+    """
+    Node that runs `func` under invoke / stream and `afunc` under ainvoke / astream
+    """
+    from langgraph.utils.runnable import RunnableCallable
+
+    # trace=False as for plain function nodes - the graph already traces each node
+    return RunnableCallable(func, afunc, name=name or func.__name__, trace=False)
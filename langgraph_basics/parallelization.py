@@ -0,0 +1,149 @@
+# ===============================================
+# Parallelization in Graph - Web and Wikipedia search fan-out
+# ===============================================
+
+import asyncio
+import operator
+from typing import Annotated
+
+from typing_extensions import TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import END, START, StateGraph
+
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model, get_web_search, load_wikipedia
+
+
+MODEL = "gpt-4o-mini"
+
+def _llm():
+    return get_chat_model(model=MODEL, temperature=0)
+
+
+# Define the state class
+
+class State(TypedDict):
+    question : str
+    answer : str
+    context : Annotated[list, operator.add]
+
+
+# Web Search
+
+def _format_web_docs(search_docs):
+
+    formatted_search_docs = "\n\n---\n\n".join(
+        [
+            f'<Document href="{doc["url"]}"/>\n{doc["content"]}\n</Document>'
+            for doc in search_docs
+        ]
+    )
+
+    return {"context" : [formatted_search_docs]}
+
+def search_web(state):
+    """
+    Retrives documents from Web Search
+    """
+
+    # Search
+
+    tavily_search = get_web_search(max_results=3)
+    search_docs = tavily_search.invoke(state["question"])
+
+    # Format
+
+    return _format_web_docs(search_docs)
+
+async def asearch_web(state):
+
+    search_docs = await get_web_search(max_results=3).ainvoke(state["question"])
+
+    return _format_web_docs(search_docs)
+
+
+# Wiki Search
+
+def _format_wikipedia_docs(search_docs):
+
+    formatted_search_docs = "\n\n---\n\n".join(
+        [
+            f'<Document source="{doc.metadata["source"]}" page="{doc.metadata.get("page", "")}"/>\n{doc.page_content}\n</Document>'
+            for doc in search_docs
+        ]
+    )
+
+    return {"context" : [formatted_search_docs]}
+
+def search_wikipedia(state):
+    """
+    Retrives documents from Wikipedia
+    """
+
+    # Search
+    search_docs = load_wikipedia(query=state["question"],
+                                 load_max_docs=2)
+
+    # Format
+    return _format_wikipedia_docs(search_docs)
+
+async def asearch_wikipedia(state):
+
+    # The Wikipedia loader has no async API - keep it off the event loop
+    search_docs = await asyncio.to_thread(load_wikipedia, query=state["question"], load_max_docs=2)
+
+    return _format_wikipedia_docs(search_docs)
+
+
+# Node function to generate answer
+
+def _answer_messages(state):
+
+    # Get state
+    context = state["context"]
+    question = state["question"]
+
+    # Template
+    answer_template = """Answer the question {question} using this context: {context}"""
+    answer_instructions = answer_template.format(question=question,
+                                                       context=context)
+
+    return [SystemMessage(content=answer_instructions)]+[HumanMessage(content=f"Answer the question.")]
+
+def generate_answer(state):
+
+    """ Node to answer a question """
+
+    # Answer
+    answer = _llm().invoke(_answer_messages(state))
+
+    # Append it to state
+    return {"answer": answer}
+
+async def agenerate_answer(state):
+
+    answer = await _llm().ainvoke(_answer_messages(state))
+
+    return {"answer": answer}
+
+
+# Build the graph
+
+def build_search_graph(checkpointer=None):
+    """
+    Web and Wikipedia search in parallel, fanned in to generate_answer
+    """
+    builder = StateGraph(State)
+
+    builder.add_node("search_web", with_async(search_web, asearch_web))
+    builder.add_node("search_wikipedia", with_async(search_wikipedia, asearch_wikipedia))
+    builder.add_node("generate_answer", with_async(generate_answer, agenerate_answer))
+
+    builder.add_edge(START, "search_wikipedia")
+    builder.add_edge(START, "search_web")
+    builder.add_edge("search_wikipedia", "generate_answer")
+    builder.add_edge("search_web", "generate_answer")
+    builder.add_edge("generate_answer", END)
+
+    return builder.compile(checkpointer=checkpointer)
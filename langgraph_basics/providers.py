@@ -0,0 +1,364 @@
+# ===============================================
+# Model and retriever providers
+# ===============================================
+
+# Every script gets its chat model, web search and Wikipedia loader from here,
+# so one switch can swap the real providers for the offline fakes:
+#
+#   LANGGRAPH_BASICS_OFFLINE=1     use FakeChatModel / fake retrievers, skip rendering
+#   LANGGRAPH_BASICS_FAKE_SEED     seed for the fakes (default 0)
+#   LANGGRAPH_BASICS_FAKE_TPS      simulated tokens per second (default: no latency)
+#
+# Web search and Wikipedia results go through an on-disk cache (retrieval_cache.py):
+#
+#   LANGGRAPH_BASICS_RETRIEVAL_CACHE       SQLite path, or "off" (default: ~/.cache/langgraph_basics/retrieval.sqlite;
+#                                          off when offline unless set explicitly)
+#   LANGGRAPH_BASICS_RETRIEVAL_CACHE_TTL   entry lifetime in seconds (default: 7 days)
+#   LANGGRAPH_BASICS_RETRIEVAL_CACHE_SIZE  max entries before LRU eviction (default: 10000)
+#
+# Concurrency (scheduling.py):
+#
+#   LANGGRAPH_BASICS_MAX_IN_FLIGHT  max concurrent branches of a Send() fan-out, or "off" (default: off)
+#   LANGGRAPH_BASICS_RATE_LIMIT     requests/second per model - token bucket on every chat model (default: off)
+#   LANGGRAPH_BASICS_RATE_BURST     token bucket capacity (default: 1)
+#
+# Structured-output calls made from parallel branches can be micro-batched (batching.py):
+#
+#   LANGGRAPH_BASICS_MICRO_BATCH_MS    window in ms for coalescing concurrent calls (default: off)
+#   LANGGRAPH_BASICS_MICRO_BATCH_SIZE  max calls per batch (default: 16)
+#
+# Trustcall extractors are built once per (model, schemas, options) by `get_extractor`.
+#
+# Embeddings for the memory vector index come from `get_embeddings` - OpenAIEmbeddings,
+# or the deterministic HashingEmbeddings when offline.
+#
+# Long-term memory stores come from `get_store(name)` (sqlite_store.py):
+#
+#   LANGGRAPH_BASICS_STORE  directory for the <name>.sqlite store files, or "memory" for InMemoryStore
+#                           (default: ~/.cache/langgraph_basics/stores; memory when offline unless set)
+#
+# Benchmarks can also plug in their own model factory with `set_chat_model_factory`.
+#
+# Providers are created on first use and cached, so importing a graph module
+# never pulls in langchain_openai / langchain_community or needs API keys.
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence
+
+
+OFFLINE_ENV = "LANGGRAPH_BASICS_OFFLINE"
+FAKE_SEED_ENV = "LANGGRAPH_BASICS_FAKE_SEED"
+FAKE_TPS_ENV = "LANGGRAPH_BASICS_FAKE_TPS"
+RETRIEVAL_CACHE_ENV = "LANGGRAPH_BASICS_RETRIEVAL_CACHE"
+RETRIEVAL_CACHE_TTL_ENV = "LANGGRAPH_BASICS_RETRIEVAL_CACHE_TTL"
+RETRIEVAL_CACHE_SIZE_ENV = "LANGGRAPH_BASICS_RETRIEVAL_CACHE_SIZE"
+MAX_IN_FLIGHT_ENV = "LANGGRAPH_BASICS_MAX_IN_FLIGHT"
+RATE_LIMIT_ENV = "LANGGRAPH_BASICS_RATE_LIMIT"
+RATE_BURST_ENV = "LANGGRAPH_BASICS_RATE_BURST"
+MICRO_BATCH_MS_ENV = "LANGGRAPH_BASICS_MICRO_BATCH_MS"
+MICRO_BATCH_SIZE_ENV = "LANGGRAPH_BASICS_MICRO_BATCH_SIZE"
+STORE_ENV = "LANGGRAPH_BASICS_STORE"
+
+DEFAULT_RETRIEVAL_CACHE = "~/.cache/langgraph_basics/retrieval.sqlite"
+DEFAULT_STORE_DIR = "~/.cache/langgraph_basics/stores"
+DEFAULT_MAX_IN_FLIGHT: Optional[int] = None   # unbounded
+
+_chat_model_factory: Optional[Callable[..., Any]] = None
+_instances: Dict[tuple, Any] = {}
+# Re-entrant: creating a chat model looks up its rate limiter through _cached too
+_instances_lock = threading.RLock()
+
+
+def is_offline() -> bool:
+    """
+    Return True when the offline switch is set
+    """
+    return os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def _fake_seed() -> int:
+    return int(os.environ.get(FAKE_SEED_ENV, "0"))
+
+
+def set_chat_model_factory(factory: Optional[Callable[..., Any]]) -> None:
+    """
+    Plug in a factory called as factory(model=..., **kwargs) - None restores the default
+    """
+    global _chat_model_factory
+    _chat_model_factory = factory
+    clear_provider_cache()
+
+
+def clear_provider_cache() -> None:
+    """
+    Drop cached models / retrievers so the next call re-reads the switch
+    """
+    with _instances_lock:
+        _instances.clear()
+
+
+def _cached(key: tuple, create: Callable[[], Any]) -> Any:
+    # Parallel Send branches ask for the same model / batcher / limiter at once -
+    # only the first creates it, so they all share one instance
+    instance = _instances.get(key)
+    if instance is None:
+        with _instances_lock:
+            instance = _instances.get(key)
+            if instance is None:
+                instance = _instances[key] = create()
+    return instance
+
+
+def _kwargs_key(kwargs: Dict[str, Any]) -> str:
+    # Hashable whatever the values - ChatOpenAI takes dicts and lists (model_kwargs, stop, default_headers)
+    return json.dumps(kwargs, sort_keys=True, default=repr)
+
+
+def _disabled(value: str) -> bool:
+    return value.lower() in ("", "0", "off", "false", "no")
+
+
+# -----------------------------------------------
+# Chat model
+# -----------------------------------------------
+
+def get_chat_model(model: str = "gpt-4o", **kwargs: Any):
+    """
+    Return the (cached) chat model for `model` - ChatOpenAI, or FakeChatModel when offline
+    """
+    key = ("chat_model", model, is_offline(), _kwargs_key(kwargs),
+           os.environ.get(RATE_LIMIT_ENV), os.environ.get(RATE_BURST_ENV))
+    return _cached(key, lambda: _with_rate_limiter(_create_chat_model(model, **kwargs), model))
+
+
+def _with_rate_limiter(chat_model, model: str):
+    limiter = get_rate_limiter(model)
+    if limiter is not None and getattr(chat_model, "rate_limiter", False) is None:
+        chat_model.rate_limiter = limiter
+    return chat_model
+
+
+def get_structured_model(schema: Any, model: str = "gpt-4o", **kwargs: Any):
+    """
+    Return the (cached) get_chat_model(model, **kwargs).with_structured_output(schema) -
+    behind a MicroBatcher when LANGGRAPH_BASICS_MICRO_BATCH_MS is set
+    """
+    window = os.environ.get(MICRO_BATCH_MS_ENV, "")
+    chat_model = get_chat_model(model, **kwargs)
+    key = ("structured_model", id(chat_model), schema, window, os.environ.get(MICRO_BATCH_SIZE_ENV))
+
+    def create():
+        structured = chat_model.with_structured_output(schema)
+        if _disabled(window):
+            return structured
+
+        from langgraph_basics.batching import DEFAULT_MAX_BATCH_SIZE, MicroBatcher
+        return MicroBatcher(structured, window=float(window) / 1000,
+                            max_batch_size=int(os.environ.get(MICRO_BATCH_SIZE_ENV, DEFAULT_MAX_BATCH_SIZE)))
+
+    return _cached(key, create)
+
+
+def get_extractor(tools: Sequence[Any], model: str = "gpt-4o", *, tool_choice: Optional[str] = None,
+                  enable_inserts: bool = False, enable_updates: bool = True, enable_deletes: bool = False,
+                  on_end: Optional[Callable[[Any], None]] = None, **kwargs: Any):
+    """
+    Return the (cached) Trustcall extractor for `tools` on get_chat_model(model, **kwargs).
+    `on_end` is attached as a listener - it is part of the cache key, so pass a long-lived
+    function (memory_agent.spying routes it to a per-call Spy)
+    """
+    chat_model = get_chat_model(model, **kwargs)
+    key = ("extractor", id(chat_model), tuple(tools), tool_choice,
+           enable_inserts, enable_updates, enable_deletes, on_end)
+
+    def create():
+        from trustcall import create_extractor
+
+        extractor = create_extractor(chat_model, tools=list(tools), tool_choice=tool_choice,
+                                     enable_inserts=enable_inserts, enable_updates=enable_updates,
+                                     enable_deletes=enable_deletes)
+        return extractor.with_listeners(on_end=on_end) if on_end is not None else extractor
+
+    return _cached(key, create)
+
+
+def get_embeddings(model: str = "text-embedding-3-small"):
+    """
+    Return the (cached) embeddings for `model` - OpenAIEmbeddings, or HashingEmbeddings when offline
+    """
+    key = ("embeddings", model, is_offline())
+
+    def create():
+        if is_offline():
+            from langgraph_basics.fakes import HashingEmbeddings
+            return HashingEmbeddings()
+
+        from langchain_openai import OpenAIEmbeddings
+        return OpenAIEmbeddings(model=model)
+
+    return _cached(key, create)
+
+
+def _create_chat_model(model: str, **kwargs: Any):
+    if _chat_model_factory is not None:
+        return _chat_model_factory(model=model, **kwargs)
+
+    if is_offline():
+        from langgraph_basics.fakes import FakeChatModel
+
+        tps = os.environ.get(FAKE_TPS_ENV)
+        return FakeChatModel(model_name=model,
+                             seed=_fake_seed(),
+                             tokens_per_second=float(tps) if tps else None)
+
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, **kwargs)
+
+
+# -----------------------------------------------
+# Concurrency limits
+# -----------------------------------------------
+
+def get_rate_limiter(model: str):
+    """
+    Return the (cached) token bucket for `model` - shared by every chat model instance
+    of that model, whatever its kwargs - or None when rate limiting is off
+    """
+    rate = os.environ.get(RATE_LIMIT_ENV, "")
+    if _disabled(rate):
+        return None
+
+    burst = int(os.environ.get(RATE_BURST_ENV, "1"))
+    key = ("rate_limiter", model, float(rate), burst)
+
+    def create():
+        from langgraph_basics.scheduling import TokenBucketLimiter
+        return TokenBucketLimiter(requests_per_second=float(rate), burst=burst)
+
+    return _cached(key, create)
+
+
+def max_in_flight() -> Optional[int]:
+    """
+    Default max-in-flight for Send() fan-outs - None means unbounded
+    """
+    value = os.environ.get(MAX_IN_FLIGHT_ENV)
+    if value is None:
+        return DEFAULT_MAX_IN_FLIGHT
+    return None if _disabled(value) else int(value)
+
+
+# -----------------------------------------------
+# Retrievers
+# -----------------------------------------------
+
+def get_retrieval_cache():
+    """
+    Return the (cached) RetrievalCache in front of web search and Wikipedia, or None when disabled
+    """
+    path = os.environ.get(RETRIEVAL_CACHE_ENV)
+    if path is None and not is_offline():
+        path = DEFAULT_RETRIEVAL_CACHE
+    if not path or _disabled(path):
+        return None
+
+    key = ("retrieval_cache", path)
+    return _cached(key, lambda: _create_retrieval_cache(path))
+
+
+def _create_retrieval_cache(path: str):
+    from langgraph_basics.retrieval_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, RetrievalCache
+
+    return RetrievalCache(path,
+                          ttl=float(os.environ.get(RETRIEVAL_CACHE_TTL_ENV, DEFAULT_TTL)),
+                          max_entries=int(os.environ.get(RETRIEVAL_CACHE_SIZE_ENV, DEFAULT_MAX_ENTRIES)))
+
+
+def get_web_search(max_results: int = 3):
+    """
+    Return the (cached) web search tool - TavilySearchResults, or FakeWebSearch when offline -
+    behind the retrieval cache when it is enabled
+    """
+    key = ("web_search", max_results, is_offline(), os.environ.get(RETRIEVAL_CACHE_ENV))
+    return _cached(key, lambda: _create_web_search(max_results))
+
+
+def _create_web_search(max_results: int):
+    if is_offline():
+        from langgraph_basics.fakes import FakeWebSearch
+        tool = FakeWebSearch(max_results=max_results, seed=_fake_seed())
+    else:
+        from langchain_community.tools.tavily_search import TavilySearchResults
+        tool = TavilySearchResults(max_results=max_results)
+
+    cache = get_retrieval_cache()
+    if cache is None:
+        return tool
+
+    from langgraph_basics.retrieval_cache import CachedWebSearch
+    return CachedWebSearch(tool, cache, max_results)
+
+
+def load_wikipedia(query: str, load_max_docs: int = 2):
+    """
+    Load Wikipedia documents for `query` - WikipediaLoader, or seeded docs when offline -
+    through the retrieval cache when it is enabled
+    """
+    cache = get_retrieval_cache()
+    if cache is None:
+        return _load_wikipedia(query=query, load_max_docs=load_max_docs)
+
+    from langgraph_basics.retrieval_cache import cached_wikipedia
+    return cached_wikipedia(cache, _load_wikipedia, query, load_max_docs)
+
+
+def _load_wikipedia(query: str, load_max_docs: int):
+    if is_offline():
+        from langgraph_basics.fakes import fake_wikipedia_docs
+        return fake_wikipedia_docs(query, load_max_docs=load_max_docs, seed=_fake_seed())
+
+    from langchain_community.document_loaders import WikipediaLoader
+    return WikipediaLoader(query=query, load_max_docs=load_max_docs).load()
+
+
+# -----------------------------------------------
+# Long-term memory store
+# -----------------------------------------------
+
+def get_store(name: str):
+    """
+    Return the long-term memory store `name` - the (cached) SqliteStore <dir>/<name>.sqlite,
+    or a new InMemoryStore when LANGGRAPH_BASICS_STORE is "memory" / offline
+    """
+    directory = os.environ.get(STORE_ENV)
+    if directory is None and not is_offline():
+        directory = DEFAULT_STORE_DIR
+    if not directory or directory.lower() == "memory":
+        from langgraph.store.memory import InMemoryStore
+        return InMemoryStore()
+
+    path = os.path.join(os.path.expanduser(directory), f"{name}.sqlite")
+
+    def create():
+        from langgraph_basics.sqlite_store import SqliteStore
+        return SqliteStore(path)
+
+    return _cached(("store", path), create)
+
+
+# -----------------------------------------------
+# Rendering
+# -----------------------------------------------
+
+def display_graph(graph, xray: int = 0) -> None:
+    """
+    Render the graph as a Mermaid PNG in a notebook - skipped when offline
+    (draw_mermaid_png calls the mermaid.ink API)
+    """
+    if is_offline():
+        return
+
+    from IPython.display import Image, display
+    display(Image(graph.get_graph(xray=xray).draw_mermaid_png()))
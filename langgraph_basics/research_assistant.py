@@ -0,0 +1,1155 @@
+# ===============================================
+# Research Assistant - LangGraph
+# ===============================================
+
+# Analysts are generated for a topic (with optional human feedback), each one
+# interviews an expert in parallel (one search query per turn, with web and
+# Wikipedia retrieved concurrently under per-source timeouts), and the
+# sections are reduced into a report with an introduction and conclusion.
+#
+#   graph = build_research_graph(checkpointer=MemorySaver(), interrupt_before=["human_feedback"])
+
+import functools
+import operator
+from typing import List, Optional, Sequence
+
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated, TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage, get_buffer_string
+from langchain_core.runnables import RunnableConfig
+from langgraph.constants import TAG_NOSTREAM, Send
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from langgraph_basics.context import DEFAULT_TOKEN_BUDGET, assemble_context, merge_documents
+from langgraph_basics.nodes import with_async
+from langgraph_basics.providers import get_chat_model, get_structured_model, get_web_search, load_wikipedia
+from langgraph_basics.retrieval import Source, afetch_sources, fetch_sources
+from langgraph_basics.scheduling import fan_out_limiter
+
+
+# -----------------------------------------------
+# LLM Model
+# -----------------------------------------------
+
+MODEL = "gpt-4o"
+
+def _llm():
+    return get_chat_model(model=MODEL, temperature=0)
+
+
+# ***********************************************
+# Generate Analyst - Structure and State
+# ***********************************************
+
+class Analyst(BaseModel):
+    affiliation: str = Field(
+        description="Primary affiliation of the analyst.",
+    )
+    name: str = Field(
+        description="Name of the analyst."
+    )
+    role: str = Field(
+        description="Role of the analyst in the context of the topic.",
+    )
+    description: str = Field(
+        description="Description of the analyst focus, concerns, and motives.",
+    )
+
+    @property
+    def persona(self) -> str:
+        return f"Name: {self.name}\nRole: {self.role}\nAffiliation: {self.affiliation}\nDescription: {self.description}\n"
+
+
+class Perspectives(BaseModel):
+    analysts: List[Analyst] = Field(
+        description="Comprehensive list of analysts with their roles and affiliations.",
+    )
+
+
+class GenerateAnalystsState(TypedDict):
+    topic: str                  # Research topic
+    max_analysts: int           # Maximum number of analysts
+    human_analyst_feedback: str # Human analyst feedback
+    analysts: List[Analyst]     # List of analysts
+
+
+# -----------------------------------------------
+# Create Analysts
+# -----------------------------------------------
+
+analyst_instructions = """
+You are tasked with creating a set of AI analyst personas. 
+Follow these instructions carefully:
+
+1. First, review the research topic:
+{topic}
+
+2. Examine any editorial feedback that has been optionally provided to guide creation of the analysts:
+{human_analyst_feedback}
+
+3. Determine the most interesting themes based upon documents and / or feedback above.
+
+4. Pick the top {max_analysts} themes.
+
+5. Assign one analyst to each theme.
+"""
+
+def _analysts_messages(state: GenerateAnalystsState):
+
+    topic = state['topic']
+    max_analysts = state['max_analysts']
+    human_analyst_feedback = state.get('human_analyst_feedback', '')
+
+    # System message
+    system_message = analyst_instructions.format(topic=topic,
+                                                 human_analyst_feedback=human_analyst_feedback,
+                                                 max_analysts=max_analysts)
+
+    return [SystemMessage(content=system_message)]+[HumanMessage(content="Generate the set of analysts.")]
+
+
+def create_analysts(state: GenerateAnalystsState):
+    """
+    Create analysts based on the provided state.
+    """
+
+    # Enforce structured output
+    structured_llm = _llm().with_structured_output(Perspectives)
+
+    # Generate question
+    analysts = structured_llm.invoke(_analysts_messages(state))
+
+    # Adding list of analysts to state
+    return {"analysts": analysts.analysts}
+
+
+async def acreate_analysts(state: GenerateAnalystsState):
+    analysts = await _llm().with_structured_output(Perspectives).ainvoke(_analysts_messages(state))
+
+    return {"analysts": analysts.analysts}
+
+
+def human_feedback(state: GenerateAnalystsState):
+    """
+    No-op node that should be interrupted on.
+    """
+    pass
+
+
+def should_continue(state: GenerateAnalystsState):
+    """
+    Return the next node to execute.
+    """
+    human_analyst_feedback = state.get('human_analyst_feedback', None)
+
+    if human_analyst_feedback:
+        return "create_analysts"
+
+    return END
+
+
+def build_analysts_graph(checkpointer=None, interrupt_before: Optional[Sequence[str]] = None):
+    """
+    Analyst generation with a human feedback loop
+    """
+    builder = StateGraph(GenerateAnalystsState)
+
+    builder.add_node("create_analysts", with_async(create_analysts, acreate_analysts))
+    builder.add_node("human_feedback", human_feedback)
+
+    builder.add_edge(START, "create_analysts")
+    builder.add_edge("create_analysts", "human_feedback")
+    builder.add_conditional_edges("human_feedback", should_continue, ["create_analysts", END])
+
+    return builder.compile(interrupt_before=interrupt_before, checkpointer=checkpointer)
+
+
+# ***********************************************
+# Conduct Interview - Structure and State
+# ***********************************************
+
+# Generate Question
+
+def add_turn_counts(left: Optional[dict], right: Optional[dict]) -> dict:
+    """
+    Reducer - add per-speaker turn counts
+    """
+    counts = dict(left or {})
+    for name, n in (right or {}).items():
+        counts[name] = counts.get(name, 0) + n
+    return counts
+
+
+class InterviewState(MessagesState):
+    max_num_turns: int # Number turns of conversation
+    context: Annotated[list, merge_documents] # Source docs, deduplicated by URL / source
+    formatted_context: str # Context for this turn's prompts, ranked and packed into CONTEXT_TOKEN_BUDGET
+    analyst: Analyst # Analyst asking questions
+    interview: str # Interview transcript
+    sections: list
+    turn_counts: Annotated[dict, add_turn_counts] # Answers given per speaker name
+
+class SearchQuery(BaseModel):
+    search_query: str = Field(None, description="Search query for retrieval.")
+
+
+question_instructions = """
+You are an analyst tasked with interviewing an expert to learn about a specific topic. 
+
+Your goal is boil down to interesting and specific insights related to your topic.
+
+1. Interesting: Insights that people will find surprising or non-obvious.
+        
+2. Specific: Insights that avoid generalities and include specific examples from the expert.
+
+Here is your topic of focus and set of goals: {goals}
+        
+Begin by introducing yourself using a name that fits your persona, and then ask your question.
+
+Continue to ask questions to drill down and refine your understanding of the topic.
+        
+When you are satisfied with your understanding, complete the interview with: "Thank you so much for your help!"
+
+Remember to stay in character throughout your response, reflecting the persona and goals provided to you.
+"""
+
+def _question_messages(state: InterviewState):
+    # Get state
+    analyst = state["analyst"]
+    messages = state["messages"]
+
+    system_message = question_instructions.format(goals=analyst.persona)
+    return [SystemMessage(content=system_message)]+messages
+
+
+def generate_question(state: InterviewState):
+    """
+    Node to generate a question
+    """
+    # Generate question
+    question = _llm().invoke(_question_messages(state))
+
+    # Write messages to state
+    return {"messages": [question]}
+
+
+async def agenerate_question(state: InterviewState):
+    question = await _llm().ainvoke(_question_messages(state))
+
+    return {"messages": [question]}
+
+
+# -----------------------------------------------
+# Tools to generate Answer
+# -----------------------------------------------
+
+# Search query prompt
+
+search_instructions = """
+You will be given a conversation between an analyst and an expert. 
+
+Your goal is to generate a well-structured query for use in retrieval and / or web-search related to the conversation.
+        
+First, analyze the full conversation.
+
+Pay particular attention to the final question posed by the analyst.
+
+Convert this final question into a well-structured web search query.
+"""
+
+# Per-source retrieval timeouts (seconds) - a source that times out is skipped for that turn
+
+WEB_SEARCH_TIMEOUT = 10.0
+WIKIPEDIA_TIMEOUT = 15.0
+
+# Token budget for the retrieved documents placed in the answer / section prompts
+
+CONTEXT_TOKEN_BUDGET = DEFAULT_TOKEN_BUDGET
+
+
+def _search_query_messages(messages):
+    return [SystemMessage(content=search_instructions)] + messages
+
+
+def generate_search_query(messages) -> str:
+    """
+    Turn the conversation into one search query, shared by every retriever
+    """
+    # Micro-batched across the parallel interviews when enabled
+    structured_llm = get_structured_model(SearchQuery, model=MODEL, temperature=0)
+    return structured_llm.invoke(_search_query_messages(messages)).search_query
+
+
+async def agenerate_search_query(messages) -> str:
+    structured_llm = get_structured_model(SearchQuery, model=MODEL, temperature=0)
+    return (await structured_llm.ainvoke(_search_query_messages(messages))).search_query
+
+
+def _web_documents(search_docs) -> List[dict]:
+    return [{"kind": "web", "source": doc["url"], "content": doc["content"]} for doc in search_docs]
+
+
+def search_web(query: str) -> List[dict]:
+    """
+    Retrieve documents from web search
+    """
+    return _web_documents(get_web_search(max_results=3).invoke(query))
+
+
+async def asearch_web(query: str) -> List[dict]:
+    return _web_documents(await get_web_search(max_results=3).ainvoke(query))
+
+
+def search_wikipedia(query: str) -> List[dict]:
+    """
+    Retrieve documents from wikipedia
+    """
+    search_docs = load_wikipedia(query=query, load_max_docs=2)
+
+    return [
+        {"kind": "wikipedia", "source": doc.metadata["source"], "page": doc.metadata.get("page", ""),
+         "content": doc.page_content}
+        for doc in search_docs
+    ]
+
+
+def _search_sources():
+    # WikipediaLoader has no async API - afetch=None runs it in a worker thread
+    return [
+        Source("web", search_web, asearch_web, timeout=WEB_SEARCH_TIMEOUT),
+        Source("wikipedia", search_wikipedia, timeout=WIKIPEDIA_TIMEOUT),
+    ]
+
+
+def _context_update(state: InterviewState, search_query: str, results) -> dict:
+    # Assemble this turn's context once - answer_question and write_section reuse the string
+    new_docs = [doc for docs in results.values() if docs is not None for doc in docs]
+    docs = merge_documents(state.get("context", []), new_docs)
+
+    return {"context": new_docs,
+            "formatted_context": assemble_context(docs, search_query, token_budget=CONTEXT_TOKEN_BUDGET)}
+
+
+def search(state: InterviewState):
+    """
+    Node to generate one search query and retrieve from web + Wikipedia concurrently
+    """
+    search_query = generate_search_query(state["messages"])
+    results = fetch_sources(search_query, _search_sources())
+
+    return _context_update(state, search_query, results)
+
+
+async def asearch(state: InterviewState):
+    search_query = await agenerate_search_query(state["messages"])
+    results = await afetch_sources(search_query, _search_sources())
+
+    return _context_update(state, search_query, results)
+
+
+# -----------------------------------------------
+# Generate Answer
+# -----------------------------------------------
+
+answer_instructions = """
+You are an expert being interviewed by an analyst.
+
+Here is analyst area of focus: {goals}. 
+        
+You goal is to answer a question posed by the interviewer.
+
+To answer question, use this context:
+        
+{context}
+
+When answering questions, follow these guidelines:
+        
+1. Use only the information provided in the context. 
+        
+2. Do not introduce external information or make assumptions beyond what is explicitly stated in the context.
+
+3. The context contain sources at the topic of each individual document.
+
+4. Include these sources your answer next to any relevant statements. For example, for source # 1 use [1]. 
+
+5. List your sources in order at the bottom of your answer. [1] Source 1, [2] Source 2, etc
+        
+6. If the source is: <Document source="assistant/docs/llama3_1.pdf" page="7"/>' then just list: 
+        
+[1] assistant/docs/llama3_1.pdf, page 7 
+        
+And skip the addition of the brackets as well as the Document source preamble in your citation.
+"""
+
+def _answer_messages(state: InterviewState):
+    # Get state
+    analyst = state["analyst"]
+    messages = state["messages"]
+    context = state.get("formatted_context", "")
+
+    system_message = answer_instructions.format(goals=analyst.persona, context=context)
+    return [SystemMessage(content=system_message)] + messages
+
+
+def _expert_answer(answer):
+    # Name the message as coming from the expert
+    answer.name = "expert"
+
+    # Append it to state, and count the expert's turn for route_messages
+    return {"messages": [answer], "turn_counts": {answer.name: 1}}
+
+
+def generate_answer(state: InterviewState):
+    """
+    Node to answer a question
+    """
+    # Generate answer
+    answer = _llm().invoke(_answer_messages(state))
+
+    return _expert_answer(answer)
+
+
+async def agenerate_answer(state: InterviewState):
+    return _expert_answer(await _llm().ainvoke(_answer_messages(state)))
+
+
+def save_interview(state: InterviewState):
+    """
+    Node to save the interview
+    """
+    # Get Messages
+    messages = state["messages"]
+
+    # Convert interview to a string
+    interview = get_buffer_string(messages)
+
+    # Save to interviews key
+    return {"interview": interview}
+
+
+def route_messages(state: InterviewState, name: str = "expert"):
+    """
+    Route between question and answer
+    """
+    # Get messages
+    messages = state["messages"]
+    max_num_turns = state.get('max_num_turns', 2)
+
+    # Check the number of expert answers (counted by answer_question, no rescan of the messages)
+    num_responses = state.get("turn_counts", {}).get(name, 0)
+
+    # End if expert has answered more than the max turns
+    if num_responses >= max_num_turns:
+        return 'save_interview'
+
+    # This router is run after each question - answer pair
+    # Get the last question asked to check if it signals the end of discussion
+    last_question = messages[-2]
+
+    if "Thank you so much for your help" in last_question.content:
+        return 'save_interview'
+
+    return "ask_question"
+
+
+# -----------------------------------------------
+# Writing answer sections
+# -----------------------------------------------
+
+section_writer_instructions = """
+You are an expert technical writer. 
+            
+Your task is to create a short, easily digestible section of a report based on a set of source documents.
+
+1. Analyze the content of the source documents: 
+- The name of each source document is at the start of the document, with the <Document tag.
+        
+2. Create a report structure using markdown formatting:
+- Use ## for the section title
+- Use ### for sub-section headers
+        
+3. Write the report following this structure:
+a. Title (## header)
+b. Summary (### header)
+c. Sources (### header)
+
+4. Make your title engaging based upon the focus area of the analyst: 
+{focus}
+
+5. For the summary section:
+- Set up summary with general background / context related to the focus area of the analyst
+- Emphasize what is novel, interesting, or surprising about insights gathered from the interview
+- Create a numbered list of source documents, as you use them
+- Do not mention the names of interviewers or experts
+- Aim for approximately 400 words maximum
+- Use numbered sources in your report (e.g., [1], [2]) based on information from source documents
+        
+6. In the Sources section:
+- Include all sources used in your report
+- Provide full links to relevant websites or specific document paths
+- Separate each source by a newline. Use two spaces at the end of each line to create a newline in Markdown.
+- It will look like:
+
+### Sources
+[1] Link or Document name
+[2] Link or Document name
+
+7. Be sure to combine sources. For example this is not correct:
+
+[3] https://ai.meta.com/blog/meta-llama-3-1/
+[4] https://ai.meta.com/blog/meta-llama-3-1/
+
+There should be no redundant sources. It should simply be:
+
+[3] https://ai.meta.com/blog/meta-llama-3-1/
+        
+8. Final review:
+- Ensure the report follows the required structure
+- Include no preamble before the title of the report
+- Check that all guidelines have been followed
+
+"""
+
+def _section_messages(state: InterviewState):
+
+    # Get state
+    interview = state["interview"]
+    analyst = state["analyst"]
+    context = state.get("formatted_context", "")
+
+    # Write section using either the gathered source docs from interview (context) or the interview itself (interview)
+    system_message = section_writer_instructions.format(focus=analyst.description)
+    return [SystemMessage(content=system_message)]+[HumanMessage(content=f"Use this source to write your section: {context}")]
+
+
+def write_section(state: InterviewState):
+    """
+    Node to answer a question
+    """
+
+    section = _llm().invoke(_section_messages(state))
+
+    # Append it to state
+    return {"sections": [section.content]}
+
+
+async def awrite_section(state: InterviewState):
+    section = await _llm().ainvoke(_section_messages(state))
+
+    return {"sections": [section.content]}
+
+
+# -----------------------------------------------
+# Interview graph construction
+# -----------------------------------------------
+
+def build_interview_builder() -> StateGraph:
+    """
+    Uncompiled interview graph - used as the conduct_interview subgraph
+    """
+    interview_builder = StateGraph(InterviewState)
+
+    # Nodes
+    interview_builder.add_node("ask_question", with_async(generate_question, agenerate_question))
+    interview_builder.add_node("search", with_async(search, asearch))
+    interview_builder.add_node("answer_question", with_async(generate_answer, agenerate_answer))
+    interview_builder.add_node("save_interview", save_interview)
+    interview_builder.add_node("write_section", with_async(write_section, awrite_section))
+
+    # Edges
+    interview_builder.add_edge(START, "ask_question")
+    interview_builder.add_edge("ask_question", "search")
+    interview_builder.add_edge("search", "answer_question")
+    interview_builder.add_conditional_edges("answer_question", route_messages, ["ask_question", "save_interview"])
+    interview_builder.add_edge("save_interview", "write_section")
+    interview_builder.add_edge("write_section", END)
+
+    return interview_builder
+
+
+def build_interview_graph(checkpointer=None):
+    """
+    Standalone interview graph for a single analyst
+    """
+    return build_interview_builder().compile(checkpointer=checkpointer).with_config(run_name="Conduct Interview")
+
+
+# -----------------------------------------------
+# Parallel Interviews using Map-Reduce
+# -----------------------------------------------
+
+class ResearchGraphState(TypedDict):
+    topic: str # Reserch topic
+    max_analysts: int # Maximum number of analysts
+    human_analyst_feedback: str # Feedback from human
+    analysts: List[Analyst] # List of analysts asking questions
+    sections: Annotated[list, operator.add] # List of sections
+    formatted_sections: str # Sections joined once, shared by the three report writers
+    introduction: str # Introduction for the final report
+    content: str # Content for the final report
+    conclusion: str # Conclusion for the final report
+    final_report: str # Final report
+
+
+def initiate_all_interviews(state: ResearchGraphState):
+    """
+    Conditional edge to initiate all interviews via Send() API or return to create_analysts
+    """
+
+    # Check if human feedback
+    human_analyst_feedback = state.get('human_analyst_feedback')
+
+    if human_analyst_feedback:
+        # Return to create_analysts
+        return "create_analysts"
+    else:
+        # Otherwise kick off interviews in parallel via Send() API
+        topic = state["topic"]
+        return [Send("conduct_interview", {"analyst": analyst,
+                                           "messages": [HumanMessage(
+                                               content=f"So you said you were writing an article on {topic}?"
+                                           )
+                                                       ]}) for analyst in state["analysts"]]
+
+# Shared prompt prefix
+
+# All three writers see the same (large) set of sections. Joining them once and
+# putting them first, in an identical message, lets the provider reuse its
+# prompt cache for write_introduction / write_conclusion / write_report
+# (OpenAI caches exact prefixes of 1024+ tokens). With `report_fan_in` set, the
+# sections are tree-reduced first (see "Tree reduce" below), here, so all three
+# writers still share one prefix: the merged memos.
+
+report_prefix_instructions = """
+Research topic: {topic}
+
+Here are the memos from your analysts, one report section each:
+
+{formatted_sections}
+"""
+
+def format_sections(state: ResearchGraphState, config: Optional[RunnableConfig] = None):
+    """
+    Join the interview sections (tree-reduced past `report_fan_in`, if set) once for the three report writers
+    """
+    fan_in, max_depth = _report_tree_settings(config)
+    memos = state["sections"]
+    if fan_in is not None:
+        memos = reduce_sections(state["topic"], memos, fan_in, max_depth, config)
+    return {"formatted_sections": "\n\n".join([f"{memo}" for memo in memos])}
+
+
+async def aformat_sections(state: ResearchGraphState, config: Optional[RunnableConfig] = None):
+    fan_in, max_depth = _report_tree_settings(config)
+    memos = state["sections"]
+    if fan_in is not None:
+        memos = await areduce_sections(state["topic"], memos, fan_in, max_depth, config)
+    return {"formatted_sections": "\n\n".join([f"{memo}" for memo in memos])}
+
+
+@functools.lru_cache(maxsize=8)
+def _report_prefix(topic: str, formatted_sections: str) -> SystemMessage:
+    return SystemMessage(content=report_prefix_instructions.format(topic=topic, formatted_sections=formatted_sections))
+
+
+def report_prefix(state: ResearchGraphState) -> SystemMessage:
+    """
+    The shared first message of the three writer prompts - built once per report
+    """
+    return _report_prefix(state["topic"], state["formatted_sections"])
+
+
+# Report Writer
+
+
+report_writer_instructions = """
+
+You are a technical writer creating a report on this overall topic: 
+
+{topic}
+    
+You have a team of analysts. Each analyst has done two things: 
+
+1. They conducted an interview with an expert on a specific sub-topic.
+2. They write up their finding into a memo.
+
+Your task: 
+
+1. You will be given a collection of memos from your analysts.
+2. Think carefully about the insights from each memo.
+3. Consolidate these into a crisp overall summary that ties together the central ideas from all of the memos. 
+4. Summarize the central points in each memo into a cohesive single narrative.
+
+To format your report:
+ 
+1. Use markdown formatting. 
+2. Include no pre-amble for the report.
+3. Use no sub-heading. 
+4. Start your report with a single title header: ## Insights
+5. Do not mention any analyst names in your report.
+6. Preserve any citations in the memos, which will be annotated in brackets, for example [1] or [2].
+7. Create a final, consolidated list of sources and add to a Sources section with the `## Sources` header.
+8. List your sources in order and do not repeat.
+
+[1] Source 1
+[2] Source 2
+
+Build your report from the memos from your analysts above.
+"""
+
+# Tree reduce
+
+# With very many analysts, all sections no longer fit one writer prompt (and
+# that one call gets slow). With `report_fan_in` set, past `report_fan_in`
+# sections they are first merged in parallel batches of `report_fan_in`, level
+# by level, until at most `report_fan_in` memos remain or `report_max_depth`
+# levels have run, in format_sections; the report, introduction and conclusion
+# are then all written from those memos. Both are read from the run's configurable:
+#
+#   graph.invoke(input, {"configurable": {"thread_id": "1", "report_fan_in": 6, "report_max_depth": 2}})
+#
+# Off by default (report_fan_in None: one direct prompt). Merging is lossy and
+# adds a round of model calls - bench.report_tree has it slower than the direct
+# prompt at 16 analysts - so turn it on only when the sections outgrow the
+# model's context.
+
+REPORT_FAN_IN: Optional[int] = None
+REPORT_MAX_DEPTH = 3
+
+merge_memos_instructions = """
+You are a technical writer consolidating memos from a team of analysts on this overall topic: 
+
+{topic}
+
+Merge the memos below into a single memo:
+
+1. Keep every distinct insight, grouped by theme.
+2. Preserve the citations, annotated in brackets, for example [1] or [2], renumbered consistently across the merged memo.
+3. End with a ### Sources list of the cited sources, in order, without repeats.
+4. Use markdown formatting and include no pre-amble.
+
+Here are the memos to merge: 
+
+{memos}
+"""
+
+
+def _report_tree_settings(config: Optional[RunnableConfig]):
+    configurable = (config or {}).get("configurable", {})
+    fan_in = configurable.get("report_fan_in", REPORT_FAN_IN)
+    fan_in = None if fan_in is None else max(int(fan_in), 2)
+    max_depth = int(configurable.get("report_max_depth", REPORT_MAX_DEPTH))
+    return fan_in, max_depth
+
+
+def reduce_sections(topic: str, sections: List[str], fan_in: int,
+                    max_depth: int = REPORT_MAX_DEPTH, config: Optional[RunnableConfig] = None) -> List[str]:
+    """
+    Merge `sections` in parallel batches of `fan_in`, level by level, until at most `fan_in` remain
+    """
+    depth = 0
+    while len(sections) > fan_in and depth < max_depth:
+        batches, prompts = _merge_level(topic, sections, fan_in)
+        sections = _merged_level(batches, _merge_llm().batch(prompts, config))
+        depth += 1
+
+    return sections
+
+
+async def areduce_sections(topic: str, sections: List[str], fan_in: int,
+                           max_depth: int = REPORT_MAX_DEPTH, config: Optional[RunnableConfig] = None) -> List[str]:
+    depth = 0
+    while len(sections) > fan_in and depth < max_depth:
+        batches, prompts = _merge_level(topic, sections, fan_in)
+        sections = _merged_level(batches, await _merge_llm().abatch(prompts, config))
+        depth += 1
+
+    return sections
+
+
+def _merge_llm():
+    # Intermediate memos are not part of the report - keep them out of stream_mode="messages"
+    return _llm().with_config(tags=[TAG_NOSTREAM])
+
+
+def _merge_level(topic: str, sections: List[str], fan_in: int):
+    batches = [sections[i:i + fan_in] for i in range(0, len(sections), fan_in)]
+    prompts = [[HumanMessage(content=merge_memos_instructions.format(topic=topic, memos="\n\n".join(batch)))]
+               for batch in batches if len(batch) > 1]
+    return batches, prompts
+
+
+def _merged_level(batches: List[List[str]], outputs) -> List[str]:
+    merged = iter(outputs)
+    # A trailing batch of one is carried up as is
+    return [next(merged).content if len(batch) > 1 else batch[0] for batch in batches]
+
+
+def _report_messages(state: ResearchGraphState):
+    # Summarize the sections into a final report
+    system_message = report_writer_instructions.format(topic=state["topic"])
+    return [report_prefix(state), SystemMessage(content=system_message)]+[HumanMessage(content=f"Write a report based upon these memos.")]
+
+
+def write_report(state: ResearchGraphState):
+
+    report = _llm().invoke(_report_messages(state))
+    return {"content": report.content}
+
+
+async def awrite_report(state: ResearchGraphState):
+
+    report = await _llm().ainvoke(_report_messages(state))
+    return {"content": report.content}
+
+
+# Introduction Writer
+
+intro_conclusion_instructions = """
+You are a technical writer finishing a report on {topic}
+
+You will be given all of the sections of the report.
+
+You job is to write a crisp and compelling introduction or conclusion section.
+
+The user will instruct you whether to write the introduction or conclusion.
+
+Include no pre-amble for either section.
+
+Target around 100 words, crisply previewing (for introduction) or recapping (for conclusion) all of the sections of the report.
+
+Use markdown formatting. 
+
+For your introduction, create a compelling title and use the # header for the title.
+
+For your introduction, use ## Introduction as the section header. 
+
+For your conclusion, use ## Conclusion as the section header.
+
+Reflect on the sections above for writing.
+"""
+
+def _intro_conclusion_messages(state: ResearchGraphState, request: str):
+
+    topic = state["topic"]
+
+    # Summarize the sections into a final report
+
+    instructions = intro_conclusion_instructions.format(topic=topic)
+    return [report_prefix(state), SystemMessage(content=instructions)]+[HumanMessage(content=request)]
+
+
+def write_introduction(state: ResearchGraphState):
+
+    intro = _llm().invoke(_intro_conclusion_messages(state, "Write the report introduction"))
+
+    return {"introduction": intro.content}
+
+
+async def awrite_introduction(state: ResearchGraphState):
+
+    intro = await _llm().ainvoke(_intro_conclusion_messages(state, "Write the report introduction"))
+
+    return {"introduction": intro.content}
+
+
+def write_conclusion(state: ResearchGraphState):
+
+    conclusion = _llm().invoke(_intro_conclusion_messages(state, "Write the report conclusion"))
+
+    return {"conclusion": conclusion.content}
+
+
+async def awrite_conclusion(state: ResearchGraphState):
+
+    conclusion = await _llm().ainvoke(_intro_conclusion_messages(state, "Write the report conclusion"))
+
+    return {"conclusion": conclusion.content}
+
+
+SECTION_SEPARATOR = "\n\n---\n\n"
+INSIGHTS_HEADER = "## Insights"
+SOURCES_MARKER = "\n## Sources\n"
+
+
+def split_report_content(content: str):
+    """
+    Drop the "## Insights" title from the report body and split off its "## Sources" list
+    """
+    if content.startswith(INSIGHTS_HEADER):
+        content = content[len(INSIGHTS_HEADER):]
+
+    # Only a single Sources section is moved below the conclusion
+    if content.count(SOURCES_MARKER) == 1:
+        content, sources = content.split(SOURCES_MARKER)
+    else:
+        sources = None
+
+    return content, sources
+
+
+def finalize_report(state: ResearchGraphState):
+    """"
+    This is the "reduce" step where we gather all the sections, combine them,
+    and reflect on them to write the intro/conclusion
+    """
+
+    # Save full final report
+
+    content, sources = split_report_content(state["content"])
+
+    final_report = state["introduction"] + SECTION_SEPARATOR + content + SECTION_SEPARATOR + state["conclusion"]
+
+    if sources is not None:
+        final_report += "\n\n## Sources\n" + sources
+
+    return {"final_report": final_report}
+
+
+# -----------------------------------------------
+# Streaming the final report
+# -----------------------------------------------
+
+# write_introduction, write_report and write_conclusion run in parallel. Rather
+# than wait for finalize_report, stream_final_report forwards their tokens as
+# they are generated, in report order: introduction tokens go out live, body
+# and conclusion tokens are buffered until the sections before them finish.
+# The concatenated output equals state["final_report"].
+#
+#   for text in stream_final_report(graph, None, thread):
+#       print(text, end="", flush=True)
+
+REPORT_SECTIONS = ("write_introduction", "write_report", "write_conclusion")
+
+
+class _ReportBody:
+    """
+    Incremental split_report_content - holds back the title prefix and the Sources list
+    """
+
+    def __init__(self):
+        self.head = ""        # text that may still turn out to be the "## Insights" title
+        self.pending = ""     # text that may be the start of the Sources marker
+        self.sources = None   # everything after the first Sources marker
+        self.title_checked = False
+
+    def feed(self, text: str) -> str:
+        if not self.title_checked:
+            self.head += text
+            if len(self.head) < len(INSIGHTS_HEADER) and INSIGHTS_HEADER.startswith(self.head):
+                return ""
+            text, self.head = self._drop_title(self.head), ""
+            self.title_checked = True
+
+        if self.sources is not None:
+            self.sources += text
+            return ""
+
+        text = self.pending + text
+        self.pending = ""
+        if SOURCES_MARKER in text:
+            text, self.sources = text.split(SOURCES_MARKER, 1)
+            return text
+
+        # Keep back a tail that could be the beginning of the marker
+        for size in range(min(len(SOURCES_MARKER) - 1, len(text)), 0, -1):
+            if SOURCES_MARKER.startswith(text[-size:]):
+                text, self.pending = text[:-size], text[-size:]
+                break
+        return text
+
+    def close(self):
+        """
+        Return (remaining body text, sources or None) once the report is complete
+        """
+        text = self._drop_title(self.head) if not self.title_checked else ""
+        text += self.pending
+        if self.sources is not None and SOURCES_MARKER in self.sources:
+            # More than one Sources section - split_report_content keeps them in the body
+            return text + SOURCES_MARKER + self.sources, None
+        return text, self.sources
+
+    @staticmethod
+    def _drop_title(text: str) -> str:
+        return text[len(INSIGHTS_HEADER):] if text.startswith(INSIGHTS_HEADER) else text
+
+
+class ReportStream:
+    """
+    Orders token chunks from the three report writers into the final report text
+    """
+
+    def __init__(self):
+        self.current = 0
+        self.buffers = {section: [] for section in REPORT_SECTIONS}
+        self.finished = set()
+        self.body = _ReportBody()
+        self.sources = None
+
+    def _emit(self, section: str, text: str) -> str:
+        return self.body.feed(text) if section == "write_report" else text
+
+    def feed(self, section: str, text: str) -> str:
+        if section == REPORT_SECTIONS[self.current]:
+            return self._emit(section, text)
+        self.buffers[section].append(text)
+        return ""
+
+    def finish(self, section: str) -> str:
+        """
+        Mark a writer as done and flush every section that can now be emitted
+        """
+        self.finished.add(section)
+        out = []
+        while self.current < len(REPORT_SECTIONS) and REPORT_SECTIONS[self.current] in self.finished:
+            out.append(self._advance())
+        return "".join(out)
+
+    def _advance(self) -> str:
+        out = []
+        if REPORT_SECTIONS[self.current] == "write_report":
+            body, self.sources = self.body.close()
+            out.append(body)
+        self.current += 1
+
+        if self.current < len(REPORT_SECTIONS):
+            out.append(SECTION_SEPARATOR)
+            section = REPORT_SECTIONS[self.current]
+            out.extend(self._emit(section, text) for text in self.buffers.pop(section))
+        elif self.sources is not None:
+            out.append("\n\n## Sources\n" + self.sources)
+        return "".join(out)
+
+    def handle(self, mode: str, chunk) -> str:
+        """
+        Consume one event of graph.stream(..., stream_mode=["messages", "updates"])
+        """
+        if mode == "messages":
+            message, metadata = chunk
+            section = metadata.get("langgraph_node")
+            if section in REPORT_SECTIONS and isinstance(message.content, str):
+                return self.feed(section, message.content)
+        elif mode == "updates":
+            return "".join(self.finish(node) for node in chunk if node in REPORT_SECTIONS)
+        return ""
+
+
+def stream_final_report(graph, input, config=None):
+    """
+    Run the research graph and yield the final report text as the writers generate it
+    """
+    report = ReportStream()
+    for mode, chunk in graph.stream(input, config, stream_mode=["messages", "updates"]):
+        text = report.handle(mode, chunk)
+        if text:
+            yield text
+
+
+async def astream_final_report(graph, input, config=None):
+    report = ReportStream()
+    async for mode, chunk in graph.astream(input, config, stream_mode=["messages", "updates"]):
+        text = report.handle(mode, chunk)
+        if text:
+            yield text
+
+
+# -----------------------------------------------
+# Partial resume
+# -----------------------------------------------
+
+# Every Send("conduct_interview", ...) is its own task with a deterministic id.
+# With a checkpointer on the research graph:
+#
+#   - a branch that finishes has its sections write saved as a pending write
+#     straight away, even if a sibling branch then fails in the same superstep
+#   - the interview subgraph inherits the checkpointer and checkpoints after
+#     every node, in a namespace of its own (conduct_interview:<task id>)
+#
+# so after a failure, graph.invoke(None, thread) reruns only the failed
+# interviews, each from its last completed node - finished interviews are
+# not re-billed.
+#
+#   try:
+#       graph.invoke({"topic": ..., "max_analysts": 6}, thread)
+#   except Exception:
+#       interview_progress(graph, thread)   # which branches failed, and where
+#       graph.invoke(None, thread)          # resume
+
+def interview_progress(graph, config) -> List[dict]:
+    """
+    One entry per conduct_interview branch of the current superstep:
+    {"task_id", "analyst", "status" (done / failed / pending), "turns", "next", "error"}
+    """
+    snapshot = graph.get_state(config, subgraphs=True)
+
+    progress = []
+    for task in snapshot.tasks:
+        if task.name != "conduct_interview":
+            continue
+        values = task.state.values if task.state is not None else {}
+        analyst = values.get("analyst")
+        if task.error is not None:
+            status = "failed"
+        elif task.result is not None:
+            status = "done"
+        else:
+            status = "pending"
+        progress.append({
+            "task_id": task.id,
+            "analyst": analyst.name if analyst is not None else None,
+            "status": status,
+            "turns": sum(values.get("turn_counts", {}).values()),
+            "next": task.state.next if task.state is not None else (),
+            "error": task.error,
+        })
+    return progress
+
+
+# -----------------------------------------------
+# Graph construction
+# -----------------------------------------------
+
+def build_research_graph(checkpointer=None, interrupt_before: Optional[Sequence[str]] = None,
+                         max_in_flight: Optional[int] = None, interview_checkpoints: bool = True):
+    """
+    Full research assistant: analysts -> parallel interviews -> report
+
+    At most `max_in_flight` interviews run at once (default: LANGGRAPH_BASICS_MAX_IN_FLIGHT,
+    0 for no limit); the limiter's metrics are on graph.fan_out_limiters["conduct_interview"]
+
+    With a checkpointer, each interview checkpoints in its own namespace (see
+    "Partial resume" above); interview_checkpoints=False turns that off
+    """
+    builder = StateGraph(ResearchGraphState)
+    interviews = fan_out_limiter("conduct_interview", max_in_flight)
+    interview_graph = build_interview_builder().compile(checkpointer=None if interview_checkpoints else False)
+
+    # Add nodes
+
+    builder.add_node("create_analysts", with_async(create_analysts, acreate_analysts))
+    builder.add_node("human_feedback", human_feedback)
+    builder.add_node("conduct_interview", interviews.wrap(interview_graph))
+    builder.add_node("format_sections", with_async(format_sections, aformat_sections))
+    builder.add_node("write_report", with_async(write_report, awrite_report))
+    builder.add_node("write_introduction", with_async(write_introduction, awrite_introduction))
+    builder.add_node("write_conclusion", with_async(write_conclusion, awrite_conclusion))
+    builder.add_node("finalize_report", finalize_report)
+
+    # Add Edges
+
+    builder.add_edge(START, "create_analysts")
+    builder.add_edge("create_analysts", "human_feedback")
+    builder.add_conditional_edges("human_feedback", initiate_all_interviews, ["create_analysts", "conduct_interview"])
+    builder.add_edge("conduct_interview", "format_sections")
+    builder.add_edge("format_sections", "write_report")
+    builder.add_edge("format_sections", "write_introduction")
+    builder.add_edge("format_sections", "write_conclusion")
+    builder.add_edge(["write_conclusion", "write_report", "write_introduction"], "finalize_report")
+    builder.add_edge("finalize_report", END)
+
+    # Compile
+
+    graph = builder.compile(interrupt_before=interrupt_before, checkpointer=checkpointer)
+    graph.fan_out_limiters = {"conduct_interview": interviews}
+    return graph
@@ -0,0 +1,99 @@
+# ===============================================
+# Concurrent retrieval with per-source timeouts
+# ===============================================
+
+# One search query fans out to several sources at once. Each source has its own
+# timeout; a source that runs out of time contributes nothing instead of holding
+# up the turn, so a retrieval step costs max(source) rather than sum(source).
+#
+#   results = fetch_sources(query, [web, wikipedia])          # threads
+#   results = await afetch_sources(query, [web, wikipedia])   # asyncio tasks
+#
+# Both return {source name: result, or None if that source timed out}.
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    fetch: Callable[[str], Any]
+    afetch: Optional[Callable[[str], Awaitable[Any]]] = None  # default: fetch in a worker thread
+    timeout: float = 10.0                                     # seconds
+
+
+# -----------------------------------------------
+# Sync - one worker thread per source
+# -----------------------------------------------
+
+# Each fetch gets its own daemon thread rather than a slot in a shared pool: it
+# starts as soon as it is submitted, so its timeout never includes time spent
+# queued behind other interviews' fetches, and a fetch that times out (it cannot
+# be interrupted) ties up only its own thread, not a worker later fetches need.
+# The thread runs in a copy of the caller's context, so the node's runnable
+# config (callbacks, tracing) still reaches the retriever.
+
+def _start_fetch(source: Source, query: str) -> "Future[Any]":
+    future: "Future[Any]" = Future()
+    context = contextvars.copy_context()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(source.fetch(query))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=context.run, args=(run,), name=f"retrieval-{source.name}", daemon=True).start()
+    return future
+
+
+def fetch_sources(query: str, sources: Sequence[Source]) -> Dict[str, Any]:
+    """
+    Run every source's `fetch(query)` concurrently, each bounded by its own timeout
+    """
+    start = time.monotonic()
+    futures = [(source, _start_fetch(source, query)) for source in sources]
+
+    results = {}
+    for source, future in futures:
+        remaining = max(source.timeout - (time.monotonic() - start), 0.0)
+        try:
+            results[source.name] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            logger.warning("%s retrieval timed out after %gs for %r", source.name, source.timeout, query)
+            results[source.name] = None
+    return results
+
+
+# -----------------------------------------------
+# Async - one task per source
+# -----------------------------------------------
+
+async def _afetch(source: Source, query: str) -> Any:
+    # Not asyncio.to_thread: the loop's default executor is bounded too
+    call = source.afetch(query) if source.afetch else asyncio.wrap_future(_start_fetch(source, query))
+    try:
+        return await asyncio.wait_for(call, timeout=source.timeout)
+    except asyncio.TimeoutError:
+        logger.warning("%s retrieval timed out after %gs for %r", source.name, source.timeout, query)
+        return None
+
+
+async def afetch_sources(query: str, sources: Sequence[Source]) -> Dict[str, Any]:
+    """
+    Run every source as an asyncio task, each bounded by its own timeout
+    """
+    results = await asyncio.gather(*(_afetch(source, query) for source in sources))
+    return {source.name: result for source, result in zip(sources, results)}
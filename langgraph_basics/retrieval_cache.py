@@ -0,0 +1,199 @@
+# ===============================================
+# On-disk retrieval cache
+# ===============================================
+
+# Tavily results and Wikipedia pages are cached in SQLite, keyed by the
+# normalized query (case, surrounding whitespace and trailing punctuation
+# ignored) plus the loader's parameters. Entries expire after `ttl` seconds and
+# the least recently used ones are evicted past `max_entries`.
+#
+#   cache = RetrievalCache("~/.cache/langgraph_basics/retrieval.sqlite")
+#   docs = cache.get("wikipedia", query, {"load_max_docs": 2})
+#   cache.put("wikipedia", query, {"load_max_docs": 2}, docs)
+#   cache.stats()   # {"hits": ..., "misses": ..., "expired": ..., "evictions": ..., "hit_rate": ...}
+#
+# Values must be JSON-serializable; `CachedWebSearch` and `cached_wikipedia`
+# below adapt the two loaders.
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_TTL = 7 * 24 * 3600   # seconds
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def normalize_query(query: str) -> str:
+    """
+    Casefold, collapse whitespace and drop trailing punctuation / surrounding quotes
+    """
+    query = re.sub(r"\s+", " ", query.casefold()).strip()
+    return query.strip("\"'").rstrip("?!.,;: ")
+
+
+def cache_key(kind: str, query: str, params: Optional[Dict[str, Any]] = None) -> str:
+    payload = json.dumps([kind, normalize_query(query), params or {}], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class RetrievalCache:
+    """
+    SQLite-backed retrieval cache with TTL expiry, an LRU size cap and hit/miss counters
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = self.misses = self.expired = self.evictions = 0
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS retrieval_cache ("
+            " key TEXT PRIMARY KEY, kind TEXT NOT NULL, query TEXT NOT NULL, value TEXT NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS retrieval_cache_accessed ON retrieval_cache (accessed)")
+
+    # -----------------------------------------------
+
+    def get(self, kind: str, query: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Cached value for (kind, normalized query, params), or None on a miss / expired entry
+        """
+        key = cache_key(kind, query, params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM retrieval_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created = row
+            if now - created > self.ttl:
+                self._conn.execute("DELETE FROM retrieval_cache WHERE key = ?", (key,))
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE retrieval_cache SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+
+        return json.loads(value)
+
+    def put(self, kind: str, query: str, params: Optional[Dict[str, Any]], value: Any) -> None:
+        key = cache_key(kind, query, params)
+        now = time.time()
+
+        with self._lock:
+            # Other processes may share the file - the size cap is checked against the
+            # table itself, inside the write transaction
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO retrieval_cache (key, kind, query, value, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, kind, normalize_query(query), json.dumps(value, default=str), now, now),
+                )
+                excess = self._count() - self.max_entries
+                if excess > 0:
+                    self._evict(excess)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM retrieval_cache").fetchone()[0]
+
+    def _evict(self, n: int) -> None:
+        # Least recently used first
+        self.evictions += self._conn.execute(
+            "DELETE FROM retrieval_cache WHERE key IN"
+            " (SELECT key FROM retrieval_cache ORDER BY accessed LIMIT ?)", (n,)
+        ).rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM retrieval_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# -----------------------------------------------
+# Loader adapters
+# -----------------------------------------------
+
+class CachedWebSearch:
+    """
+    Wraps a web search tool (invoke / ainvoke on a query string) with a RetrievalCache
+    """
+
+    def __init__(self, tool, cache: RetrievalCache, max_results: int):
+        self.tool = tool
+        self.cache = cache
+        self.params = {"max_results": max_results}
+
+    def invoke(self, query: str, config: Optional[dict] = None) -> List[dict]:
+        results = self.cache.get("web", query, self.params)
+        if results is None:
+            results = self.tool.invoke(query, config)
+            self._put(query, results)
+        return results
+
+    async def ainvoke(self, query: str, config: Optional[dict] = None) -> List[dict]:
+        # The cache blocks on SQLite I/O (and its lock) - keep that off the event loop
+        results = await asyncio.to_thread(self.cache.get, "web", query, self.params)
+        if results is None:
+            results = await self.tool.ainvoke(query, config)
+            await asyncio.to_thread(self._put, query, results)
+        return results
+
+    def _put(self, query: str, results) -> None:
+        # Tavily reports failures as a string instead of raising - don't cache those
+        if isinstance(results, list):
+            self.cache.put("web", query, self.params, results)
+
+
+def cached_wikipedia(cache: RetrievalCache, load: Callable[..., list], query: str, load_max_docs: int) -> list:
+    """
+    `load(query=..., load_max_docs=...)` through the cache - Documents are stored as JSON
+    """
+    from langchain_core.documents import Document
+
+    params = {"load_max_docs": load_max_docs}
+    docs = cache.get("wikipedia", query, params)
+    if docs is not None:
+        return [Document(page_content=doc["page_content"], metadata=doc["metadata"]) for doc in docs]
+
+    docs = load(query=query, load_max_docs=load_max_docs)
+    cache.put("wikipedia", query, params,
+              [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs])
+    return docs
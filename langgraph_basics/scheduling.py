@@ -0,0 +1,239 @@
+# ===============================================
+# Bounded fan-out and per-model rate limiting
+# ===============================================
+
+# A Send() fan-out starts every branch in the same superstep. With dozens of
+# analysts / subjects that is dozens of concurrent model calls and a 429 storm.
+# Two throttles, both with queue-wait metrics:
+#
+#   FanOutLimiter       at most `max_in_flight` branches of a fan-out run at once;
+#                       the rest wait for a slot (backpressure)
+#   TokenBucketLimiter  requests/second per model, plugged into the chat model's
+#                       `rate_limiter` by providers.get_chat_model
+#
+#   limiter = FanOutLimiter(max_in_flight=4, name="conduct_interview")
+#   builder.add_node("conduct_interview", limiter.wrap(interview_graph))
+#   limiter.stats()   # {"acquired": ..., "peak_in_flight": ..., "queue_wait_ms": {"p50": ..., ...}}
+
+import asyncio
+import contextlib
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Dict, Optional
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+
+class WaitStats:
+    """
+    Queue-wait times in seconds - count / total / max, plus a window of recent waits for percentiles
+    """
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def record(self, wait: float) -> None:
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self.recent.append(wait)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.recent)
+
+        def pct(p):
+            return ordered[min(int(p * len(ordered)), len(ordered) - 1)] * 1000 if ordered else 0.0
+
+        return {
+            "mean": self.total / self.count * 1000 if self.count else 0.0,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "max": self.max * 1000,
+        }
+
+
+# -----------------------------------------------
+# Max-in-flight for Send() fan-outs
+# -----------------------------------------------
+
+class FanOutLimiter:
+    """
+    Semaphore around the node a fan-out Sends to - `max_in_flight=None` means unbounded
+    """
+
+    def __init__(self, max_in_flight: Optional[int], name: str = "fan_out"):
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1 (or None for no limit)")
+        self.max_in_flight = max_in_flight
+        self.name = name
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.waits = WaitStats()
+
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        # asyncio semaphores are bound to one event loop - one per loop
+        self._async_semaphores = weakref.WeakKeyDictionary()
+
+    def _started(self, wait: float) -> None:
+        with self._lock:
+            self.waits.record(wait)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    @contextlib.contextmanager
+    def slot(self):
+        """
+        Block until a slot is free, hold it for the duration of the `with` block
+        """
+        start = time.perf_counter()
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        self._started(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._finished()
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    @contextlib.asynccontextmanager
+    async def aslot(self):
+        start = time.perf_counter()
+        semaphore = None
+        if self.max_in_flight:
+            loop = asyncio.get_running_loop()
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+            await semaphore.acquire()
+        self._started(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._finished()
+            if semaphore is not None:
+                semaphore.release()
+
+    def wrap(self, node: Any):
+        """
+        Wrap a node (function or runnable, e.g. a compiled subgraph) so each call holds a slot
+        """
+        from langchain_core.runnables import RunnableLambda
+
+        runnable = node if hasattr(node, "invoke") else RunnableLambda(node)
+
+        def run(state, config):
+            with self.slot():
+                return runnable.invoke(state, config)
+
+        async def arun(state, config):
+            async with self.aslot():
+                return await runnable.ainvoke(state, config)
+
+        return RunnableLambda(run, afunc=arun, name=self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "acquired": self.waits.count,
+            "queue_wait_ms": self.waits.summary(),
+        }
+
+
+def fan_out_limiter(name: str, max_in_flight: Optional[int] = None) -> FanOutLimiter:
+    """
+    FanOutLimiter for a graph factory - `max_in_flight=None` reads LANGGRAPH_BASICS_MAX_IN_FLIGHT,
+    0 means unbounded
+    """
+    if max_in_flight is None:
+        from langgraph_basics.providers import max_in_flight as default_max_in_flight
+        max_in_flight = default_max_in_flight()
+    return FanOutLimiter(max_in_flight or None, name=name)
+
+
+# -----------------------------------------------
+# Requests per second, per model
+# -----------------------------------------------
+
+class TokenBucketLimiter(BaseRateLimiter):
+    """
+    Token bucket shared by every call to one model: `requests_per_second` refill,
+    up to `burst` requests back to back
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1, check_every: float = 0.01):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be > 0")
+        self.requests_per_second = requests_per_second
+        self.burst = max(burst, 1)
+        self.check_every = check_every
+        self.waits = WaitStats()
+        self.rejected = 0
+
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _consume(self) -> float:
+        """
+        Take a token if there is one (returns 0), else the seconds until the next one
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens + (now - self._last) * self.requests_per_second, self.burst)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.requests_per_second
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        start = time.perf_counter()
+        while True:
+            delay = self._consume()
+            if delay == 0.0:
+                break
+            if not blocking:
+                self.rejected += 1
+                return False
+            time.sleep(min(max(delay, self.check_every), 1.0))
+        self._record(time.perf_counter() - start)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        start = time.perf_counter()
+        while True:
+            delay = self._consume()
+            if delay == 0.0:
+                break
+            if not blocking:
+                self.rejected += 1
+                return False
+            await asyncio.sleep(min(max(delay, self.check_every), 1.0))
+        self._record(time.perf_counter() - start)
+        return True
+
+    def _record(self, wait: float) -> None:
+        with self._lock:
+            self.waits.record(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests_per_second": self.requests_per_second,
+            "burst": self.burst,
+            "acquired": self.waits.count,
+            "rejected": self.rejected,
+            "queue_wait_ms": self.waits.summary(),
+        }
@@ -0,0 +1,75 @@
+# ===============================================
+# The Simplest Graph
+# ===============================================
+
+import random
+from typing import Literal
+
+from typing_extensions import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+
+# -----------------------------------------------
+# Let's define the State of the graph
+# -----------------------------------------------
+
+class State(TypedDict):
+    graph_state: str
+
+
+# -----------------------------------------------
+# Let's define Nodes for the graph
+# -----------------------------------------------
+
+def node_1(state):
+    print("---Node 1---")
+    return {"graph_state": state['graph_state'] + " I am"}
+
+def node_2(state):
+    print("---Node 2---")
+    return {"graph_state": state['graph_state'] + " Happy!"}
+
+def node_3(state):
+    print("---Node 3---")
+    return {"graph_state" : state['graph_state'] + " Sad!"}
+
+
+# -----------------------------------------------
+# Let's define Edges for the graph
+# Condtional Edge
+# -----------------------------------------------
+
+def decide_mood(state) -> Literal["node_2", "node_3"]:
+
+    user_input = state['graph_state']
+
+    if random.random() < 0.5:
+
+        # 50% of the time, we return Node 2
+        return "node_2"
+
+    # 50% of the time, we return Node 3
+    return "node_3"
+
+
+# -----------------------------------------------
+# Let's construct the Graph
+# -----------------------------------------------
+
+def build_simple_graph(checkpointer=None):
+    """
+    node_1 -> node_2 | node_3, picked at random
+    """
+    builder = StateGraph(State)
+
+    builder.add_node("node_1", node_1)
+    builder.add_node("node_2", node_2)
+    builder.add_node("node_3", node_3)
+
+    builder.add_edge(START, "node_1")
+    builder.add_conditional_edges("node_1", decide_mood)
+    builder.add_edge("node_2", END)
+    builder.add_edge("node_3", END)
+
+    return builder.compile(checkpointer=checkpointer)
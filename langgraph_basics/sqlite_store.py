@@ -0,0 +1,375 @@
+# ===============================================
+# SQLite-backed long-term memory store
+# ===============================================
+
+# InMemoryStore forgets every memory when the script exits. SqliteStore keeps
+# them in one SQLite file (WAL mode, like example.db for the checkpointer) and
+# is a drop-in BaseStore for the memory chatbots:
+#
+#   store = SqliteStore("~/.cache/langgraph_basics/stores/memory_store.sqlite")
+#   graph = build_memory_chatbot(checkpointer=MemorySaver(), store=store)
+#
+#   store.put(("memory", "1"), "user_memory", {"memory": "Lance likes biking"})
+#   store.search(("memory",), filter={"status": "done"}, limit=10)
+#
+# Items live in one table keyed by (prefix, key), where prefix is the namespace
+# joined with "." (namespace labels cannot contain "."). The primary key index
+# serves get (prefix = ? AND key IN ...) and search (a range scan over the
+# namespace prefix, in (namespace, key) order) without touching other users'
+# rows.
+#
+# A batch does all its reads in one snapshot, then all its puts in one
+# transaction (the last put for a (namespace, key) wins, value None deletes).
+# Reads use one connection per thread, so concurrent readers never wait for
+# each other or for the writer; writes are serialized by a lock.
+#
+# Filters support the same operators as InMemoryStore ($eq, $ne, $gt, $gte,
+# $lt, $lte and nested dicts). Search `query` is ignored, as it is for an
+# InMemoryStore without an index - wrap the store in a VectorIndexedStore
+# (vector_index.py) for semantic search. The wrapper saves its embeddings in a
+# side table (get_vectors / put_vectors), keyed by item and embedding model, so
+# a restart only embeds the items that are new or changed. Deleting an item
+# deletes its vectors.
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from langgraph.store.base import BaseStore, GetOp, Item, ListNamespacesOp, MatchCondition, PutOp, SearchOp
+
+
+_SEPARATOR = "."
+_MAX_VARIABLES = 500   # keys per "IN (...)" - SQLite caps the bound parameters per statement
+
+_COLUMNS = "prefix, key, value, created_at, updated_at"
+
+
+def _prefix(namespace: Tuple[str, ...]) -> str:
+    return _SEPARATOR.join(namespace)
+
+
+def _namespace(prefix: str) -> Tuple[str, ...]:
+    return tuple(prefix.split(_SEPARATOR)) if prefix else ()
+
+
+def _json_default(value: Any) -> Any:
+    # Trustcall / pydantic model_dump() leaves datetimes in (ToDo.deadline)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _item(row: tuple) -> Item:
+    prefix, key, value, created_at, updated_at = row
+    return Item(value=json.loads(value), key=key, namespace=_namespace(prefix),
+                created_at=created_at, updated_at=updated_at)
+
+
+# -----------------------------------------------
+# Filters and namespace matching (InMemoryStore semantics)
+# -----------------------------------------------
+
+_OPERATORS = {
+    "$eq": lambda value, other: value == other,
+    "$ne": lambda value, other: value != other,
+    "$gt": lambda value, other: float(value) > float(other),
+    "$gte": lambda value, other: float(value) >= float(other),
+    "$lt": lambda value, other: float(value) < float(other),
+    "$lte": lambda value, other: float(value) <= float(other),
+}
+
+
+def _compare(value: Any, expected: Any) -> bool:
+    if isinstance(expected, dict):
+        if any(name.startswith("$") for name in expected):
+            for name, other in expected.items():
+                if name not in _OPERATORS:
+                    raise ValueError(f"Unsupported operator: {name}")
+                if not _OPERATORS[name](value, other):
+                    return False
+            return True
+        if not isinstance(value, dict):
+            return False
+        return all(_compare(value.get(name), other) for name, other in expected.items())
+    if isinstance(expected, (list, tuple)):
+        return (isinstance(value, (list, tuple)) and len(value) == len(expected)
+                and all(_compare(v, e) for v, e in zip(value, expected)))
+    return value == expected
+
+
+def _matches_filter(value: Dict[str, Any], conditions: Optional[Dict[str, Any]]) -> bool:
+    if not conditions:
+        return True
+    return all(_compare(value.get(name), expected) for name, expected in conditions.items())
+
+
+def _matches_condition(condition: MatchCondition, namespace: Tuple[str, ...]) -> bool:
+    path = condition.path
+    if len(namespace) < len(path):
+        return False
+    if condition.match_type == "prefix":
+        pairs = zip(namespace, path)
+    elif condition.match_type == "suffix":
+        pairs = zip(reversed(namespace), reversed(path))
+    else:
+        raise ValueError(f"Unsupported match type: {condition.match_type}")
+    return all(label == "*" or part == label for part, label in pairs)
+
+
+def _prefix_range(namespace_prefix: Tuple[str, ...]) -> Tuple[str, List[Any]]:
+    """
+    WHERE clause (and parameters) for the rows whose namespace starts with `namespace_prefix`
+    """
+    if not namespace_prefix:
+        return "1", []
+    prefix = _prefix(namespace_prefix)
+    # One index range, already in (prefix, key) order: "a.b" up to "a.b/" ("/" is the
+    # character after "."), less the "a.b-x" style neighbours - "a.b" itself or "a.b.<anything>"
+    return ("prefix >= ? AND prefix < ? AND (prefix = ? OR substr(prefix, ?, 1) = ?)",
+            [prefix, prefix + chr(ord(_SEPARATOR) + 1), prefix, len(prefix) + 1, _SEPARATOR])
+
+
+# -----------------------------------------------
+# Store
+# -----------------------------------------------
+
+class SqliteStore(BaseStore):
+    """
+    BaseStore persisted to a SQLite file (WAL), with batched writes and per-thread readers
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = os.path.expanduser(path)
+        self.timeout = timeout
+        # One connection for everything when there is no file to share between connections
+        self._shared = self.path == ":memory:"
+
+        if not self._shared:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._conn = self._connect()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS store ("
+            " prefix TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " created_at TEXT NOT NULL, updated_at TEXT NOT NULL,"
+            " PRIMARY KEY (prefix, key))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            " prefix TEXT NOT NULL, key TEXT NOT NULL, model TEXT NOT NULL,"
+            " digest TEXT NOT NULL, vector BLOB NOT NULL,"
+            " PRIMARY KEY (prefix, key, model))"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._conn.close()
+
+    # -----------------------------------------------
+
+    def batch(self, ops: Iterable[Any]) -> List[Any]:
+        ops = list(ops)
+        results: List[Any] = [None] * len(ops)
+        reads: List[int] = []
+        puts: Dict[Tuple[Tuple[str, ...], str], PutOp] = {}
+        for i, op in enumerate(ops):
+            if isinstance(op, PutOp):
+                puts[(op.namespace, op.key)] = op
+            elif isinstance(op, (GetOp, SearchOp, ListNamespacesOp)):
+                reads.append(i)
+            else:
+                raise ValueError(f"Unknown operation type: {type(op)}")
+
+        # Reads see the store as it was before this batch's puts, as with InMemoryStore
+        if reads:
+            if self._shared:
+                with self._lock:
+                    self._read(self._conn, ops, reads, results)
+            else:
+                self._read(self._reader(), ops, reads, results)
+        if puts:
+            self._write(list(puts.values()))
+        return results
+
+    async def abatch(self, ops: Iterable[Any]) -> List[Any]:
+        return await asyncio.to_thread(self.batch, list(ops))
+
+    # -----------------------------------------------
+
+    def _read(self, conn: sqlite3.Connection, ops: List[Any], reads: List[int], results: List[Any]) -> None:
+        # Several reads share one snapshot - a deferred transaction pins the WAL position
+        snapshot = len(reads) > 1
+        if snapshot:
+            conn.execute("BEGIN")
+        try:
+            gets = [i for i in reads if isinstance(ops[i], GetOp)]
+            if gets:
+                self._get(conn, ops, gets, results)
+            for i in reads:
+                op = ops[i]
+                if isinstance(op, SearchOp):
+                    results[i] = self._search(conn, op)
+                elif isinstance(op, ListNamespacesOp):
+                    results[i] = self._list_namespaces(conn, op)
+        finally:
+            if snapshot:
+                conn.execute("COMMIT")
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, ops: List[Any], gets: List[int], results: List[Any]) -> None:
+        # One query per namespace for all its keys
+        by_prefix: Dict[str, List[int]] = {}
+        for i in gets:
+            by_prefix.setdefault(_prefix(ops[i].namespace), []).append(i)
+        for prefix, indices in by_prefix.items():
+            keys = list(dict.fromkeys(ops[i].key for i in indices))
+            found: Dict[str, Item] = {}
+            for start in range(0, len(keys), _MAX_VARIABLES):
+                chunk = keys[start:start + _MAX_VARIABLES]
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS} FROM store WHERE prefix = ? AND key IN ({', '.join('?' * len(chunk))})",
+                    [prefix, *chunk],
+                )
+                for row in rows:
+                    found[row[1]] = _item(row)
+            for i in indices:
+                results[i] = found.get(ops[i].key)
+
+    @staticmethod
+    def _search(conn: sqlite3.Connection, op: SearchOp) -> List[Item]:
+        where, params = _prefix_range(op.namespace_prefix)
+        sql = f"SELECT {_COLUMNS} FROM store WHERE {where} ORDER BY prefix, key"
+        if not op.filter:
+            rows = conn.execute(sql + " LIMIT ? OFFSET ?", [*params, op.limit, op.offset])
+            return [_item(row) for row in rows]
+
+        # Filtered: stream the namespace in order and stop once offset + limit match
+        items: List[Item] = []
+        skipped = 0
+        for row in conn.execute(sql, params):
+            value = json.loads(row[2])
+            if not _matches_filter(value, op.filter):
+                continue
+            if skipped < op.offset:
+                skipped += 1
+                continue
+            prefix, key, _, created_at, updated_at = row
+            items.append(Item(value=value, key=key, namespace=_namespace(prefix),
+                              created_at=created_at, updated_at=updated_at))
+            if len(items) >= op.limit:
+                break
+        return items
+
+    @staticmethod
+    def _list_namespaces(conn: sqlite3.Connection, op: ListNamespacesOp) -> List[Tuple[str, ...]]:
+        # Narrow to the literal head of a prefix condition, match the rest in Python
+        head: Tuple[str, ...] = ()
+        for condition in op.match_conditions or ():
+            if condition.match_type == "prefix":
+                literal = []
+                for label in condition.path:
+                    if label == "*":
+                        break
+                    literal.append(label)
+                if len(literal) > len(head):
+                    head = tuple(literal)
+
+        where, params = _prefix_range(head)
+        namespaces = [_namespace(prefix) for (prefix,) in
+                      conn.execute(f"SELECT DISTINCT prefix FROM store WHERE {where} ORDER BY prefix", params)]
+        if op.match_conditions:
+            namespaces = [namespace for namespace in namespaces
+                          if all(_matches_condition(condition, namespace) for condition in op.match_conditions)]
+        if op.max_depth is not None:
+            namespaces = sorted({namespace[:op.max_depth] for namespace in namespaces})
+        else:
+            namespaces.sort()
+        return namespaces[op.offset:op.offset + op.limit]
+
+    # -----------------------------------------------
+
+    def _write(self, puts: List[PutOp]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        deletes = [(_prefix(op.namespace), op.key) for op in puts if op.value is None]
+        upserts = [(_prefix(op.namespace), op.key, json.dumps(op.value, default=_json_default), now, now)
+                   for op in puts if op.value is not None]
+        with self._lock:
+            # One transaction per batch - one WAL commit instead of one per put
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if deletes:
+                    self._conn.executemany("DELETE FROM store WHERE prefix = ? AND key = ?", deletes)
+                    self._conn.executemany("DELETE FROM vectors WHERE prefix = ? AND key = ?", deletes)
+                if upserts:
+                    self._conn.executemany(
+                        f"INSERT INTO store ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT (prefix, key) DO UPDATE SET value = excluded.value,"
+                        " updated_at = excluded.updated_at",
+                        upserts,
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # -----------------------------------------------
+    # Embeddings side table (VectorIndexedStore)
+    # -----------------------------------------------
+
+    def get_vectors(self, namespace_prefix: Tuple[str, ...], model: str) -> Dict[Tuple[Tuple[str, ...], str], Tuple[str, bytes]]:
+        """
+        {(namespace, key): (text digest, vector bytes)} saved for `model` under `namespace_prefix`
+        """
+        where, params = _prefix_range(namespace_prefix)
+        sql = f"SELECT prefix, key, digest, vector FROM vectors WHERE {where} AND model = ?"
+        if self._shared:
+            with self._lock:
+                rows = self._conn.execute(sql, [*params, model]).fetchall()
+        else:
+            rows = self._reader().execute(sql, [*params, model]).fetchall()
+        return {(_namespace(prefix), key): (digest, vector) for prefix, key, digest, vector in rows}
+
+    def put_vectors(self, model: str, vectors: Sequence[Tuple[Tuple[str, ...], str, str, bytes]]) -> None:
+        """
+        Save (namespace, key, text digest, vector bytes) rows for `model`, in one transaction
+        """
+        rows = [(_prefix(namespace), key, model, digest, vector) for namespace, key, digest, vector in vectors]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO vectors (prefix, key, model, digest, vector) VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (prefix, key, model) DO UPDATE SET digest = excluded.digest,"
+                    " vector = excluded.vector",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
@@ -0,0 +1,52 @@
+# ===============================================
+# Batched store reads and writes for the memory nodes
+# ===============================================
+
+# store.search / store.put are one BaseStore.batch call each - one round trip
+# (or one SQLite transaction) per namespace read and per memory written. The
+# memory nodes read several namespaces, and write every memory Trustcall
+# returns, through these instead:
+#
+#   profiles, todos = search_many(store, [("profile", user_id), ("todo", user_id)])
+#   put_many(store, ("todo", user_id), [(key, value), ...])
+#
+# Each is a single store.batch (abatch for the a* versions): SqliteStore reads
+# the namespaces in one snapshot and writes the memories in one transaction.
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from langgraph.store.base import BaseStore, Item, PutOp, SearchOp
+
+
+def _searches(namespaces: Sequence[Tuple[str, ...]], limit: int) -> List[SearchOp]:
+    return [SearchOp(tuple(namespace), limit=limit) for namespace in namespaces]
+
+
+def _puts(store: BaseStore, namespace: Tuple[str, ...], writes: Sequence[Tuple[str, Dict[str, Any]]]) -> List[PutOp]:
+    # The TTL store.put would give the items
+    ttl = (store.ttl_config or {}).get("default_ttl")
+    return [PutOp(tuple(namespace), key, value, ttl=ttl) for key, value in writes]
+
+
+def search_many(store: BaseStore, namespaces: Sequence[Tuple[str, ...]], limit: int = 10) -> List[List[Item]]:
+    """
+    store.search(namespace, limit=limit) for each namespace, in one store.batch
+    """
+    return store.batch(_searches(namespaces, limit))
+
+
+async def asearch_many(store: BaseStore, namespaces: Sequence[Tuple[str, ...]], limit: int = 10) -> List[List[Item]]:
+    return await store.abatch(_searches(namespaces, limit))
+
+
+def put_many(store: BaseStore, namespace: Tuple[str, ...], writes: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+    """
+    store.put(namespace, key, value) for each (key, value), in one store.batch
+    """
+    if writes:
+        store.batch(_puts(store, namespace, writes))
+
+
+async def aput_many(store: BaseStore, namespace: Tuple[str, ...], writes: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+    if writes:
+        await store.abatch(_puts(store, namespace, writes))
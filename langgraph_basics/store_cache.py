@@ -0,0 +1,228 @@
+# ===============================================
+# Read-through memory cache in front of a store
+# ===============================================
+
+# The memory nodes read the same items several times per run: call_model and
+# write_memory (memory_store) both get the user's memory, and task_mAIstro
+# re-reads the profile and instructions every time an update node hands back to
+# it. A CachedStore answers repeated get / search operations from an LRU cache:
+#
+#   store = CachedStore(get_store("memory_agent"))                    # per run
+#   store = CachedStore(get_store("memory_agent"), cross_run=True)    # across runs too
+#   graph = build_task_maistro(checkpointer=MemorySaver(), store=store)
+#
+#   store.stats()   # {"hits": ..., "misses": ..., "invalidations": ..., "evictions": ..., "hit_rate": ...}
+#
+# Every put through the wrapper bumps a version stamp for its (namespace, key)
+# and for each prefix of its namespace. A cached get is checked against the
+# stamp of its key, and a cached search against the stamp of its namespace prefix, so
+# update_profile invalidates the cached profile (and searches over it) but not
+# the cached instructions.
+#
+# Per run (the default), entries belong to one graph run of one thread: a run
+# starts when a START-triggered node touches the store, and store calls made
+# outside a graph run are not cached. cross_run=True keeps entries until they
+# are invalidated or evicted - only safe when every write goes through this
+# wrapper (not another process sharing the same SQLite file). A thread's new run
+# drops the entries of its previous run, and at most `max_runs` threads (the
+# most recently active) keep a run at all.
+#
+# Cached items are shared between readers - treat item.value as read-only.
+# Either wrapping order works with a TodoIndexedStore / VectorIndexedStore: a
+# CachedStore forwards the wrapped store's todo queries (query_todos,
+# aquery_todos, count_todos - not cached) and vector side table, and its puts
+# reach the index.
+
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langgraph.config import get_config
+from langgraph.constants import START
+from langgraph.store.base import BaseStore, GetOp, PutOp, SearchOp
+
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_RUNS = 256
+# TodoIndexedStore's queries, SqliteStore's vector side table
+_FORWARDED = ("query_todos", "aquery_todos", "count_todos", "get_vectors", "put_vectors")
+
+
+def _cache_key(op: Any) -> Optional[tuple]:
+    if isinstance(op, GetOp):
+        return ("get", op.namespace, op.key)
+    if isinstance(op, SearchOp):
+        return ("search", op.namespace_prefix, json.dumps(op.filter, sort_keys=True, default=str),
+                op.limit, op.offset, op.query)
+    return None   # list_namespaces and puts go straight to the store
+
+
+def _starts_run(trigger: str) -> bool:
+    # "start:<node>" / "branch:__start__:..." / "__start__", depending on the langgraph version
+    return trigger == START or trigger.startswith("start:") or trigger.startswith(f"branch:{START}")
+
+
+class CachedStore(BaseStore):
+    """
+    BaseStore with a per-run (or cross-run) LRU cache of get / search results, invalidated by version stamps
+    """
+
+    def __init__(self, store: BaseStore, max_entries: int = DEFAULT_MAX_ENTRIES, cross_run: bool = False,
+                 max_runs: int = DEFAULT_MAX_RUNS):
+        self.store = store
+        self.max_entries = max_entries
+        self.max_runs = max_runs
+        self.cross_run = cross_run
+        self.supports_ttl = store.supports_ttl
+        self.ttl_config = store.ttl_config
+        self.hits = self.misses = self.invalidations = self.evictions = 0
+        for name in _FORWARDED:
+            if hasattr(store, name):
+                setattr(self, name, getattr(store, name))
+
+        self._entries: "OrderedDict[tuple, Tuple[int, Any]]" = OrderedDict()   # (scope, op key) -> (stamp, result)
+        self._key_versions: Dict[Tuple[Tuple[str, ...], str], int] = {}
+        self._prefix_versions: Dict[Tuple[str, ...], int] = {}
+        self._runs: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()   # thread_id -> (task that started the run, run number), LRU
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # -----------------------------------------------
+    # Scope and version stamps
+    # -----------------------------------------------
+
+    def _scope(self) -> Optional[tuple]:
+        """
+        Cache scope of the current store call - None when it must not be cached
+        """
+        if self.cross_run:
+            return ()
+        try:
+            config = get_config()
+        except RuntimeError:
+            return None
+        configurable = config.get("configurable", {})
+        thread_id = configurable.get("thread_id")
+        task_id = configurable.get("__pregel_task_id")
+        triggers = config.get("metadata", {}).get("langgraph_triggers", ())
+        with self._lock:
+            run = self._runs.get(thread_id)
+            if any(_starts_run(trigger) for trigger in triggers) and (run is None or run[0] != task_id):
+                if run is not None:
+                    # The previous run's entries can never be read again
+                    self._drop_run((thread_id, run[1]))
+                run = self._runs[thread_id] = (task_id, next(self._counter))
+                while len(self._runs) > self.max_runs:
+                    old_thread_id, (_, old_run) = self._runs.popitem(last=False)
+                    self._drop_run((old_thread_id, old_run))
+            if run is not None:
+                self._runs.move_to_end(thread_id)
+        if run is None:
+            return None
+        return (thread_id, run[1])
+
+    def _drop_run(self, scope: tuple) -> None:
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == scope]:
+            del self._entries[entry_key]
+
+    def _stamp(self, op: Any) -> int:
+        if isinstance(op, GetOp):
+            return self._key_versions.get((op.namespace, op.key), 0)
+        return self._prefix_versions.get(op.namespace_prefix, 0)
+
+    def _bump(self, op: PutOp) -> None:
+        version = next(self._counter)
+        self._key_versions[(op.namespace, op.key)] = version
+        for depth in range(len(op.namespace) + 1):
+            self._prefix_versions[op.namespace[:depth]] = version
+
+    # -----------------------------------------------
+    # Batch
+    # -----------------------------------------------
+
+    def _lookup(self, ops: List[Any], scope: Optional[tuple], results: List[Any]) -> Tuple[List[int], Dict[int, Tuple[tuple, int]]]:
+        """
+        Fill `results` from the cache; return the indexes left for the store, and
+        {index: (entry key, stamp)} of the misses to cache
+        """
+        pending: Dict[int, Tuple[tuple, int]] = {}
+        if scope is None:
+            return list(range(len(ops))), pending
+        remaining = []
+        with self._lock:
+            for i, op in enumerate(ops):
+                key = _cache_key(op)
+                if key is None:
+                    remaining.append(i)
+                    continue
+                entry_key = (scope, key)
+                stamp = self._stamp(op)
+                entry = self._entries.get(entry_key)
+                if entry is not None and entry[0] == stamp:
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    results[i] = entry[1]
+                    continue
+                if entry is not None:
+                    # Written since it was cached
+                    del self._entries[entry_key]
+                    self.invalidations += 1
+                self.misses += 1
+                pending[i] = (entry_key, stamp)
+                remaining.append(i)
+        return remaining, pending
+
+    def _store(self, ops: List[Any], pending: Dict[int, Tuple[tuple, int]], results: List[Any]) -> None:
+        with self._lock:
+            for op in ops:
+                if isinstance(op, PutOp):
+                    self._bump(op)
+            for i, (entry_key, stamp) in pending.items():
+                # Not if it was written since the read - by this batch's puts (the store
+                # reads before it writes) or by another thread
+                if stamp != self._stamp(ops[i]):
+                    continue
+                self._entries[entry_key] = (stamp, results[i])
+                self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def batch(self, ops: Iterable[Any]) -> List[Any]:
+        ops = list(ops)
+        results: List[Any] = [None] * len(ops)
+        remaining, pending = self._lookup(ops, self._scope(), results)
+        if remaining:
+            for i, result in zip(remaining, self.store.batch([ops[i] for i in remaining])):
+                results[i] = result
+        self._store(ops, pending, results)
+        return results
+
+    async def abatch(self, ops: Iterable[Any]) -> List[Any]:
+        ops = list(ops)
+        results: List[Any] = [None] * len(ops)
+        remaining, pending = self._lookup(ops, self._scope(), results)
+        if remaining:
+            for i, result in zip(remaining, await self.store.abatch([ops[i] for i in remaining])):
+                results[i] = result
+        self._store(ops, pending, results)
+        return results
+
+    # -----------------------------------------------
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
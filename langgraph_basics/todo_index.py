@@ -0,0 +1,301 @@
+# ===============================================
+# Secondary indexes over the ToDo store
+# ===============================================
+
+# task_mAIstro used to put store.search(("todo", user_id)) into its prompt -
+# whichever todos came first (10 by default), whatever the user asked. With the
+# store wrapped in a TodoIndexedStore it asks for the todos that match the latest
+# message instead:
+#
+#   store = TodoIndexedStore(InMemoryStore())
+#   graph = build_task_maistro(checkpointer=MemorySaver(), store=store)
+#
+#   store.query_todos(user_id, TodoQuery(max_minutes=30))
+#   store.query_todos(user_id, todo_query_for("What's due this week?", datetime.now()))
+#
+# Per user, the index keeps the todos by status, and sorted by deadline and by
+# time_to_complete, so a query is a few bisects and set intersections rather
+# than a scan. A user's index is loaded from the wrapped store on their first
+# query; after that every write that goes through the wrapper updates it. Write
+# the todos through the wrapper - writes made straight to the wrapped store are
+# not seen by a user's index once it is loaded.
+
+import bisect
+import itertools
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from langgraph.store.base import BaseStore, Item, PutOp
+
+
+TODO_NAMESPACE = "todo"
+PROMPT_LIMIT = 50
+_PAGE = 500
+
+
+@dataclass(frozen=True)
+class TodoQuery:
+    """
+    Todos whose status is not excluded, due before `deadline_before` and taking at
+    most `max_minutes` - soonest deadline first, undated last
+    """
+
+    exclude_status: Tuple[str, ...] = ("archived",)
+    deadline_before: Optional[datetime] = None
+    max_minutes: Optional[int] = None
+    limit: Optional[int] = PROMPT_LIMIT
+
+
+# -----------------------------------------------
+# From the user's message to a query
+# -----------------------------------------------
+
+_MINUTES = re.compile(r"\b(\d+)\s*(?:minutes?|mins?)\b", re.IGNORECASE)
+_HOURS = re.compile(r"\b(\d+(?:\.\d+)?|an|one)\s*(?:hours?|hrs?)\b", re.IGNORECASE)
+_HALF_HOUR = re.compile(r"\bhalf an hour\b", re.IGNORECASE)
+_DUE = [
+    (re.compile(r"\btoday\b|\btonight\b", re.IGNORECASE), lambda today: today + timedelta(days=1)),
+    (re.compile(r"\btomorrow\b", re.IGNORECASE), lambda today: today + timedelta(days=2)),
+    (re.compile(r"\bthis week\b", re.IGNORECASE), lambda today: today + timedelta(days=7 - today.weekday())),
+    (re.compile(r"\bnext week\b", re.IGNORECASE), lambda today: today + timedelta(days=14 - today.weekday())),
+]
+
+
+def todo_query_for(text: str, now: datetime) -> TodoQuery:
+    """
+    Time budget ("30 minutes", "an hour") and horizon ("today", "this week") from a message
+    """
+    minutes = _MINUTES.search(text)
+    hours = _HOURS.search(text)
+    if _HALF_HOUR.search(text):
+        max_minutes = 30
+    elif minutes:
+        max_minutes = int(minutes.group(1))
+    elif hours:
+        amount = hours.group(1).lower()
+        max_minutes = 60 if amount in ("an", "one") else int(float(amount) * 60)
+    else:
+        max_minutes = None
+
+    deadline_before = None
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for pattern, horizon in _DUE:
+        if pattern.search(text):
+            deadline_before = horizon(today)
+            break
+
+    return TodoQuery(deadline_before=deadline_before, max_minutes=max_minutes)
+
+
+# -----------------------------------------------
+# Per-user index
+# -----------------------------------------------
+
+def _timestamp(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+class _UserTodos:
+
+    def __init__(self):
+        self.items: Dict[str, Item] = {}
+        self.fields: Dict[str, Tuple[Any, Optional[float], Optional[int]]] = {}   # key -> indexed fields
+        self.by_status: Dict[str, Set[str]] = {}
+        self.by_deadline: List[Tuple[float, str]] = []     # sorted (timestamp, key)
+        self.by_minutes: List[Tuple[int, str]] = []        # sorted (time_to_complete, key)
+        self.undated: Dict[str, None] = {}                 # keys without a deadline, in insertion order
+
+    def add(self, item: Item) -> None:
+        self.remove(item.key)
+        value = item.value
+        status, deadline, minutes = fields = (value.get("status"), _timestamp(value.get("deadline")),
+                                              value.get("time_to_complete"))
+        self.items[item.key] = item
+        self.fields[item.key] = fields
+        self.by_status.setdefault(status, set()).add(item.key)
+        if deadline is None:
+            self.undated[item.key] = None
+        else:
+            bisect.insort(self.by_deadline, (deadline, item.key))
+        if minutes is not None:
+            bisect.insort(self.by_minutes, (minutes, item.key))
+
+    def remove(self, key: str) -> None:
+        if self.items.pop(key, None) is None:
+            return
+        status, deadline, minutes = self.fields.pop(key)
+        self.by_status[status].discard(key)
+        if deadline is None:
+            self.undated.pop(key, None)
+        else:
+            del self.by_deadline[bisect.bisect_left(self.by_deadline, (deadline, key))]
+        if minutes is not None:
+            del self.by_minutes[bisect.bisect_left(self.by_minutes, (minutes, key))]
+
+    def query(self, query: TodoQuery) -> List[Item]:
+        deadline_end = (len(self.by_deadline) if query.deadline_before is None
+                        else bisect.bisect_left(self.by_deadline, (query.deadline_before.timestamp(), "")))
+        # time_to_complete is a whole number of minutes
+        minutes_end = (None if query.max_minutes is None
+                       else bisect.bisect_left(self.by_minutes, (query.max_minutes + 1, "")))
+
+        def matches(key: str) -> bool:
+            status, deadline, minutes = self.fields[key]
+            if status in query.exclude_status:
+                return False
+            if query.max_minutes is not None and (minutes is None or minutes > query.max_minutes):
+                return False
+            if query.deadline_before is not None and (deadline is None or deadline >= query.deadline_before.timestamp()):
+                return False
+            return True
+
+        # Start from whichever index leaves the fewest candidates
+        statuses = [keys for status, keys in self.by_status.items() if status not in query.exclude_status]
+        sizes = {"status": sum(len(keys) for keys in statuses)}
+        if minutes_end is not None:
+            sizes["minutes"] = minutes_end
+        # The deadline walk stops at the limit - about limit / (share of keys that match) steps
+        walk = deadline_end + (len(self.undated) if query.deadline_before is None else 0)
+        if query.limit is not None and self.items:
+            walk = min(walk, query.limit * len(self.items) / max(1, min(sizes.values())))
+        sizes["deadline"] = walk
+        driver = min(sizes, key=sizes.get)
+
+        if driver != "deadline":
+            candidates = (itertools.chain.from_iterable(statuses) if driver == "status"
+                          else (key for _, key in self.by_minutes[:minutes_end]))
+            keys = [key for key in candidates if matches(key)]
+            keys.sort(key=lambda key: (self.fields[key][1] is None, self.fields[key][1] or 0.0, key))
+            return [self.items[key] for key in keys[:query.limit]]
+
+        # Walk the deadline index in order (undated last), so the limit keeps the soonest ones
+        ordered = itertools.chain((key for _, key in itertools.islice(self.by_deadline, deadline_end)),
+                                  self.undated if query.deadline_before is None else ())
+        results = []
+        for key in ordered:
+            if matches(key):
+                results.append(self.items[key])
+                if query.limit is not None and len(results) >= query.limit:
+                    break
+        return results
+
+
+# -----------------------------------------------
+# Store wrapper
+# -----------------------------------------------
+
+class TodoIndexedStore(BaseStore):
+    """
+    BaseStore that passes every operation to `store` and indexes the (TODO_NAMESPACE, user_id) items
+    """
+
+    def __init__(self, store: BaseStore, namespace: str = TODO_NAMESPACE):
+        self.store = store
+        self.namespace = namespace
+        self.supports_ttl = store.supports_ttl
+        self.ttl_config = store.ttl_config
+        self._users: Dict[str, _UserTodos] = {}
+        self._loading: Dict[str, List[PutOp]] = {}   # writes made while a user's todos are being read
+        self._lock = threading.Lock()
+
+    def batch(self, ops: Iterable[Any]) -> List[Any]:
+        ops = list(ops)
+        results = self.store.batch(ops)
+        self._apply(ops)
+        return results
+
+    async def abatch(self, ops: Iterable[Any]) -> List[Any]:
+        ops = list(ops)
+        results = await self.store.abatch(ops)
+        self._apply(ops)
+        return results
+
+    def _apply(self, ops: List[Any]) -> None:
+        # Keep the loaded users' indexes in step with the writes just made
+        with self._lock:
+            for op in ops:
+                if not isinstance(op, PutOp) or len(op.namespace) != 2 or op.namespace[0] != self.namespace:
+                    continue
+                user_id = op.namespace[1]
+                todos = self._users.get(user_id)
+                if todos is not None:
+                    self._apply_put(todos, op)
+                elif user_id in self._loading:
+                    # The load may have read the store before this write - replay it after
+                    self._loading[user_id].append(op)
+
+    @staticmethod
+    def _apply_put(todos: _UserTodos, op: PutOp) -> None:
+        if op.value is None:
+            todos.remove(op.key)
+            return
+        now = datetime.now(timezone.utc)
+        current = todos.items.get(op.key)
+        todos.add(Item(value=op.value, key=op.key, namespace=op.namespace,
+                       created_at=current.created_at if current else now, updated_at=now))
+
+    # -----------------------------------------------
+
+    def _start_load(self, user_id: str) -> None:
+        with self._lock:
+            self._loading.setdefault(user_id, [])
+
+    def _index(self, user_id: str, items: List[Item]) -> _UserTodos:
+        with self._lock:
+            writes = self._loading.pop(user_id, [])
+            todos = self._users.get(user_id)
+            if todos is None:
+                todos = _UserTodos()
+                for item in items:
+                    if len(item.namespace) == 2:
+                        todos.add(item)
+                for op in writes:
+                    self._apply_put(todos, op)
+                self._users[user_id] = todos
+            return todos
+
+    def _load(self, user_id: str) -> _UserTodos:
+        todos = self._users.get(user_id)
+        if todos is not None:
+            return todos
+        self._start_load(user_id)
+        namespace = (self.namespace, user_id)
+        items = []
+        while True:
+            page = self.store.search(namespace, limit=_PAGE, offset=len(items))
+            items.extend(page)
+            if len(page) < _PAGE:
+                return self._index(user_id, items)
+
+    async def _aload(self, user_id: str) -> _UserTodos:
+        todos = self._users.get(user_id)
+        if todos is not None:
+            return todos
+        self._start_load(user_id)
+        namespace = (self.namespace, user_id)
+        items = []
+        while True:
+            page = await self.store.asearch(namespace, limit=_PAGE, offset=len(items))
+            items.extend(page)
+            if len(page) < _PAGE:
+                return self._index(user_id, items)
+
+    def query_todos(self, user_id: str, query: TodoQuery = TodoQuery()) -> List[Item]:
+        todos = self._load(user_id)
+        with self._lock:
+            return todos.query(query)
+
+    async def aquery_todos(self, user_id: str, query: TodoQuery = TodoQuery()) -> List[Item]:
+        todos = await self._aload(user_id)
+        with self._lock:
+            return todos.query(query)
+
+    def count_todos(self, user_id: str) -> int:
+        return len(self._load(user_id).items)
@@ -0,0 +1,529 @@
+# ===============================================
+# Vector index over store items - top-k memories for the prompt
+# ===============================================
+
+# The memory chatbots put every memory from store.search(namespace) into the
+# system prompt. A VectorIndexedStore answers store.search(namespace, query=...,
+# limit=k) with the k items whose text is closest to the query instead:
+#
+#   store = VectorIndexedStore(InMemoryStore(), get_embeddings(), fields=("content",))
+#   graph = build_collection_chatbot(checkpointer=MemorySaver(), store=store)
+#   store.search(("user-1", "memories"), query="What should I cook tonight?", limit=10)
+#
+# It wraps any BaseStore. Searches without a query (and with a filter) go to the
+# wrapped store unchanged. The vectors of a namespace prefix are loaded from the
+# wrapped store on its first query search and kept in one NumPy matrix of unit
+# rows, so cosine similarity is a single matrix-vector product. After that,
+# every write through the wrapper is embedded and indexed too.
+#
+# When the wrapped store can save vectors (SqliteStore's get_vectors /
+# put_vectors side table), the embeddings are kept there, keyed by item and
+# embedding model and checked against a digest of the item's text: loading a
+# prefix after a restart only embeds the items that are new or have changed.
+#
+# Past tens of thousands of items per namespace, an approximate index narrows
+# the rows that get scored:
+#
+#   index="flat"   score every row - exact (default)
+#   index="ivf"    k-means centroids (NumPy), score the rows of the `nprobe` nearest lists
+#   index="hnsw"   hnswlib graph (optional dependency: pip install hnswlib)
+
+import asyncio
+import hashlib
+import itertools
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from langgraph.store.base import BaseStore, Item, PutOp, SearchItem, SearchOp
+
+
+DEFAULT_TOP_K = 10
+_PAGE = 1000
+_MIN_COMPACT = 1024
+
+
+def _unit_rows(vectors: Any) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _embedding_model(embeddings: Any) -> str:
+    # Vectors saved for one model are never reused for another
+    parts = [type(embeddings).__name__, getattr(embeddings, "model", None),
+             getattr(embeddings, "dimensions", None) or getattr(embeddings, "dims", None)]
+    return ":".join(str(part) for part in parts if part is not None)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    # Positions of the k highest scores, best first
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+# -----------------------------------------------
+# Approximate indexes - pick the rows worth scoring
+# -----------------------------------------------
+
+class FlatIndex:
+    """
+    No narrowing - every live row is scored
+    """
+
+    def add(self, vectors: "_Vectors", rows: np.ndarray) -> None:
+        pass
+
+    def remove(self, row: int) -> None:
+        pass
+
+    def rebuild(self, vectors: "_Vectors") -> None:
+        pass
+
+    def candidates(self, vectors: "_Vectors", query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        return None
+
+
+class IVFIndex:
+    """
+    Inverted file - rows bucketed by their nearest of ~2*sqrt(n) k-means centroids,
+    retrained when the namespace has doubled since the last training
+    """
+
+    def __init__(self, nprobe: int = 8, min_train: int = 2048, iterations: int = 8,
+                 sample: int = 50_000, seed: int = 0):
+        self.nprobe = nprobe
+        self.min_train = min_train
+        self.iterations = iterations
+        self.sample = sample
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[List[int]] = []
+        self.trained_on = 0
+
+    def _nearest(self, matrix: np.ndarray) -> np.ndarray:
+        return np.concatenate([np.argmax(matrix[i:i + 8192] @ self.centroids.T, axis=1)
+                               for i in range(0, len(matrix), 8192)]) if len(matrix) else np.zeros(0, int)
+
+    def rebuild(self, vectors: "_Vectors") -> None:
+        live = vectors.live_rows()
+        if len(live) < self.min_train:
+            self.centroids, self.lists, self.trained_on = None, [], 0
+            return
+
+        # Spherical k-means on a sample of the live rows
+        rng = np.random.default_rng(self.seed)
+        nlist = max(1, int(2 * np.sqrt(len(live))))
+        sample = vectors.matrix[rng.choice(live, size=min(len(live), self.sample), replace=False)]
+        self.centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(self.iterations):
+            assignment = self._nearest(sample)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignment, sample)
+            empty = ~sums.any(axis=1)
+            sums[empty] = self.centroids[empty]
+            self.centroids = _unit_rows(sums)
+
+        self.lists = [[] for _ in range(nlist)]
+        for row, centroid in zip(live.tolist(), self._nearest(vectors.matrix[live]).tolist()):
+            self.lists[centroid].append(row)
+        self.trained_on = len(live)
+
+    def add(self, vectors: "_Vectors", rows: np.ndarray) -> None:
+        if self.centroids is None or vectors.live_count >= 2 * max(self.trained_on, self.min_train // 2):
+            self.rebuild(vectors)
+            return
+        for row, centroid in zip(rows.tolist(), self._nearest(vectors.matrix[rows]).tolist()):
+            self.lists[centroid].append(row)
+
+    def remove(self, row: int) -> None:
+        # Dead rows are dropped by the live mask when scored, and for good on the next rebuild
+        pass
+
+    def candidates(self, vectors: "_Vectors", query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        if self.centroids is None:
+            return None
+        probe = _top_k(self.centroids @ query, min(self.nprobe, len(self.centroids)))
+        return np.fromiter(itertools.chain.from_iterable(self.lists[p] for p in probe.tolist()), dtype=np.int64)
+
+
+class HNSWIndex:
+    """
+    Hierarchical navigable small world graph from hnswlib - `ef` candidates per query
+    """
+
+    def __init__(self, m: int = 16, ef_construction: int = 200, ef: int = 64):
+        import hnswlib  # optional dependency: pip install hnswlib
+
+        self._hnswlib = hnswlib
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef = ef
+        self.index = None
+
+    def _init(self, dims: int, capacity: int) -> None:
+        self.index = self._hnswlib.Index(space="ip", dim=dims)
+        self.index.init_index(max_elements=max(capacity, 1024), ef_construction=self.ef_construction, M=self.m)
+        self.index.set_ef(self.ef)
+
+    def add(self, vectors: "_Vectors", rows: np.ndarray) -> None:
+        if not len(rows):
+            return
+        if self.index is None:
+            self._init(vectors.matrix.shape[1], len(rows))
+        needed = self.index.get_current_count() + len(rows)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+        self.index.add_items(vectors.matrix[rows], rows)
+
+    def remove(self, row: int) -> None:
+        if self.index is not None:
+            self.index.mark_deleted(row)
+
+    def rebuild(self, vectors: "_Vectors") -> None:
+        self.index = None
+        self.add(vectors, vectors.live_rows())
+
+    def candidates(self, vectors: "_Vectors", query: np.ndarray, k: int) -> Optional[np.ndarray]:
+        if self.index is None:
+            return None
+        n = min(max(k, self.ef), vectors.live_count)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        self.index.set_ef(max(self.ef, n))
+        labels, _ = self.index.knn_query(query, k=n)
+        return labels[0].astype(np.int64)
+
+
+INDEXES = {"flat": FlatIndex, "ivf": IVFIndex, "hnsw": HNSWIndex}
+
+
+# -----------------------------------------------
+# Vectors of one namespace prefix
+# -----------------------------------------------
+
+class _Vectors:
+
+    def __init__(self, ann):
+        self.ann = ann
+        self.matrix: Optional[np.ndarray] = None     # (capacity, dims) unit rows
+        self.size = 0                                # rows in use, live or dead
+        self.alive = np.zeros(0, dtype=bool)
+        self.row_items: List[Optional[Item]] = []
+        self.rows: Dict[Tuple[tuple, str], int] = {}  # (namespace, key) -> row
+        self.live_count = 0
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.alive[:self.size])
+
+    def put(self, items: Sequence[Item], vectors: np.ndarray) -> None:
+        if not len(items):
+            return
+        for item in items:
+            self.remove((item.namespace, item.key))
+
+        start, end = self.size, self.size + len(items)
+        if self.matrix is None:
+            self.matrix = np.empty((max(len(items), 64), vectors.shape[1]), dtype=np.float32)
+            self.alive = np.zeros(len(self.matrix), dtype=bool)
+        if end > len(self.matrix):
+            capacity = max(end, 2 * len(self.matrix))
+            self.matrix = np.concatenate([self.matrix, np.empty((capacity - len(self.matrix), self.matrix.shape[1]),
+                                                                dtype=np.float32)])
+            self.alive = np.concatenate([self.alive, np.zeros(capacity - len(self.alive), dtype=bool)])
+
+        self.matrix[start:end] = vectors
+        self.alive[start:end] = True
+        for row, item in enumerate(items, start):
+            self.row_items.append(item)
+            self.rows[(item.namespace, item.key)] = row
+        self.size = end
+        self.live_count += len(items)
+        self.ann.add(self, np.arange(start, end))
+
+    def remove(self, ref: Tuple[tuple, str]) -> None:
+        row = self.rows.pop(ref, None)
+        if row is None:
+            return
+        self.alive[row] = False
+        self.row_items[row] = None
+        self.live_count -= 1
+        self.ann.remove(row)
+        if self.size >= _MIN_COMPACT and self.live_count < self.size // 2:
+            self._compact()
+
+    def _compact(self) -> None:
+        live = self.live_rows()
+        self.matrix = self.matrix[live].copy()
+        self.alive = np.ones(len(live), dtype=bool)
+        self.row_items = [self.row_items[row] for row in live.tolist()]
+        self.rows = {(item.namespace, item.key): row for row, item in enumerate(self.row_items)}
+        self.size = self.live_count = len(live)
+        self.ann.rebuild(self)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[float, Item]]:
+        if not self.live_count or k <= 0:
+            return []
+        rows = self.ann.candidates(self, query, k)
+        if rows is None:
+            scores = self.matrix[:self.size] @ query
+            scores[~self.alive[:self.size]] = -np.inf
+            top = _top_k(scores, min(k, self.live_count))
+            return [(float(scores[row]), self.row_items[row]) for row in top.tolist()]
+
+        rows = rows[self.alive[rows]]
+        scores = self.matrix[rows] @ query
+        top = _top_k(scores, min(k, len(rows)))
+        return [(float(scores[i]), self.row_items[row]) for i, row in zip(top.tolist(), rows[top].tolist())]
+
+
+# -----------------------------------------------
+# Store wrapper
+# -----------------------------------------------
+
+class VectorIndexedStore(BaseStore):
+    """
+    BaseStore that passes every operation to `store` and answers query searches
+    from a vector index over the `fields` of the items
+    """
+
+    def __init__(self, store: BaseStore, embeddings, fields: Sequence[str] = ("content",),
+                 index: str = "flat", **index_options: Any):
+        if index not in INDEXES:
+            raise ValueError(f"Unknown index {index!r} - expected one of {sorted(INDEXES)}")
+        self.store = store
+        self.embeddings = embeddings
+        self.fields = tuple(fields)
+        self.index = index
+        self.index_options = index_options
+        self.supports_ttl = store.supports_ttl
+        self.ttl_config = store.ttl_config
+        self._prefixes: Dict[tuple, _Vectors] = {}
+        self._loading: Dict[tuple, List[Tuple[PutOp, Optional[np.ndarray]]]] = {}
+        self._lock = threading.Lock()
+        # The wrapped store's vector side table, if it has one
+        self._saves_vectors = hasattr(store, "get_vectors") and hasattr(store, "put_vectors")
+        self._model = _embedding_model(embeddings)
+
+    def _text(self, value: Optional[dict]) -> Optional[str]:
+        if value is None:
+            return None
+        parts = [str(value[field]) for field in self.fields if value.get(field) is not None]
+        return "\n".join(parts) if parts else None
+
+    # -----------------------------------------------
+    # Operations
+    # -----------------------------------------------
+
+    @staticmethod
+    def _is_vector_search(op: Any) -> bool:
+        return isinstance(op, SearchOp) and bool(op.query) and not op.filter
+
+    def _split(self, ops: List[Any]):
+        searches = {i: op for i, op in enumerate(ops) if self._is_vector_search(op)}
+        passthrough = [op for i, op in enumerate(ops) if i not in searches]
+        return searches, passthrough
+
+    @staticmethod
+    def _merge(ops: List[Any], searches: Dict[int, List[SearchItem]], passed: List[Any]) -> List[Any]:
+        passed = iter(passed)
+        return [searches[i] if i in searches else next(passed) for i in range(len(ops))]
+
+    def _indexed(self, namespace: tuple) -> bool:
+        return any(namespace[:len(prefix)] == prefix for prefix in itertools.chain(self._prefixes, self._loading))
+
+    def _writes(self, ops: List[Any]) -> Tuple[List[Tuple[PutOp, Optional[str]]], List[str]]:
+        # Every write with its text, and the texts worth embedding before the write - those
+        # under a prefix that is indexed (or loading) now
+        writes = [(op, self._text(op.value)) for op in ops if isinstance(op, PutOp)]
+        with self._lock:
+            texts = [text for op, text in writes if text is not None and self._indexed(op.namespace)]
+        return writes, texts
+
+    def batch(self, ops: Iterable[Any]) -> List[Any]:
+        ops = list(ops)
+        searches, passthrough = self._split(ops)
+        writes, texts = self._writes(passthrough)
+        vectors = dict(zip(texts, _unit_rows(self.embeddings.embed_documents(texts)))) if texts else {}
+
+        passed = self.store.batch(passthrough) if passthrough else []
+        self._apply(writes, vectors)
+        self._save(writes, vectors)
+
+        results = {}
+        for i, op in searches.items():
+            vectors_ = self._load(op.namespace_prefix)
+            results[i] = self._search(vectors_, op, self.embeddings.embed_query(op.query))
+        return self._merge(ops, results, passed)
+
+    async def abatch(self, ops: Iterable[Any]) -> List[Any]:
+        ops = list(ops)
+        searches, passthrough = self._split(ops)
+        writes, texts = self._writes(passthrough)
+        vectors = dict(zip(texts, _unit_rows(await self.embeddings.aembed_documents(texts)))) if texts else {}
+
+        passed = await self.store.abatch(passthrough) if passthrough else []
+        self._apply(writes, vectors)
+        await asyncio.to_thread(self._save, writes, vectors)
+
+        results = {}
+        for i, op in searches.items():
+            vectors_ = await self._aload(op.namespace_prefix)
+            results[i] = self._search(vectors_, op, await self.embeddings.aembed_query(op.query))
+        return self._merge(ops, results, passed)
+
+    def _search(self, vectors: _Vectors, op: SearchOp, query: List[float]) -> List[SearchItem]:
+        query = _unit_rows(query)[0]
+        with self._lock:
+            hits = vectors.search(query, op.offset + op.limit)[op.offset:]
+        return [SearchItem(namespace=item.namespace, key=item.key, value=item.value,
+                           created_at=item.created_at, updated_at=item.updated_at, score=score)
+                for score, item in hits]
+
+    # -----------------------------------------------
+    # Keeping the indexes in step with the writes
+    # -----------------------------------------------
+
+    def _apply(self, writes: List[Tuple[PutOp, Optional[str]]], vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            writes = [(op, text) for op, text in writes if self._indexed(op.namespace)]
+            # A prefix that started loading since the texts were embedded - rare, embed here
+            missing = [text for _, text in writes if text is not None and text not in vectors]
+            if missing:
+                vectors = {**vectors, **dict(zip(missing, _unit_rows(self.embeddings.embed_documents(missing))))}
+            writes = [(op, vectors[text] if text is not None else None) for op, text in writes]
+            for prefix, indexed in self._prefixes.items():
+                self._apply_puts(indexed, [(op, vector) for op, vector in writes
+                                           if op.namespace[:len(prefix)] == prefix])
+            for prefix, pending in self._loading.items():
+                # The load may have read the store before these writes - replay them after
+                pending.extend((op, vector) for op, vector in writes if op.namespace[:len(prefix)] == prefix)
+
+    def _save(self, writes: List[Tuple[PutOp, Optional[str]]], vectors: Dict[str, np.ndarray]) -> None:
+        if not self._saves_vectors or not vectors:
+            return
+        self.store.put_vectors(self._model, [(tuple(op.namespace), op.key, _digest(text), vectors[text].tobytes())
+                                             for op, text in writes if text in vectors])
+
+    @staticmethod
+    def _apply_puts(indexed: _Vectors, writes: List[Tuple[PutOp, Optional[np.ndarray]]]) -> None:
+        now = datetime.now(timezone.utc)
+        for op, vector in writes:
+            ref = (tuple(op.namespace), op.key)
+            if vector is None:
+                # Deleted, or nothing to embed any more
+                indexed.remove(ref)
+                continue
+            current = indexed.rows.get(ref)
+            created_at = indexed.row_items[current].created_at if current is not None else now
+            indexed.put([Item(value=op.value, key=op.key, namespace=op.namespace,
+                              created_at=created_at, updated_at=now)], vector[None, :])
+
+    # -----------------------------------------------
+    # Loading a prefix on its first query search
+    # -----------------------------------------------
+
+    def _start_load(self, prefix: tuple) -> None:
+        with self._lock:
+            self._loading.setdefault(prefix, [])
+
+    def _index(self, prefix: tuple, items: List[Item], vectors: List[np.ndarray]) -> _Vectors:
+        with self._lock:
+            writes = self._loading.pop(prefix, [])
+            indexed = self._prefixes.get(prefix)
+            if indexed is None:
+                indexed = _Vectors(INDEXES[self.index](**self.index_options))
+                embedded = [item for item in items if self._text(item.value) is not None]
+                if embedded:
+                    indexed.put(embedded, np.concatenate(vectors))
+                self._apply_puts(indexed, writes)
+                self._prefixes[prefix] = indexed
+            return indexed
+
+    def _saved_vectors(self, prefix: tuple) -> Dict[Tuple[tuple, str], Tuple[str, bytes]]:
+        return self.store.get_vectors(prefix, self._model) if self._saves_vectors else {}
+
+    def _page_vectors(self, page: List[Item], saved: Dict[Tuple[tuple, str], Tuple[str, bytes]]):
+        """
+        The page's embeddable items as (rows, texts to embed, their positions, their items) - rows
+        holds the saved vectors whose digest still matches, None where the text must be embedded
+        """
+        rows, texts, positions, missing = [], [], [], []
+        for item in page:
+            text = self._text(item.value)
+            if text is None:
+                continue
+            entry = saved.get((tuple(item.namespace), item.key))
+            if entry is not None and entry[0] == _digest(text):
+                rows.append(np.frombuffer(entry[1], dtype=np.float32))
+                continue
+            positions.append(len(rows))
+            rows.append(None)
+            texts.append(text)
+            missing.append(item)
+        return rows, texts, positions, missing
+
+    def _fill(self, rows: List[Optional[np.ndarray]], texts: List[str], positions: List[int],
+              missing: List[Item], embedded: Any) -> Optional[np.ndarray]:
+        """
+        Put the new embeddings in their rows (and save them) - the page's matrix, or None
+        """
+        if texts:
+            embedded = _unit_rows(embedded)
+            for position, vector in zip(positions, embedded):
+                rows[position] = vector
+            if self._saves_vectors:
+                self.store.put_vectors(self._model, [
+                    (tuple(item.namespace), item.key, _digest(text), vector.tobytes())
+                    for item, text, vector in zip(missing, texts, embedded)])
+        return np.stack(rows) if rows else None
+
+    def _load(self, prefix: tuple) -> _Vectors:
+        indexed = self._prefixes.get(prefix)
+        if indexed is not None:
+            return indexed
+        self._start_load(prefix)
+        saved = self._saved_vectors(prefix)
+        items, vectors = [], []
+        while True:
+            page = self.store.search(prefix, limit=_PAGE, offset=len(items))
+            items.extend(page)
+            rows, texts, positions, missing = self._page_vectors(page, saved)
+            matrix = self._fill(rows, texts, positions, missing,
+                                self.embeddings.embed_documents(texts) if texts else None)
+            if matrix is not None:
+                vectors.append(matrix)
+            if len(page) < _PAGE:
+                return self._index(prefix, items, vectors)
+
+    async def _aload(self, prefix: tuple) -> _Vectors:
+        indexed = self._prefixes.get(prefix)
+        if indexed is not None:
+            return indexed
+        self._start_load(prefix)
+        saved = await asyncio.to_thread(self._saved_vectors, prefix)
+        items, vectors = [], []
+        while True:
+            page = await self.store.asearch(prefix, limit=_PAGE, offset=len(items))
+            items.extend(page)
+            rows, texts, positions, missing = self._page_vectors(page, saved)
+            embedded = await self.embeddings.aembed_documents(texts) if texts else None
+            matrix = await asyncio.to_thread(self._fill, rows, texts, positions, missing, embedded)
+            if matrix is not None:
+                vectors.append(matrix)
+            if len(page) < _PAGE:
+                return self._index(prefix, items, vectors)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"index": self.index,
+                "prefixes": {"/".join(prefix): indexed.live_count for prefix, indexed in self._prefixes.items()}}
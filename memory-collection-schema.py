@@ -29,10 +29,10 @@ class MemoryCollection(BaseModel):
 # -----------------------------------------------
 
 from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
+from langgraph_basics.providers import get_chat_model
 
 # Initialize the model
-model = ChatOpenAI(model="gpt-4o", temperature=0)
+model = get_chat_model(model="gpt-4o", temperature=0)
 
 # Bind schema to model
 model_with_structure = model.with_structured_output(MemoryCollection)
@@ -146,136 +146,29 @@ result = trustcall_extractor.invoke({"messages": updated_conversation,
 # Chatbot with collection schema updating
 # -----------------------------------------------
 
-from IPython.display import Image, display
+# The chatbot (Memory schema, Trustcall extractor, prompts and nodes) lives in
+# langgraph_basics.memory_collection
 
-import uuid
-
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.messages import merge_message_runs
-from langchain_core.runnables.config import RunnableConfig
+from langgraph_basics.memory_collection import build_collection_chatbot
+from langgraph_basics.providers import display_graph, get_embeddings, get_store
+from langgraph_basics.vector_index import VectorIndexedStore
 
-from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.store.memory import InMemoryStore
 from langgraph.checkpoint.memory import MemorySaver
-from langgraph.store.base import BaseStore
-
-# Initialize the model
-model = ChatOpenAI(model="gpt-4o", temperature=0)
-
-# Memory schema
-class Memory(BaseModel):
-    content: str = Field(description="The main content of the memory. For example: User expressed interest in learning about French.")
-
-# Create the Trustcall extractor
-trustcall_extractor = create_extractor(
-    model,
-    tools=[Memory],
-    tool_choice="Memory",
-    enable_inserts=True,
-)
-
-# Chatbot instruction
-MODEL_SYSTEM_MESSAGE = """
-You are a helpful chatbot. You are designed to be a companion to a user. 
-
-You have a long term memory which keeps track of information you learn about the user over time.
-
-Current Memory (may include updated memories from this conversation): {memory}
-"""
-
-# Trustcall instruction
-TRUSTCALL_INSTRUCTION = """
-Reflect on following interaction. 
-
-Use the provided tools to retain any necessary memories about the user. 
-
-Use parallel tool calling to handle updates and insertions simultaneously:
-"""
-
-# -----------------------------------------------
-
-def call_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
-
-    """Load memories from the store and use them to personalize the chatbot's response."""
-    
-    # Get the user ID from the config
-    user_id = config["configurable"]["user_id"]
-
-    # Retrieve memory from the store
-    namespace = (user_id, "memories")
-    memories = store.search(namespace)
-
-    # Format the memories for the system prompt
-    info = "\n".join(f"- {mem.value['content']}" for mem in memories)
-    system_msg = MODEL_SYSTEM_MESSAGE.format(memory=info)
-
-    # Respond using memory as well as the chat history
-    response = model.invoke([SystemMessage(content=system_msg)]+state["messages"])
-
-    return {"messages": response}
-
-# -----------------------------------------------
-
-def write_memory(state: MessagesState, config: RunnableConfig, store: BaseStore):
-
-    """Reflect on the chat history and update the memory collection."""
-    
-    # Get the user ID from the config
-    user_id = config["configurable"]["user_id"]
-
-    # Define the namespace for the memories
-    namespace = (user_id, "memories")
-
-    # Retrieve the most recent memories for context
-    existing_items = store.search(namespace)
-
-    # Format the existing memories for the Trustcall extractor
-    tool_name = "Memory"
-    existing_memories = ([(existing_item.key, tool_name, existing_item.value)
-                          for existing_item in existing_items]
-                          if existing_items
-                          else None
-                        )
-
-    # Merge the chat history and the instruction
-    updated_messages=list(merge_message_runs(messages=[SystemMessage(content=TRUSTCALL_INSTRUCTION)] + state["messages"]))
-
-    # Invoke the extractor
-    result = trustcall_extractor.invoke({"messages": updated_messages, 
-                                        "existing": existing_memories})
-
-    # Save the memories from Trustcall to the store
-    for r, rmeta in zip(result["responses"], result["response_metadata"]):
-        store.put(namespace,
-                  rmeta.get("json_doc_id", str(uuid.uuid4())),
-                  r.model_dump(mode="json"),
-            )
-        
-# -----------------------------------------------
-# Define a graph
-
-builder = StateGraph(MessagesState)
-
-# Nodes
-builder.add_node("call_model", call_model)
-builder.add_node("write_memory", write_memory)
-
-# Edges
-builder.add_edge(START, "call_model")
-builder.add_edge("call_model", "write_memory")
-builder.add_edge("write_memory", END)
 
-# Store for long-term (across-thread) memory
-across_thread_memory = InMemoryStore()
+# Store for long-term (across-thread) memory - a SQLite file that outlives the
+# script (get_store), with a vector index on the memory content, so call_model
+# puts the memories closest to the latest message in the prompt rather than all
+# of them
+across_thread_memory = VectorIndexedStore(get_store("memory_collection"), get_embeddings(), fields=("content",))
 
 # Checkpointer for short-term (within-thread) memory
 within_thread_memory = MemorySaver()
 
 # Compile the graph with the checkpointer and store
-graph = builder.compile(checkpointer=within_thread_memory, store=across_thread_memory)
+graph = build_collection_chatbot(checkpointer=within_thread_memory, store=across_thread_memory)
 
 # Visualize
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
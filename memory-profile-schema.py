@@ -66,9 +66,9 @@ memory_store.put(namespace_for_memory, key, value)
 from pydantic import BaseModel, Field
 
 from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
+from langgraph_basics.providers import get_chat_model
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+llm = get_chat_model(model="gpt-4o-mini", temperature=0)
 
 # Bind schema to model
 model_with_structure = llm.with_structured_output(UserProfile)
@@ -80,7 +80,7 @@ structured_output
 
 # -----------------------------------------------
 
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph, get_store
 
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, MessagesState, START, END
@@ -187,8 +187,9 @@ builder.add_edge(START, "call_model")
 builder.add_edge("call_model", "write_memory")
 builder.add_edge("write_memory", END)
 
-# Store for long-term (across-thread) memory
-across_thread_memory = InMemoryStore()
+# Store for long-term (across-thread) memory - a SQLite file that outlives the
+# script (get_store / LANGGRAPH_BASICS_STORE; an InMemoryStore when offline)
+across_thread_memory = get_store("memory_profile_schema")
 
 # Checkpointer for short-term (within-thread) memory
 within_thread_memory = MemorySaver()
@@ -197,7 +198,7 @@ within_thread_memory = MemorySaver()
 graph = builder.compile(checkpointer=within_thread_memory, store=across_thread_memory)
 
 # Visualize
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
@@ -317,7 +318,7 @@ class UserProfile(BaseModel):
     interests: List[str] = Field(description="A list of the user's interests")
 
 # Initialize the model
-model = ChatOpenAI(model="gpt-4o", temperature=0)
+model = get_chat_model(model="gpt-4o", temperature=0)
 
 # Create the extractor
 trustcall_extractor = create_extractor(
@@ -374,115 +375,23 @@ result["responses"][0]
 # Chatbot with profile schema updating using Trustcall
 # -----------------------------------------------
 
-# Schema 
-class UserProfile(BaseModel):
-    """ Profile of a user """
-    user_name: str = Field(description="The user's preferred name")
-    user_location: str = Field(description="The user's location")
-    interests: list = Field(description="A list of the user's interests")
-
-# Create the extractor
-trustcall_extractor = create_extractor(
-    model,
-    tools=[UserProfile],
-    tool_choice="UserProfile", # Enforces use of the UserProfile tool
-)
-
-# Chatbot instruction
-MODEL_SYSTEM_MESSAGE = """
-You are a helpful assistant with memory that provides information about the user. 
-If you have memory for this user, use it to personalize your responses.
-Here is the memory (it may be empty): {memory}
-"""
-
-# Extraction instruction
-TRUSTCALL_INSTRUCTION = """
-Create or update the memory (JSON doc) to incorporate information from the following conversation:
-"""
-
-# -------------------------------------
-
-def call_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
-
-    """Load memory from the store and use it to personalize the chatbot's response."""
-    
-    # Get the user ID from the config
-    user_id = config["configurable"]["user_id"]
-
-    # Retrieve memory from the store
-    namespace = ("memory", user_id)
-    existing_memory = store.get(namespace, "user_memory")
-
-    # Format the memories for the system prompt
-    if existing_memory and existing_memory.value:
-        memory_dict = existing_memory.value
-        formatted_memory = (
-            f"Name: {memory_dict.get('user_name', 'Unknown')}\n"
-            f"Location: {memory_dict.get('user_location', 'Unknown')}\n"
-            f"Interests: {', '.join(memory_dict.get('interests', []))}"      
-        )
-    else:
-        formatted_memory = None
-
-    # Format the memory in the system prompt
-    system_msg = MODEL_SYSTEM_MESSAGE.format(memory=formatted_memory)
-
-    # Respond using memory as well as the chat history
-    response = model.invoke([SystemMessage(content=system_msg)]+state["messages"])
-
-    return {"messages": response}
-
-# -------------------------------------
-
-def write_memory(state: MessagesState, config: RunnableConfig, store: BaseStore):
-
-    """Reflect on the chat history and save a memory to the store."""
-    
-    # Get the user ID from the config
-    user_id = config["configurable"]["user_id"]
-
-    # Retrieve existing memory from the store
-    namespace = ("memory", user_id)
-    existing_memory = store.get(namespace, "user_memory")
-        
-    # Get the profile as the value from the list, and convert it to a JSON doc
-    existing_profile = {"UserProfile": existing_memory.value} if existing_memory else None
-    
-    # Invoke the extractor
-    result = trustcall_extractor.invoke({"messages": [SystemMessage(content=TRUSTCALL_INSTRUCTION)]+state["messages"], "existing": existing_profile})
-    
-    # Get the updated profile as a JSON object
-    updated_profile = result["responses"][0].model_dump()
+# The chatbot (UserProfile schema, Trustcall extractor, prompts and nodes)
+# lives in langgraph_basics.memory_profile
 
-    # Save the updated profile
-    key = "user_memory"
-    store.put(namespace, key, updated_profile)
+from langgraph_basics.memory_profile import build_profile_chatbot
 
-# -----------------------------------------------
-# Define a graph
-
-builder = StateGraph(MessagesState)
-
-# Nodes
-builder.add_node("call_model", call_model)
-builder.add_node("write_memory", write_memory)
-
-# Edges
-builder.add_edge(START, "call_model")
-builder.add_edge("call_model", "write_memory")
-builder.add_edge("write_memory", END)
-
-# Store for long-term (across-thread) memory
-across_thread_memory = InMemoryStore()
+# Store for long-term (across-thread) memory - a SQLite file that outlives the
+# script (get_store / LANGGRAPH_BASICS_STORE; an InMemoryStore when offline)
+across_thread_memory = get_store("memory_profile_trustcall")
 
 # Checkpointer for short-term (within-thread) memory
 within_thread_memory = MemorySaver()
 
 # Compile the graph with the checkpointer and store
-graph = builder.compile(checkpointer=within_thread_memory, store=across_thread_memory)
+graph = build_profile_chatbot(checkpointer=within_thread_memory, store=across_thread_memory)
 
 # Visualize
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
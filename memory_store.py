@@ -53,141 +53,30 @@ print(memory.dict())
 # Chatbot with Long-term Memory
 # -----------------------------------------------
 
-# Chat Model
+# The chatbot (prompts, call_model / write_memory nodes) lives in
+# langgraph_basics.memory_store
 
-from langchain_openai import ChatOpenAI
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
-
-# -----------------------------------------------
-
-from IPython.display import Image, display
+from langgraph_basics.memory_store import build_memory_chatbot
+from langgraph_basics.providers import display_graph, get_store
+from langgraph_basics.store_cache import CachedStore
 
 from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.store.base import BaseStore
-
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.runnables.config import RunnableConfig
-
-# Chatbot instruction
-MODEL_SYSTEM_MESSAGE = """
-You are a helpful assistant with memory that provides information about the user. 
-If you have memory for this user, use it to personalize your responses.
-Here is the memory (it may be empty): {memory}
-"""
-
-# Create new memory from the chat history and any existing memory
-CREATE_MEMORY_INSTRUCTION = """"
-You are collecting information about the user to personalize your responses.
-
-CURRENT USER INFORMATION:
-{memory}
-
-INSTRUCTIONS:
-1. Review the chat history below carefully
-2. Identify new information about the user, such as:
-   - Personal details (name, location)
-   - Preferences (likes, dislikes)
-   - Interests and hobbies
-   - Past experiences
-   - Goals or future plans
-3. Merge any new information with existing memory
-4. Format the memory as a clear, bulleted list
-5. If new information conflicts with existing memory, keep the most recent version
-
-Remember: Only include factual information directly stated by the user. Do not make assumptions or inferences.
-
-Based on the chat history below, please update the user information:
-"""
-
-
-# -----------------------------------------------
-
-def call_model(state: MessagesState, config: RunnableConfig, store: BaseStore):
-    
-    """
-    Load memory from the store and use it to personalize the chatbot's response.
-    """
-
-    # Get the user ID from the config
-    user_id = config["configurable"]["user_id"]
-
-    # Retrieve memory from the store
-    namespace = (user_id, "memory")
-    key = "user_memory"
-    existing_memory = store.get(namespace, key)
-
-    # Extract the actual memory content if it exist and add a prefix
-    if existing_memory:
-        existing_memory_content = existing_memory.value.get("memory")
-    else:
-        existing_memory_content = "No existing memory found"
-
-    # Format the memory in the system prompt
-    system_msg = MODEL_SYSTEM_MESSAGE.format(memory=existing_memory_content)
-
-    # Respond using memory as well as the chat history
-    response = llm.invoke([SystemMessage(content=system_msg)] + state["messages"])
-
-    return {"messages" : [response]}
-
-
-# -----------------------------------------------
-
-def write_memory(state: MessagesState, config:RunnableConfig, store: BaseStore):
-    """
-    Reflect on the chat history and save a memory to the store.
-    """
+from langchain_core.messages import HumanMessage
 
-    # Get the user ID from the config
-    user_id = config["configurable"]["user_id"]
-
-    # Retrieve memory from the store
-    namespace = (user_id, "memory")
-    key = "user_memory"
-    existing_memory = store.get(namespace, key)
-
-    # Extract the actual memory content if it exist and add a prefix
-    if existing_memory:
-        existing_memory_content = existing_memory.value.get("memory")
-    else:
-        existing_memory_content = "No existing memory found"
-
-    # Format the memory in the system prompt
-    system_msg = MODEL_SYSTEM_MESSAGE.format(memory=existing_memory_content)
-
-    # Respond using memory as well as the chat history
-    response = llm.invoke([SystemMessage(content=system_msg)] + state["messages"])
-
-    store.put(namespace, key, {"memory" : response.content})
-
-
-# -----------------------------------------------
-# Define a graph
-
-builder = StateGraph(MessagesState)
-
-# Nodes
-builder.add_node("call_model", call_model)
-builder.add_node("write_memory", write_memory)
-
-# Edges
-builder.add_edge(START, "call_model")
-builder.add_edge("call_model", "write_memory")
-builder.add_edge("write_memory", END)
-
-# Store for long-term (across-thread) memory
-across_thread_memory = InMemoryStore()
+# Store for long-term (across-thread) memory - a SQLite file that outlives the
+# script (get_store / LANGGRAPH_BASICS_STORE; an InMemoryStore when offline),
+# behind a per-run read cache: write_memory reuses the memory call_model read,
+# until a put invalidates it
+across_thread_memory = CachedStore(get_store("memory_store"))
 
 # Checkpointer for short-term (within-thread) memory
 within_thread_memory = MemorySaver()
 
 # Compile the graph with the checkpointer and store
-graph = builder.compile(checkpointer=within_thread_memory, store=across_thread_memory)
+graph = build_memory_chatbot(checkpointer=within_thread_memory, store=across_thread_memory)
 
 # Visualize
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
@@ -256,4 +145,31 @@ for chunk in graph.stream({"messages": input_messages}, config, stream_mode="val
     chunk["messages"][-1].pretty_print()
 
 
+# -----------------------------------------------
+# Deferred memory writes
+# -----------------------------------------------
+
+# write_memory is a second model call after call_model. With deferred_writes=True
+# the graph returns right after call_model; the turn is saved in the store and
+# write_memory runs on a background worker, merging turns that queue up for the
+# same user into one extraction.
+
+deferred_graph = build_memory_chatbot(checkpointer=MemorySaver(), store=across_thread_memory,
+                                      deferred_writes=True)
+
+config = {"configurable": {"thread_id": "3", "user_id": "1"}}
+
+# User input 
+input_messages = [HumanMessage(content="I also enjoy hiking in the Sahyadris on weekends")]
+
+# Returns before the memory is updated
+for chunk in deferred_graph.stream({"messages": input_messages}, config, stream_mode="values"):
+    chunk["messages"][-1].pretty_print()
+
+# Wait for the background write, then read the updated memory
+deferred_graph.memory_writer.flush()
+print(across_thread_memory.get(namespace, "user_memory").value)
+print(deferred_graph.memory_writer.stats())
+
+
 # -----------------------------------------------
\ No newline at end of file
@@ -16,7 +16,7 @@
 
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph
 
 # Create States
 
@@ -55,7 +55,7 @@ graph = builder.compile()
 
 # Display the graph
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Run the graph
 
@@ -88,7 +88,7 @@ builder.add_edge("answer_node", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 graph.invoke({"question":"hi"})
 
@@ -127,7 +127,7 @@ builder.add_edge("answer_node", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 graph.invoke({"question" : "hi"})
 
@@ -28,7 +28,7 @@ class ReturnNodeValue:
         self._value = node_secret
     
     def __call__(self, state: State) -> Any:
-        print(f"Adding {self._value} to {state["state"]}")
+        print(f"Adding {self._value} to {state['state']}")
         return {"state" : [self._value]}
 
 
@@ -37,7 +37,7 @@ class ReturnNodeValue:
 # -----------------------------------------------
 
 from langgraph.graph import StateGraph, START, END
-from IPython.display import display, Image
+from langgraph_basics.providers import display_graph
 
 builder = StateGraph(State)
 
@@ -54,7 +54,7 @@ builder.add_edge("d", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Let's invoke the graph
 
@@ -81,7 +81,7 @@ builder.add_edge("d", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
@@ -122,7 +122,7 @@ builder.add_edge("d", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Let's invoke the graph
 
@@ -151,7 +151,7 @@ builder.add_edge("d", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Let's invoke the graph
 
@@ -193,7 +193,7 @@ builder.add_edge("d", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Let's invoke the graph
 
@@ -204,106 +204,13 @@ graph.invoke({"state" : []})
 # Example - Working with LLMs
 # -----------------------------------------------
 
-from langchain_openai import ChatOpenAI
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# State and the search / answer nodes live in langgraph_basics.parallelization
 
-# Define the state class
+from langgraph_basics.parallelization import build_search_graph
 
-class State(TypedDict):
-    question : str
-    answer : str
-    context : Annotated[list, operator.add]
-
-
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_community.document_loaders import WikipediaLoader
-from langchain_community.tools import TavilySearchResults
-
-# Web Search
-
-def search_web(state):
-    """
-    Retrives documents from Web Search    
-    """
-
-    # Search
-    
-    tavily_search = TavilySearchResults(max_results=3)
-    search_docs = tavily_search.invoke(state["question"])
-
-    # Format
-    
-    formatted_search_docs = "\n\n---\n\n".join(
-        [
-            f'<Document href="{doc["url"]}"/>\n{doc["content"]}\n</Document>'
-            for doc in search_docs
-        ]
-    )
-
-    return {"context" : [formatted_search_docs]}
-
-
-# Wiki Search
-
-def search_wikipedia(state):
-    """
-    Retrives documents from Wikipedia    
-    """
-
-    # Search
-    search_docs = WikipediaLoader(query=state["question"], 
-                                  load_max_docs=2).load()
-
-    # Format
-    formatted_search_docs = "\n\n---\n\n".join(
-        [
-            f'<Document source="{doc.metadata["source"]}" page="{doc.metadata.get("page", "")}"/>\n{doc.page_content}\n</Document>'
-            for doc in search_docs
-        ]
-    )
-
-    return {"context" : [formatted_search_docs]}
-
-
-# Node function to generate answer
-
-def generate_answer(state):
-    
-    """ Node to answer a question """
-
-    # Get state
-    context = state["context"]
-    question = state["question"]
-
-    # Template
-    answer_template = """Answer the question {question} using this context: {context}"""
-    answer_instructions = answer_template.format(question=question, 
-                                                       context=context)    
-    
-    # Answer
-    answer = llm.invoke([SystemMessage(content=answer_instructions)]+[HumanMessage(content=f"Answer the question.")])
-      
-    # Append it to state
-    return {"answer": answer}
-
-
-# Build the graph
-
-builder = StateGraph(State)
-
-builder.add_node("search_web", search_web)
-builder.add_node("search_wikipedia", search_wikipedia)
-builder.add_node("generate_answer", generate_answer)
-
-builder.add_edge(START, "search_wikipedia")
-builder.add_edge(START, "search_web")
-builder.add_edge("search_wikipedia", "generate_answer")
-builder.add_edge("search_web", "generate_answer")
-builder.add_edge("generate_answer", END)
-
-graph = builder.compile()
+graph = build_search_graph()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # Let's invoke the graph
@@ -32,9 +32,9 @@ def multiply(a: int, b: int) -> int:
 # Let's bind our tool to our chat model
 # -----------------------------------------------
 
-from langchain_openai import ChatOpenAI
+from langgraph_basics.providers import get_chat_model
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+llm = get_chat_model(model="gpt-4o-mini")
 
 llm_with_tools = llm.bind_tools([multiply])
 
@@ -76,9 +76,9 @@ graph = builder.compile()
 # -----------------------------------------------
 # View
 
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 
 # -----------------------------------------------
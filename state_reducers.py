@@ -11,7 +11,7 @@
 
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph
 
 class state(TypedDict):
     foo : int
@@ -29,7 +29,7 @@ builder.add_edge("node1", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 graph.invoke({"foo" : 1})
 
@@ -64,7 +64,7 @@ builder.add_edge("node3", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # -----------------------------------------------
 
@@ -121,7 +121,7 @@ builder.add_edge("node3", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 graph.invoke({"foo" : [1]})
 
@@ -190,7 +190,7 @@ builder.add_edge("node1", END)
 
 graph = builder.compile()
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 try:
     print(graph.invoke({"foo" : None}))
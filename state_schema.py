@@ -59,8 +59,8 @@ graph = builder.compile()
 
 # Visualzing Graph
 
-from IPython.display import Image, display
-display(Image(graph.get_graph().draw_mermaid_png()))
+from langgraph_basics.providers import display_graph
+display_graph(graph)
 
 # Rin the Graph
 
@@ -101,8 +101,8 @@ graph_dc = builder_dataclass.compile()
 
 # Visualizing Graph
 
-from IPython.display import Image, display
-display(Image(graph_dc.get_graph().draw_mermaid_png()))
+from langgraph_basics.providers import display_graph
+display_graph(graph_dc)
 
 # Let's run the graph
 
@@ -154,8 +154,8 @@ graph_pd = builder_pydantic.compile()
 
 # Visualizing Graph
 
-from IPython.display import Image, display
-display(Image(graph_pd.get_graph().draw_mermaid_png()))
+from langgraph_basics.providers import display_graph
+display_graph(graph_pd)
 
 # Running the graph
 
@@ -14,7 +14,7 @@ load_dotenv()
 
 from pprint import pprint
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_openai import ChatOpenAI
+from langgraph_basics.providers import get_chat_model
 
 messages = [AIMessage(content="So you said your were researching on LLM Agents", name="AI")]
 messages.append(HumanMessage(content="Yes, I know about LLM Agents. But what others should I learn about?", name="Sushant"))
@@ -22,14 +22,14 @@ messages.append(HumanMessage(content="Yes, I know about LLM Agents. But what oth
 for msg in messages:
     msg.pretty_print()
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+llm = get_chat_model(model="gpt-4o-mini")
 llm.invoke(messages)
 
 # -----------------------------------------------
 
 # Let's try with a simple graph and MessagesState
 
-from IPython.display import Image, display
+from langgraph_basics.providers import display_graph
 from langgraph.graph import MessagesState
 from langgraph.graph import StateGraph, START, END
 
@@ -51,7 +51,7 @@ graph = builder.compile()
 
 # Display Graph
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Runs the Graph
 
@@ -92,7 +92,7 @@ graph = builder.compile()
 
 # Display Graph
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Message list
 
@@ -128,7 +128,7 @@ graph = builder.compile()
 
 # Display Graph
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Append a follow-up question to previous LLM response
 
@@ -159,7 +159,7 @@ def chat_model_node(state:MessagesState):
         state["messages"],
         max_tokens=100,
         strategy="last",
-        token_counter=ChatOpenAI(model="gpt-4o-mini"),
+        token_counter=get_chat_model(model="gpt-4o-mini"),
         allow_partial=False,
     )
     return {"messages" : llm.invoke(messages)}
@@ -177,7 +177,7 @@ graph = builder.compile()
 
 # Display Graph
 
-display(Image(graph.get_graph().draw_mermaid_png()))
+display_graph(graph)
 
 # Append a follow-up question to previous LLM response
 